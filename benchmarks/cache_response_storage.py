@@ -0,0 +1,112 @@
+# -*- coding: utf-8 -*-
+"""
+Compares size and loading time of cache entries stored by
+`@cache_response` with full, compact and compressed storage formats.
+
+Run from the repository root:
+
+    $ python benchmarks/cache_response_storage.py
+"""
+from __future__ import print_function
+import os
+import sys
+import timeit
+
+try:
+    import cPickle as pickle
+except ImportError:
+    import pickle
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from django.conf import settings
+
+settings.configure(
+    DEBUG=False,
+    INSTALLED_APPS=['rest_framework'],
+    CACHES={
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    },
+)
+
+import django
+if hasattr(django, 'setup'):
+    django.setup()
+
+from rest_framework import views
+from rest_framework.response import Response
+from rest_framework.test import APIRequestFactory
+
+from rest_framework_extensions.cache.decorators import cache_response
+from rest_framework_extensions.compat import lzma
+
+
+ITEMS_COUNT = 1000
+REPEAT = 1000
+
+
+def get_payload():
+    return [
+        {
+            'id': i,
+            'name': u'City {0}'.format(i),
+            'description': u'Description of the city number {0}'.format(i) * 3,
+            'population': i * 1000,
+        }
+        for i in range(ITEMS_COUNT)
+    ]
+
+
+def get_cache_entry(**decorator_kwargs):
+    decorator = cache_response(key_func=lambda **kwargs: 'key', **decorator_kwargs)
+    entries = {}
+    decorator.cache = type('Cache', (object,), {
+        'get': staticmethod(lambda key: None),
+        'set': staticmethod(lambda key, value, timeout: entries.update({key: value})),
+    })()
+
+    class View(views.APIView):
+        @decorator
+        def get(self, request, *args, **kwargs):
+            return Response(get_payload())
+
+    View().dispatch(request=APIRequestFactory().get(''))
+    return entries['key']
+
+
+def get_variants():
+    variants = [
+        ('full response', {}, ''),
+        ('compact', {'compact': True}, ''),
+        ('zlib', {'compression': 'zlib'}, ''),
+        ('gzip', {'compression': 'gzip'}, ''),
+        ('gzip served', {'compression': 'gzip'}, 'gzip'),
+    ]
+    if lzma is not None:
+        variants.append(('lzma', {'compression': 'lzma'}, ''))
+    return variants
+
+
+def run():
+    decorator = cache_response()
+    view_instance = views.APIView()
+    view_instance.headers = view_instance.default_response_headers
+    for name, decorator_kwargs, accept_encoding in get_variants():
+        pickled = pickle.dumps(get_cache_entry(**decorator_kwargs), pickle.HIGHEST_PROTOCOL)
+        request = APIRequestFactory().get('', HTTP_ACCEPT_ENCODING=accept_encoding)
+
+        def load():
+            value = pickle.loads(pickled)
+            entry = value if isinstance(value, dict) else {'response': value}
+            return decorator.get_response_from_cache_entry(entry, view_instance, request)
+
+        seconds = timeit.timeit(load, number=REPEAT)
+        print('{0:>15}: {1:>8} bytes, {2:.2f} us per loading'.format(
+            name, len(pickled), seconds / REPEAT * 1000000
+        ))
+
+
+if __name__ == '__main__':
+    run()
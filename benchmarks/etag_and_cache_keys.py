@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+"""
+Measures key calculation time of `@etag` and `@cache_response` for request to
+list view with `ListSqlQueryKeyBit`, when decorators use different key
+functions and when they share one, so `@cache_response` reuses key
+calculated by `@etag`.
+
+Run from the repository root:
+
+    $ python benchmarks/etag_and_cache_keys.py
+"""
+from __future__ import print_function
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from django.conf import settings
+
+settings.configure(
+    DEBUG=False,
+    INSTALLED_APPS=['django.contrib.contenttypes', 'django.contrib.auth', 'rest_framework'],
+    DATABASES={
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': ':memory:',
+        }
+    },
+)
+
+import django
+if hasattr(django, 'setup'):
+    django.setup()
+
+from django.contrib.auth.models import User
+from rest_framework import generics
+from rest_framework.test import APIRequestFactory
+
+from rest_framework_extensions.cache.decorators import CacheResponse
+from rest_framework_extensions.etag.decorators import ETAGProcessor
+from rest_framework_extensions.key_constructor import bits
+from rest_framework_extensions.key_constructor.constructors import KeyConstructor
+
+
+REPEAT = 2000
+
+
+class ListKeyConstructor(KeyConstructor):
+    unique_method_id = bits.UniqueMethodIdKeyBit()
+    format = bits.FormatKeyBit()
+    list_sql_query = bits.ListSqlQueryKeyBit()
+
+
+class UserListView(generics.ListAPIView):
+    def get_queryset(self):
+        return User.objects.filter(
+            groups__name='admins',
+            user_permissions__content_type__app_label='auth',
+            is_active=True
+        ).exclude(email='').order_by('-date_joined')
+
+
+def get_time(etag_func, key_func):
+    etag_processor = ETAGProcessor(etag_func=etag_func)
+    cache_response = CacheResponse(key_func=key_func)
+
+    def calculate_keys():
+        request = UserListView().initialize_request(APIRequestFactory().get(''))
+        request.accepted_renderer = UserListView.renderer_classes[0]()
+        view_instance = UserListView()
+        view_instance.request = request
+        for calculate in (etag_processor.calculate_etag, cache_response.calculate_key):
+            calculate(
+                view_instance=view_instance,
+                view_method=UserListView.list,
+                request=request,
+                args=(),
+                kwargs={}
+            )
+
+    return timeit.timeit(calculate_keys, number=REPEAT) / REPEAT * 1000000
+
+
+def run():
+    print('different key functions: {0:.2f} us per request'.format(
+        get_time(ListKeyConstructor(), ListKeyConstructor())
+    ))
+    print('     shared key function: {0:.2f} us per request'.format(
+        get_time(*[ListKeyConstructor()] * 2)
+    ))
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+"""
+Measures key constructor instantiation and key calculation overhead with
+cheap bits, so the time spent by the constructor itself is visible, and
+compares key encoders and hashers on data of the default list constructor.
+
+Run from the repository root:
+
+    $ python benchmarks/key_constructor.py
+"""
+from __future__ import print_function
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from django.conf import settings
+
+settings.configure(DEBUG=False, INSTALLED_APPS=['rest_framework'])
+
+import django
+if hasattr(django, 'setup'):
+    django.setup()
+
+from django.core.exceptions import ImproperlyConfigured
+
+from rest_framework_extensions.key_constructor import bits, encoders
+from rest_framework_extensions.key_constructor.constructors import KeyConstructor
+
+
+REPEAT = 20000
+
+
+class ConstantKeyBit(bits.KeyBitBase):
+    def get_data(self, params, view_instance, view_method, request, args, kwargs):
+        return u'value'
+
+
+class MyKeyConstructor(KeyConstructor):
+    first = ConstantKeyBit()
+    second = ConstantKeyBit()
+    third = ConstantKeyBit(params=['param'])
+    fourth = ConstantKeyBit()
+    fifth = ConstantKeyBit()
+
+
+class DirWalkingKeyConstructor(MyKeyConstructor):
+    """
+    Collects bits and resolves params on every instantiation and key calculation.
+    """
+
+    def get_bits(self):
+        _bits = {}
+        for attr in dir(self.__class__):
+            attr_value = getattr(self.__class__, attr)
+            if isinstance(attr_value, bits.KeyBitBase):
+                _bits[attr] = attr_value
+        return _bits
+
+    def get_data_from_bits(self, **kwargs):
+        result_dict = {}
+        for bit_name, bit_instance in self.bits.items():
+            if bit_name in self.params:
+                params = self.params[bit_name]
+            else:
+                try:
+                    params = bit_instance.params
+                except AttributeError:
+                    params = None
+            result_dict[bit_name] = bit_instance.get_data(params=params, **kwargs)
+        return result_dict
+
+
+def get_times(key_constructor_class):
+    kwargs = {'view_instance': None, 'view_method': None, 'request': None, 'args': (), 'kwargs': {}}
+    key_constructor = key_constructor_class()
+    init_time = timeit.timeit(key_constructor_class, number=REPEAT)
+    data_time = timeit.timeit(lambda: key_constructor.get_data_from_bits(**kwargs), number=REPEAT)
+    key_time = timeit.timeit(lambda: key_constructor.get_key(**kwargs), number=REPEAT)
+    return [seconds / REPEAT * 1000000 for seconds in (init_time, data_time, key_time)]
+
+
+def get_encoders_and_hashers():
+    hashers = [('sha256', encoders.sha256_hasher), ('md5', encoders.md5_hasher)]
+    try:
+        encoders.blake2b_hasher(b'')
+    except ImproperlyConfigured:
+        pass
+    else:
+        hashers.append(('blake2b', encoders.blake2b_hasher))
+    try:
+        encoders.xxh64_hasher(b'')
+    except ImproperlyConfigured:
+        pass
+    else:
+        hashers.append(('xxh64', encoders.xxh64_hasher))
+    return [
+        (encoder_name, encoder, hasher_name, hasher)
+        for encoder_name, encoder in (('json', encoders.json_encoder), ('compact', encoders.compact_encoder))
+        for hasher_name, hasher in hashers
+    ]
+
+
+def run_prepare_key():
+    # data from bits of DefaultListKeyConstructor
+    key_dict = {
+        'unique_method_id': u'myapp.views.CityViewSet.list',
+        'format': u'json',
+        'language': u'en-us',
+        'list_sql_query': (
+            u'SELECT "myapp_city"."id", "myapp_city"."name", "myapp_city"."country_id" '
+            u'FROM "myapp_city" INNER JOIN "myapp_country" ON ("myapp_city"."country_id" = "myapp_country"."id") '
+            u'WHERE "myapp_country"."name" = Russia ORDER BY "myapp_city"."name" ASC'
+        ),
+        'pagination': {'page': u'2', 'page_size': u'20'},
+    }
+    for encoder_name, encoder, hasher_name, hasher in get_encoders_and_hashers():
+        key_constructor = KeyConstructor(encoder=encoder, hasher=hasher)
+        seconds = timeit.timeit(lambda: key_constructor.prepare_key(key_dict), number=REPEAT)
+        print('{0:>8} + {1:<8}: {2:.2f} us, key length {3}'.format(
+            encoder_name, hasher_name, seconds / REPEAT * 1000000, len(key_constructor.prepare_key(key_dict))
+        ))
+
+
+def run():
+    for name, key_constructor_class in (('dir walking', DirWalkingKeyConstructor),
+                                        ('class plan', MyKeyConstructor)):
+        print('{0:>12}: init {1:.2f} us, bits data {2:.2f} us, key {3:.2f} us'.format(
+            name, *get_times(key_constructor_class)
+        ))
+    run_prepare_key()
+
+
+if __name__ == '__main__':
+    run()
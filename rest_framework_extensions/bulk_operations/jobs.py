@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+import logging
+import threading
+import uuid
+from multiprocessing.pool import ThreadPool
+
+from django.db import connections
+
+from rest_framework_extensions.settings import extensions_api_settings
+from rest_framework_extensions.utils import get_cache
+
+
+logger = logging.getLogger('rest_framework_extensions.bulk_operations')
+
+
+def sync_executor(func):
+    """
+    Runs the job in the request. Useful for tests and debugging.
+    """
+    func()
+
+
+class ThreadPoolExecutor(object):
+    """
+    Runs jobs in the pool of `max_workers` threads of the current process.
+    Pool is started on the first job.
+    """
+    def __init__(self, max_workers=4):
+        self.max_workers = max_workers
+        self._pool = None
+        self._lock = threading.Lock()
+
+    def get_pool(self):
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPool(processes=self.max_workers)
+            return self._pool
+
+    def __call__(self, func):
+        self.get_pool().apply_async(self.run, (func,))
+
+    def run(self, func):
+        try:
+            func()
+        finally:
+            # every thread has its own connections, which are not closed by request_finished signal
+            for connection in connections.all():
+                connection.close()
+
+
+thread_executor = ThreadPoolExecutor()
+
+
+class BulkOperationJobs(object):
+    """
+    Keeps status of background bulk operations in the cache, so it could be
+    requested from any process. Job is a dict:
+
+        {
+            'id': '6f1a9c3b...',
+            'status': 'running',  # 'pending', 'running', 'succeeded' or 'failed'
+            'count': 1000,  # number of affected rows so far
+            'total': 5000,  # number of rows to process or None, if unknown
+            'error': None
+        }
+    """
+    PENDING = 'pending'
+    RUNNING = 'running'
+    SUCCEEDED = 'succeeded'
+    FAILED = 'failed'
+    error_message = 'Bulk operation failed.'
+
+    def __init__(self, cache=None, key_prefix='drf_extensions:bulk_operation_job'):
+        self._cache_alias = cache
+        self.key_prefix = key_prefix
+
+    @property
+    def cache(self):
+        return get_cache(self._cache_alias or extensions_api_settings.DEFAULT_USE_CACHE)
+
+    def get_key(self, job_id):
+        return u'{0}:{1}'.format(self.key_prefix, job_id)
+
+    def create(self):
+        job = {
+            'id': uuid.uuid4().hex,
+            'status': self.PENDING,
+            'count': 0,
+            'total': None,
+            'error': None,
+        }
+        self.save(job)
+        return job
+
+    def get(self, job_id):
+        return self.cache.get(self.get_key(job_id))
+
+    def save(self, job):
+        self.cache.set(self.get_key(job['id']), job, extensions_api_settings.DEFAULT_BULK_OPERATION_JOB_TIMEOUT)
+
+    def start(self, operation, executor=None):
+        """
+        Creates job and passes it to executor. Operation is called with
+        `report_progress(count, total=None)` function and returns number of
+        affected rows. Returns job as it was before execution.
+        """
+        job = self.create()
+        created_job = dict(job)
+        if executor is None:
+            executor = extensions_api_settings.DEFAULT_BULK_OPERATION_EXECUTOR
+        executor(lambda: self.run(job, operation))
+        return created_job
+
+    def run(self, job, operation):
+        def report_progress(count, total=None):
+            job['count'] = count
+            if total is not None:
+                job['total'] = total
+            self.save(job)
+
+        job['status'] = self.RUNNING
+        self.save(job)
+        try:
+            job['count'] = operation(report_progress=report_progress)
+        except Exception:
+            # exception message could disclose database details, so it's only logged
+            logger.exception('Bulk operation job %s failed', job['id'])
+            job['status'] = self.FAILED
+            job['error'] = self.error_message
+        else:
+            job['status'] = self.SUCCEEDED
+        self.save(job)
+
+
+bulk_operation_jobs = BulkOperationJobs()
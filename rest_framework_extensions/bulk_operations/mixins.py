@@ -1,13 +1,36 @@
 # -*- coding: utf-8 -*-
+import json
+
+from django.core.exceptions import ImproperlyConfigured, ValidationError
+from django.db import IntegrityError
+from django.db.models import AutoField, DO_NOTHING
+from django.db.models.signals import pre_delete, post_delete, m2m_changed
 from django.utils.text import force_text
 
 from rest_framework import status
 from rest_framework.response import Response
+from rest_framework.reverse import reverse
 from rest_framework_extensions.settings import extensions_api_settings
+from rest_framework_extensions.cache.invalidation import model_versions
+from rest_framework_extensions.compat import (
+    atomic,
+    Case,
+    When,
+    Value,
+    delete_queryset,
+    raw_delete_queryset,
+    get_live_receivers,
+)
+from rest_framework_extensions.bulk_operations.jobs import bulk_operation_jobs
 from rest_framework_extensions import utils
 
 
 class BulkOperationBaseMixin(object):
+    bulk_operation_async = extensions_api_settings.DEFAULT_BULK_OPERATION_ASYNC
+    bulk_operation_job_url_name = None
+    bulk_operation_max_rows = extensions_api_settings.DEFAULT_BULK_OPERATION_MAX_ROWS
+    bulk_update_batch_size = extensions_api_settings.DEFAULT_BULK_UPDATE_BATCH_SIZE
+
     def is_object_operation(self):
         return bool(self.get_object_lookup_value())
 
@@ -25,8 +48,186 @@ class BulkOperationBaseMixin(object):
         else:
             return True,  {}
 
+    def is_valid_bulk_operation_size(self, queryset):
+        """
+        Fetches at most `bulk_operation_max_rows + 1` primary keys to check
+        that operation doesn't affect more objects than allowed.
+        """
+        if self.bulk_operation_max_rows is None:
+            return True, {}
+        pks = queryset.order_by().values_list('pk', flat=True)[:self.bulk_operation_max_rows + 1]
+        return self.is_valid_bulk_operation_items_count(pks)
+
+    def is_valid_bulk_operation_items_count(self, items):
+        if self.bulk_operation_max_rows is not None and len(items) > self.bulk_operation_max_rows:
+            return False, {
+                'detail': 'Bulk operation should affect at most {0} objects.'.format(self.bulk_operation_max_rows)
+            }
+        return True, {}
+
+    def get_bulk_operation_dry_run(self):
+        """
+        Returns value of dry-run header or None, if it's not a dry run.
+        """
+        if extensions_api_settings.DEFAULT_BULK_OPERATION_DRY_RUN_HEADER_NAME:
+            header_name = utils.prepare_header_name(extensions_api_settings.DEFAULT_BULK_OPERATION_DRY_RUN_HEADER_NAME)
+            return self.request.META.get(header_name) or None
+        return None
+
+    def get_bulk_operation_dry_run_response(self, queryset, dry_run):
+        """
+        Responds with number of objects, which would be affected, without
+        changing them. With `estimate` header value number is estimated
+        by query planner, if database supports it.
+        """
+        count = None
+        if dry_run.lower() == 'estimate':
+            count = utils.estimate_queryset_count(queryset)
+        estimated = count is not None
+        if count is None:
+            count = queryset.count()
+        return Response({'count': count, 'estimated': estimated}, status=status.HTTP_200_OK)
+
+    def is_valid_bulk_create_objects(self, objects):
+        """
+        `bulk_create` saves only fields of the model table, so many to many,
+        reverse and nested relations restored by serializer would be lost.
+        """
+        for obj in objects:
+            for attr_name in ('_m2m_data', '_related_data', '_nested_forward_relations'):
+                if any(value for value in getattr(obj, attr_name, {}).values()):
+                    return False, {
+                        'detail': 'Many to many, reverse and nested relations are not saved by bulk create.'
+                    }
+        return True, {}
+
+    def invalidate_model_versions(self, queryset):
+        """
+        Bulk operations don't send model signals for every object, so
+        version of changed model is bumped once per operation.
+        """
+        model_versions.bump_existing(queryset.model)
+
+    def start_bulk_operation_job(self, operation):
+        """
+        Runs operation with `DEFAULT_BULK_OPERATION_EXECUTOR` and responds
+        with 202 and the job, which status could be requested from the
+        `bulk_operation_job_url_name` url.
+        """
+        job = bulk_operation_jobs.start(operation)
+        response = Response(job, status=status.HTTP_202_ACCEPTED)
+        if self.bulk_operation_job_url_name:
+            response['Location'] = reverse(
+                self.bulk_operation_job_url_name,
+                kwargs={'job_id': job['id']},
+                request=self.request
+            )
+        return response
+
+    def perform_update_bulk_items(self, queryset, update_dicts, report_progress=None, key_field='pk'):
+        """
+        `update_dicts` are keyed by values of `key_field`. Objects are grouped
+        by set of changed fields and every batch of group is updated with one
+        `UPDATE ... SET field = CASE WHEN ...` statement. Without conditional
+        expressions (Django < 1.8) objects of group are grouped by equal values,
+        and every subgroup is updated with one statement. `report_progress` is
+        called with number of updated objects after every batch. Returns number
+        of updated objects.
+        """
+        updated_count = 0
+        groups = {}
+        for key, update_dict in update_dicts.items():
+            if update_dict:
+                groups.setdefault(tuple(sorted(update_dict)), []).append(key)
+        for field_names, keys in groups.items():
+            for start in range(0, len(keys), self.bulk_update_batch_size):
+                batch = keys[start:start + self.bulk_update_batch_size]
+                if Case is not None:
+                    updated_count += self.update_with_case_expressions(queryset, field_names, dict(
+                        (key, update_dicts[key]) for key in batch
+                    ), key_field=key_field)
+                else:
+                    updated_count += self.update_with_equal_values(queryset, dict(
+                        (key, update_dicts[key]) for key in batch
+                    ), key_field=key_field)
+                if report_progress is not None:
+                    report_progress(updated_count)
+        return updated_count
+
+    def update_with_case_expressions(self, queryset, field_names, update_dicts, key_field='pk'):
+        opts = queryset.model._meta
+        values = {}
+        for field_name in field_names:
+            model_field = opts.get_field(field_name)
+            values[field_name] = Case(
+                *[
+                    When(then=Value(update_dict[field_name], output_field=model_field), **{key_field: key})
+                    for key, update_dict in update_dicts.items()
+                ],
+                output_field=model_field
+            )
+        return queryset.filter(**{key_field + '__in': list(update_dicts)}).update(**values)
+
+    def update_with_equal_values(self, queryset, update_dicts, key_field='pk'):
+        subgroups = {}
+        for key, update_dict in update_dicts.items():
+            subgroup_key = json.dumps(update_dict, sort_keys=True, default=force_text)
+            subgroups.setdefault(subgroup_key, (update_dict, []))[1].append(key)
+        updated_count = 0
+        for update_dict, keys in subgroups.values():
+            updated_count += queryset.filter(**{key_field + '__in': keys}).update(**update_dict)
+        return updated_count
+
+    def get_bulk_items(self, data, key_field_name, key_attribute_name):
+        """
+        Returns `(is_valid, errors, items)`, where items is list of `(key, item)`
+        pairs and key is converted to python value of `key_field_name` model
+        field. `key_attribute_name` is the view attribute, which sets the field.
+        """
+        key_field = self.get_queryset().model._meta.get_field(key_field_name)
+        if not (key_field.unique or key_field.primary_key):
+            raise ImproperlyConfigured(
+                '"{0}" of {1} should be unique model field, got "{2}"'.format(
+                    key_attribute_name, self.__class__.__name__, key_field_name
+                )
+            )
+        error = {
+            'detail': 'Every item should be an object with unique \'{0}\' field.'.format(key_field_name)
+        }
+        if not isinstance(data, list):
+            return False, error, None
+        items = []
+        keys = set()
+        for item in data:
+            if not isinstance(item, dict) or item.get(key_field_name) is None:
+                return False, error, None
+            try:
+                key = key_field.to_python(item[key_field_name])
+                is_duplicated = key in keys
+            except ValidationError as e:
+                return False, {'detail': ' '.join(e.messages)}, None
+            except TypeError:
+                # unhashable value, which is not converted by the field
+                return False, error, None
+            if is_duplicated:
+                return False, error, None
+            keys.add(key)
+            items.append((key, item))
+        return True, {}, items
+
+    def get_update_bulk_dict(self, serializer, data):
+        update_bulk_dict = {}
+        for field_name, field in serializer.fields.items():
+            if field_name in data and not field.read_only:
+                update_bulk_dict[field.source or field_name] = data[field_name]
+        return update_bulk_dict
+
 
 class ListDestroyModelMixin(BulkOperationBaseMixin):
+    bulk_destroy_batch_size = extensions_api_settings.DEFAULT_BULK_DESTROY_BATCH_SIZE
+    bulk_destroy_commit_per_batch = False
+    bulk_destroy_fast = None
+
     def delete(self, request, *args, **kwargs):
         if self.is_object_operation():
             return super(ListDestroyModelMixin, self).destroy(request, *args, **kwargs)
@@ -37,13 +238,121 @@ class ListDestroyModelMixin(BulkOperationBaseMixin):
         is_valid, errors = self.is_valid_bulk_operation()
         if is_valid:
             queryset = self.filter_queryset(self.get_queryset())
+            dry_run = self.get_bulk_operation_dry_run()
+            if dry_run:
+                return self.get_bulk_operation_dry_run_response(queryset, dry_run)
+            is_valid, errors = self.is_valid_bulk_operation_size(queryset)
+            if not is_valid:
+                return Response(errors, status=status.HTTP_400_BAD_REQUEST)
             self.pre_delete_bulk(queryset)  # todo: test and document me
-            queryset.delete()
+            fast = self.is_fast_destroy_bulk(queryset)
+            if self.bulk_operation_async:
+                return self.start_bulk_operation_job(
+                    lambda report_progress: self.run_destroy_bulk_job(queryset, fast, report_progress)
+                )
+            if self.bulk_destroy_batch_size:
+                deleted_count = self.perform_destroy_bulk_by_batches(queryset, fast=fast)
+            else:
+                deleted_count = self.perform_destroy_bulk(queryset, fast=fast)
             self.post_delete_bulk(queryset)  # todo: test and document me
-            return Response(status=status.HTTP_204_NO_CONTENT)
+            return Response({'count': deleted_count}, status=status.HTTP_200_OK)
         else:
             return Response(errors, status=status.HTTP_400_BAD_REQUEST)
 
+    def run_destroy_bulk_job(self, queryset, fast, report_progress):
+        total = queryset.count()
+        report_progress(0, total=total)
+        if self.bulk_destroy_batch_size:
+            deleted_count = self.perform_destroy_bulk_by_batches(
+                queryset,
+                fast=fast,
+                report_progress=report_progress
+            )
+        else:
+            deleted_count = self.perform_destroy_bulk(queryset, fast=fast)
+        self.post_delete_bulk(queryset)
+        return deleted_count
+
+    def is_fast_destroy_bulk(self, queryset):
+        if self.bulk_destroy_fast is None:
+            return self.can_fast_destroy_bulk(queryset)
+        else:
+            return self.bulk_destroy_fast
+
+    def can_fast_destroy_bulk(self, queryset):
+        """
+        Objects could be deleted with one DELETE statement without fetching them,
+        if there are no cascades, parents, generic relations and delete signal
+        receivers, except the model versions registry, which is bumped after
+        deletion. Checks follow Django's `Collector.can_fast_delete`, but
+        receivers are listed instead of `has_listeners()` to skip the registry.
+        """
+        model = queryset.model
+        own_receivers = (model_versions.on_save_or_delete, model_versions.on_m2m_changed)
+        for signal in (pre_delete, post_delete, m2m_changed):
+            if any(receiver not in own_receivers for receiver in get_live_receivers(signal, model)):
+                return False
+        opts = model._meta
+        if opts.concrete_model._meta.parents:
+            return False
+        for related in opts.get_all_related_objects(include_hidden=True, include_proxy_eq=True):
+            if related.field.rel.on_delete is not DO_NOTHING:
+                return False
+        for field in opts.virtual_fields:
+            if hasattr(field, 'bulk_related_objects'):
+                # generic relation
+                return False
+        return True
+
+    def perform_destroy_bulk(self, queryset, fast):
+        """
+        Returns number of deleted objects.
+        """
+        if fast:
+            queryset = queryset.order_by()
+            deleted_count = raw_delete_queryset(queryset)
+            self.invalidate_model_versions(queryset)
+            return deleted_count
+        else:
+            return delete_queryset(queryset)
+
+    def perform_destroy_bulk_by_batches(self, queryset, fast=False, report_progress=None):
+        """
+        Deletes objects by batches of `bulk_destroy_batch_size` primary keys,
+        so collector of related objects and locks are limited by batch size.
+        Batches are deleted in one transaction or, if
+        `bulk_destroy_commit_per_batch` is set, every batch is committed.
+        `report_progress` is called with number of deleted objects after every
+        batch. Returns number of deleted objects.
+        """
+        if self.bulk_destroy_commit_per_batch:
+            return self._destroy_bulk_by_batches(queryset, fast, batch_atomic=True, report_progress=report_progress)
+        with atomic():
+            return self._destroy_bulk_by_batches(queryset, fast, batch_atomic=False, report_progress=report_progress)
+
+    def _destroy_bulk_by_batches(self, queryset, fast, batch_atomic, report_progress=None):
+        deleted_count = 0
+        pks_queryset = queryset.order_by('pk').values_list('pk', flat=True)
+        last_pk = None
+        while True:
+            # pagination by key instead of offsets isn't affected by deleted rows
+            if last_pk is None:
+                pks = list(pks_queryset[:self.bulk_destroy_batch_size])
+            else:
+                pks = list(pks_queryset.filter(pk__gt=last_pk)[:self.bulk_destroy_batch_size])
+            if not pks:
+                return deleted_count
+            # base manager doesn't filter out rows, which are in the view queryset, like Django's collector
+            batch_queryset = queryset.model._base_manager.filter(pk__in=pks)
+            if batch_atomic:
+                with atomic():
+                    deleted_count += self.perform_destroy_bulk(batch_queryset, fast=fast)
+            else:
+                deleted_count += self.perform_destroy_bulk(batch_queryset, fast=fast)
+            last_pk = pks[-1]
+            if report_progress is not None:
+                report_progress(deleted_count)
+
     def pre_delete_bulk(self, queryset):
         """
         Placeholder method for calling before deleting an queryset.
@@ -58,9 +367,13 @@ class ListDestroyModelMixin(BulkOperationBaseMixin):
 
 
 class ListUpdateModelMixin(BulkOperationBaseMixin):
+    bulk_update_id_field = 'id'
+
     def patch(self, request, *args, **kwargs):
         if self.is_object_operation():
             return super(ListUpdateModelMixin, self).partial_update(request, *args, **kwargs)
+        elif isinstance(request.DATA, list):
+            return self.partial_update_bulk_items(request, *args, **kwargs)
         else:
             return self.partial_update_bulk(request, *args, **kwargs)
 
@@ -68,26 +381,100 @@ class ListUpdateModelMixin(BulkOperationBaseMixin):
         is_valid, errors = self.is_valid_bulk_operation()
         if is_valid:
             queryset = self.filter_queryset(self.get_queryset())
+            dry_run = self.get_bulk_operation_dry_run()
+            if dry_run:
+                return self.get_bulk_operation_dry_run_response(queryset, dry_run)
+            is_valid, errors = self.is_valid_bulk_operation_size(queryset)
+            if not is_valid:
+                return Response(errors, status=status.HTTP_400_BAD_REQUEST)
             update_bulk_dict = self.get_update_bulk_dict(serializer=self.get_serializer_class()(), data=request.DATA)
             self.pre_save_bulk(queryset, update_bulk_dict)  # todo: test and document me
+            if self.bulk_operation_async:
+                return self.start_bulk_operation_job(
+                    lambda report_progress: self.run_update_bulk_job(queryset, update_bulk_dict, report_progress)
+                )
             try:
-                queryset.update(**update_bulk_dict)
+                updated_count = queryset.update(**update_bulk_dict)
             except ValueError as e:
                 errors = {
                     'detail': force_text(e)
                 }
                 return Response(errors, status=status.HTTP_400_BAD_REQUEST)
+            self.invalidate_model_versions(queryset)
             self.post_save_bulk(queryset, update_bulk_dict)  # todo: test and document me
-            return Response(status=status.HTTP_204_NO_CONTENT)
+            return Response({'count': updated_count}, status=status.HTTP_200_OK)
         else:
             return Response(errors, status=status.HTTP_400_BAD_REQUEST)
 
-    def get_update_bulk_dict(self, serializer, data):
-        update_bulk_dict = {}
-        for field_name, field in serializer.fields.items():
-            if field_name in data and not field.read_only:
-                update_bulk_dict[field.source or field_name] = data[field_name]
-        return update_bulk_dict
+    def run_update_bulk_job(self, queryset, update_bulk_dict, report_progress):
+        report_progress(0, total=queryset.count())
+        with atomic():
+            updated_count = queryset.update(**update_bulk_dict)
+        self.invalidate_model_versions(queryset)
+        self.post_save_bulk(queryset, update_bulk_dict)
+        return updated_count
+
+    def partial_update_bulk_items(self, request, *args, **kwargs):
+        """
+        Updates every object from the list of `{id, ...fields}` dicts with its
+        own values, objects are matched by `bulk_update_id_field`. Only objects
+        from the filtered queryset are updated.
+        """
+        is_valid, errors = self.is_valid_bulk_operation()
+        if is_valid:
+            queryset = self.filter_queryset(self.get_queryset())
+            is_valid, errors, items = self.get_bulk_items(
+                request.DATA,
+                key_field_name=self.bulk_update_id_field,
+                key_attribute_name='bulk_update_id_field'
+            )
+            if not is_valid:
+                return Response(errors, status=status.HTTP_400_BAD_REQUEST)
+            serializer = self.get_serializer_class()()
+            update_dicts = {}
+            for key, item in items:
+                update_dict = self.get_update_bulk_dict(serializer=serializer, data=item)
+                update_dict.pop(self.bulk_update_id_field, None)
+                update_dicts[key] = update_dict
+            items_queryset = queryset.filter(**{self.bulk_update_id_field + '__in': list(update_dicts)})
+            dry_run = self.get_bulk_operation_dry_run()
+            if dry_run:
+                return self.get_bulk_operation_dry_run_response(items_queryset, dry_run)
+            is_valid, errors = self.is_valid_bulk_operation_size(items_queryset)
+            if not is_valid:
+                return Response(errors, status=status.HTTP_400_BAD_REQUEST)
+            if self.bulk_operation_async:
+                return self.start_bulk_operation_job(
+                    lambda report_progress: self.run_update_bulk_items_job(queryset, update_dicts, report_progress)
+                )
+            try:
+                with atomic():
+                    updated_count = self.perform_update_bulk_items(
+                        queryset,
+                        update_dicts,
+                        key_field=self.bulk_update_id_field
+                    )
+            except ValueError as e:
+                errors = {
+                    'detail': force_text(e)
+                }
+                return Response(errors, status=status.HTTP_400_BAD_REQUEST)
+            self.invalidate_model_versions(queryset)
+            return Response({'count': updated_count}, status=status.HTTP_200_OK)
+        else:
+            return Response(errors, status=status.HTTP_400_BAD_REQUEST)
+
+    def run_update_bulk_items_job(self, queryset, update_dicts, report_progress):
+        report_progress(0, total=len(update_dicts))
+        with atomic():
+            updated_count = self.perform_update_bulk_items(
+                queryset,
+                update_dicts,
+                report_progress=report_progress,
+                key_field=self.bulk_update_id_field
+            )
+        self.invalidate_model_versions(queryset)
+        return updated_count
 
     def pre_save_bulk(self, queryset, update_bulk_dict):
         """
@@ -99,4 +486,195 @@ class ListUpdateModelMixin(BulkOperationBaseMixin):
         """
         Placeholder method for calling after deleting an queryset.
         """
-        pass
\ No newline at end of file
+        pass
+
+
+class ListCreateBulkModelMixin(BulkOperationBaseMixin):
+    bulk_create_batch_size = extensions_api_settings.DEFAULT_BULK_CREATE_BATCH_SIZE
+
+    def create(self, request, *args, **kwargs):
+        if isinstance(request.DATA, list):
+            return self.create_bulk(request, *args, **kwargs)
+        else:
+            return super(ListCreateBulkModelMixin, self).create(request, *args, **kwargs)
+
+    def create_bulk(self, request, *args, **kwargs):
+        is_valid, errors = self.is_valid_bulk_operation()
+        if is_valid:
+            is_valid, errors = self.is_valid_bulk_operation_items_count(request.DATA)
+            if not is_valid:
+                return Response(errors, status=status.HTTP_400_BAD_REQUEST)
+            serializer = self.get_serializer(data=request.DATA, files=request.FILES, many=True)
+            if not serializer.is_valid():
+                return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+            objects = list(serializer.object)
+            is_valid, errors = self.is_valid_bulk_create_objects(objects)
+            if not is_valid:
+                return Response(errors, status=status.HTTP_400_BAD_REQUEST)
+            for obj in objects:
+                self.pre_save(obj)
+            with atomic():
+                self.pre_create_bulk(objects)
+                self.perform_create_bulk(objects)
+            self.invalidate_model_versions(self.get_queryset())
+            self.post_create_bulk(objects)
+            return Response(serializer.data, status=status.HTTP_201_CREATED)
+        else:
+            return Response(errors, status=status.HTTP_400_BAD_REQUEST)
+
+    def perform_create_bulk(self, objects):
+        """
+        Inserts objects with `bulk_create` by batches of `bulk_create_batch_size`.
+        Model signals are not sent and primary keys are not set on most databases.
+        """
+        manager = self.get_queryset().model._default_manager
+        manager.bulk_create(objects, batch_size=self.bulk_create_batch_size)
+
+    def pre_create_bulk(self, objects):
+        """
+        Placeholder method for calling before creating objects.
+        """
+        pass
+
+    def post_create_bulk(self, objects):
+        """
+        Placeholder method for calling after creating objects.
+        """
+        pass
+
+
+class ListUpsertModelMixin(BulkOperationBaseMixin):
+    bulk_upsert_key_field = None
+    bulk_create_batch_size = extensions_api_settings.DEFAULT_BULK_CREATE_BATCH_SIZE
+
+    def put(self, request, *args, **kwargs):
+        if self.is_object_operation():
+            return super(ListUpsertModelMixin, self).update(request, *args, **kwargs)
+        else:
+            return self.upsert_bulk(request, *args, **kwargs)
+
+    def upsert_bulk(self, request, *args, **kwargs):
+        """
+        Creates or updates every object from the list of dicts, which are
+        matched with existing objects by `bulk_upsert_key_field`. Existing
+        objects are fetched with one query, new objects are inserted with
+        `bulk_create`, existing ones are updated like per-object bulk update.
+        """
+        is_valid, errors = self.is_valid_bulk_operation()
+        if not is_valid:
+            return Response(errors, status=status.HTTP_400_BAD_REQUEST)
+        is_valid, errors, items = self.get_upsert_bulk_items(request.DATA)
+        if not is_valid:
+            return Response(errors, status=status.HTTP_400_BAD_REQUEST)
+        is_valid, errors = self.is_valid_bulk_operation_items_count(items)
+        if not is_valid:
+            return Response(errors, status=status.HTTP_400_BAD_REQUEST)
+        queryset = self.filter_queryset(self.get_queryset())
+        existing_queryset = queryset.filter(**{self.bulk_upsert_key_field + '__in': [key for key, item in items]})
+        existing_pks = dict(existing_queryset.order_by().values_list(self.bulk_upsert_key_field, 'pk'))
+        new_items = [(key, item) for key, item in items if key not in existing_pks]
+        if self.get_bulk_operation_dry_run():
+            return Response({
+                'created': len(new_items),
+                'updated': len(items) - len(new_items),
+            }, status=status.HTTP_200_OK)
+
+        # errors are listed in the order of items, like errors of serializer with many=True
+        errors = []
+        for key, item in items:
+            if key in existing_pks:
+                errors.append(self.get_upsert_bulk_update_errors(item))
+            else:
+                errors.append({})
+        objects = []
+        if new_items:
+            serializer = self.get_serializer(data=[item for key, item in new_items], files=request.FILES, many=True)
+            if serializer.is_valid():
+                objects = list(serializer.object)
+            else:
+                new_item_positions = [
+                    position for position, (key, item) in enumerate(items) if key not in existing_pks
+                ]
+                for position, item_errors in zip(new_item_positions, serializer.errors):
+                    errors[position] = item_errors
+        if any(errors):
+            return Response(errors, status=status.HTTP_400_BAD_REQUEST)
+        if objects:
+            is_valid, errors = self.is_valid_bulk_create_objects(objects)
+            if not is_valid:
+                return Response(errors, status=status.HTTP_400_BAD_REQUEST)
+            for obj, (key, item) in zip(objects, new_items):
+                # key field could be read only in serializer
+                setattr(obj, self.bulk_upsert_key_field, key)
+                self.pre_save(obj)
+        serializer = self.get_serializer_class()()
+        update_dicts = {}
+        for key, item in items:
+            if key in existing_pks:
+                update_dict = self.get_update_bulk_dict(serializer=serializer, data=item)
+                update_dict.pop(self.bulk_upsert_key_field, None)
+                update_dicts[existing_pks[key]] = update_dict
+        try:
+            with atomic():
+                self.perform_upsert_bulk(queryset, objects, update_dicts)
+        except ValueError as e:
+            errors = {
+                'detail': force_text(e)
+            }
+            return Response(errors, status=status.HTTP_400_BAD_REQUEST)
+        except IntegrityError:
+            # database error message could disclose schema and data of other objects
+            errors = {
+                'detail': 'Objects could not be saved because of conflicting data.'
+            }
+            return Response(errors, status=status.HTTP_400_BAD_REQUEST)
+        self.invalidate_model_versions(queryset)
+        return Response({
+            'created': len(objects),
+            'updated': len(update_dicts),
+        }, status=status.HTTP_200_OK)
+
+    def get_upsert_bulk_update_errors(self, data):
+        """
+        Returns errors of serializer fields for partial data of existing
+        object. Model validation is skipped, because it would query the
+        database for every item.
+        """
+        serializer = self.get_serializer(data=data, partial=True)
+        serializer._errors = {}
+        attrs = serializer.restore_fields(data, None)
+        if attrs is not None:
+            serializer.perform_validation(attrs)
+        return serializer._errors
+
+    def get_upsert_bulk_items(self, data):
+        """
+        Returns list of `(key, item)` pairs, where key is converted to python
+        value of `bulk_upsert_key_field` model field.
+        """
+        if self.bulk_upsert_key_field is None:
+            raise ImproperlyConfigured(
+                '{0} should set "bulk_upsert_key_field" attribute'.format(self.__class__.__name__)
+            )
+        key_field = self.get_queryset().model._meta.get_field(self.bulk_upsert_key_field)
+        if isinstance(key_field, AutoField):
+            # keys chosen by clients would get ahead of the primary key sequence
+            raise ImproperlyConfigured(
+                '"bulk_upsert_key_field" of {0} should be natural key, got auto field "{1}"'.format(
+                    self.__class__.__name__, self.bulk_upsert_key_field
+                )
+            )
+        return self.get_bulk_items(
+            data,
+            key_field_name=self.bulk_upsert_key_field,
+            key_attribute_name='bulk_upsert_key_field'
+        )
+
+    def perform_upsert_bulk(self, queryset, objects, update_dicts):
+        """
+        Inserts new objects by batches of `bulk_create_batch_size` and updates
+        existing ones by batches of `bulk_update_batch_size`.
+        """
+        if objects:
+            queryset.model._default_manager.bulk_create(objects, batch_size=self.bulk_create_batch_size)
+        self.perform_update_bulk_items(queryset, update_dicts)
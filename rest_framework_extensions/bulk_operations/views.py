@@ -0,0 +1,19 @@
+# -*- coding: utf-8 -*-
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from rest_framework_extensions.bulk_operations.jobs import bulk_operation_jobs
+
+
+class BulkOperationJobView(APIView):
+    """
+    Returns status of background bulk operation by `job_id` url kwarg.
+    """
+    jobs = bulk_operation_jobs
+
+    def get(self, request, job_id, *args, **kwargs):
+        job = self.jobs.get(job_id)
+        if job is None:
+            return Response({'detail': 'Not found'}, status=status.HTTP_404_NOT_FOUND)
+        return Response(job)
@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+import threading
+import time
+from collections import OrderedDict
+
+from django.core.cache.backends.base import BaseCache
+
+from rest_framework_extensions.compat import DEFAULT_TIMEOUT, six
+
+try:
+    import cPickle as pickle
+except ImportError:
+    import pickle
+
+
+class TwoTierCache(BaseCache):
+    """
+    Fronts the cache with alias `LOCATION` (L2) with bounded per-process LRU
+    cache (L1). Writes go through to both tiers, reads are served from L1 when
+    possible. L1 entries live at most `L1_TIMEOUT` seconds, so changes made
+    by other processes become visible after that time.
+
+    Example:
+
+        CACHES = {
+            'two_tier': {
+                'BACKEND': 'rest_framework_extensions.cache.backends.TwoTierCache',
+                'LOCATION': 'default',
+                'OPTIONS': {
+                    'L1_MAX_SIZE': 10 * 1024 * 1024,  # bytes
+                    'L1_TIMEOUT': 5,  # seconds
+                }
+            }
+        }
+    """
+    default_l1_max_size = 10 * 1024 * 1024
+    default_l1_timeout = 5
+
+    def __init__(self, location, params):
+        super(TwoTierCache, self).__init__(params)
+        options = params.get('OPTIONS', {})
+        self.l2_alias = location or 'default'
+        self.l1_max_size = int(options.get('L1_MAX_SIZE', self.default_l1_max_size))
+        self.l1_timeout = options.get('L1_TIMEOUT', self.default_l1_timeout)
+        self._l2 = None
+        self._l1 = OrderedDict()  # key -> (pickled value, expiration time)
+        self._l1_size = 0
+        self._lock = threading.RLock()
+        self.reset_stats()
+
+    @property
+    def l2(self):
+        if self._l2 is None:
+            # imported here to avoid circular import while caches are configured
+            from rest_framework_extensions.utils import get_cache
+            self._l2 = get_cache(self.l2_alias)
+        return self._l2
+
+    def reset_stats(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_stats(self):
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'entries': len(self._l1),
+                'size': self._l1_size,
+            }
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        # L2 decides whether key exists, so add() stays usable for locks shared between processes
+        added = self.l2.add(key, value, timeout, version=version)
+        if added:
+            self._set_l1(self.make_key(key, version=version), value, timeout)
+        return added
+
+    def get(self, key, default=None, version=None):
+        l1_key = self.make_key(key, version=version)
+        found, value = self._get_l1(l1_key)
+        if found:
+            return value
+        missing = object()
+        value = self.l2.get(key, missing, version=version)
+        if value is missing:
+            return default
+        self._set_l1(l1_key, value)
+        return value
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        self.l2.set(key, value, timeout, version=version)
+        self._set_l1(self.make_key(key, version=version), value, timeout)
+
+    def delete(self, key, version=None):
+        self.l2.delete(key, version=version)
+        self._delete_l1(self.make_key(key, version=version))
+
+    def has_key(self, key, version=None):
+        return self.l2.has_key(key, version=version)
+
+    def incr(self, key, delta=1, version=None):
+        self._delete_l1(self.make_key(key, version=version))
+        return self.l2.incr(key, delta, version=version)
+
+    def decr(self, key, delta=1, version=None):
+        self._delete_l1(self.make_key(key, version=version))
+        return self.l2.decr(key, delta, version=version)
+
+    def clear(self):
+        self.l2.clear()
+        self.clear_l1()
+
+    def clear_l1(self):
+        with self._lock:
+            self._l1.clear()
+            self._l1_size = 0
+
+    def _get_l1(self, l1_key):
+        with self._lock:
+            item = self._l1.get(l1_key)
+            if item is not None and item[1] <= time.time():
+                self._delete_l1(l1_key)
+                item = None
+            if item is None:
+                self.misses += 1
+                return False, None
+            self.hits += 1
+            # move to the end of LRU
+            del self._l1[l1_key]
+            self._l1[l1_key] = item
+        # unpickling gives every caller its own copy of the value
+        return True, pickle.loads(item[0])
+
+    def _set_l1(self, l1_key, value, timeout=DEFAULT_TIMEOUT):
+        l1_timeout = self.l1_timeout
+        if isinstance(timeout, six.integer_types + (float,)):
+            l1_timeout = min(l1_timeout, timeout)
+        pickled = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            self._delete_l1(l1_key)
+            if l1_timeout <= 0 or len(pickled) > self.l1_max_size:
+                return
+            while self._l1_size + len(pickled) > self.l1_max_size:
+                evicted_key, evicted_item = self._l1.popitem(last=False)
+                self._l1_size -= len(evicted_item[0])
+                self.evictions += 1
+            self._l1[l1_key] = (pickled, time.time() + l1_timeout)
+            self._l1_size += len(pickled)
+
+    def _delete_l1(self, l1_key):
+        with self._lock:
+            item = self._l1.pop(l1_key, None)
+            if item is not None:
+                self._l1_size -= len(item[0])
@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+import zlib
+
+from django.core.exceptions import ImproperlyConfigured
+
+from rest_framework_extensions.compat import lzma
+
+
+# wbits offset which makes zlib produce and consume gzip container
+GZIP_WBITS = 16 + zlib.MAX_WBITS
+
+
+def zlib_compress(content):
+    return zlib.compress(content)
+
+
+def zlib_decompress(content):
+    return zlib.decompress(content)
+
+
+def gzip_compress(content):
+    compressor = zlib.compressobj(zlib.Z_DEFAULT_COMPRESSION, zlib.DEFLATED, GZIP_WBITS)
+    return compressor.compress(content) + compressor.flush()
+
+
+def gzip_decompress(content):
+    return zlib.decompress(content, GZIP_WBITS)
+
+
+def lzma_compress(content):
+    return lzma.compress(content)
+
+
+def lzma_decompress(content):
+    return lzma.decompress(content)
+
+
+compressors = {
+    'zlib': (zlib_compress, zlib_decompress),
+    'gzip': (gzip_compress, gzip_decompress),
+    'lzma': (lzma_compress, lzma_decompress),
+}
+
+
+def get_compressor(name):
+    """
+    Returns `(compress, decompress)` functions pair for compression algorithm `name`.
+    """
+    if name not in compressors:
+        raise ImproperlyConfigured(
+            'Unknown cache compression "{0}". Choices are: {1}'.format(name, ', '.join(sorted(compressors)))
+        )
+    if name == 'lzma' and lzma is None:
+        raise ImproperlyConfigured('lzma cache compression requires python 3.3 or later')
+    return compressors[name]
+
+
+def compress(name, content):
+    return get_compressor(name)[0](content)
+
+
+def decompress(name, content):
+    return get_compressor(name)[1](content)
@@ -1,15 +1,42 @@
 # -*- coding: utf-8 -*-
+import math
+import random
+import re
+import time
 from functools import wraps
 
+from django.http import HttpResponse
+from django.utils.cache import cc_delim_re, patch_vary_headers
 from django.utils.decorators import available_attrs
+from django.utils.http import parse_etags, quote_etag
 
-from rest_framework_extensions.utils import get_cache
+from rest_framework import status
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.response import Response
+
+from rest_framework_extensions.utils import get_cache, pop_key_from_previous_decorator
 from rest_framework_extensions.settings import extensions_api_settings
 from rest_framework_extensions.compat import six
+from rest_framework_extensions.cache import compression as compression_module
+
+
+re_accepts_gzip = re.compile(r'\bgzip\b')
 
 
 class CacheResponse(object):
-    def __init__(self, timeout=None, key_func=None, cache=None):
+    def __init__(self,
+                 timeout=None,
+                 key_func=None,
+                 cache=None,
+                 single_flight=None,
+                 lock_timeout=None,
+                 lock_wait_timeout=None,
+                 stale_ttl=None,
+                 xfetch_beta=None,
+                 compact=None,
+                 compression=None,
+                 compression_min_size=None,
+                 etag=None):
         if timeout is None:
             self.timeout = extensions_api_settings.DEFAULT_CACHE_RESPONSE_TIMEOUT
         else:
@@ -20,6 +47,53 @@ class CacheResponse(object):
         else:
             self.key_func = key_func
 
+        if single_flight is None:
+            self.single_flight = extensions_api_settings.DEFAULT_CACHE_SINGLE_FLIGHT
+        else:
+            self.single_flight = single_flight
+
+        if lock_timeout is None:
+            self.lock_timeout = extensions_api_settings.DEFAULT_CACHE_LOCK_TIMEOUT
+        else:
+            self.lock_timeout = lock_timeout
+
+        if lock_wait_timeout is None:
+            self.lock_wait_timeout = extensions_api_settings.DEFAULT_CACHE_LOCK_WAIT_TIMEOUT
+        else:
+            self.lock_wait_timeout = lock_wait_timeout
+
+        if stale_ttl is None:
+            self.stale_ttl = extensions_api_settings.DEFAULT_CACHE_STALE_TTL
+        else:
+            self.stale_ttl = stale_ttl
+
+        if xfetch_beta is None:
+            self.xfetch_beta = extensions_api_settings.DEFAULT_CACHE_XFETCH_BETA
+        else:
+            self.xfetch_beta = xfetch_beta
+
+        if compact is None:
+            self.compact = extensions_api_settings.DEFAULT_CACHE_COMPACT_RESPONSE
+        else:
+            self.compact = compact
+
+        if compression is None:
+            self.compression = extensions_api_settings.DEFAULT_CACHE_COMPRESSION
+        else:
+            self.compression = compression
+        if self.compression is not None:
+            compression_module.get_compressor(self.compression)  # fail fast on unknown algorithm
+
+        if compression_min_size is None:
+            self.compression_min_size = extensions_api_settings.DEFAULT_CACHE_COMPRESSION_MIN_SIZE
+        else:
+            self.compression_min_size = compression_min_size
+
+        if etag is None:
+            self.etag = extensions_api_settings.DEFAULT_CACHE_ETAG
+        else:
+            self.etag = etag
+
         self.cache = get_cache(cache or extensions_api_settings.DEFAULT_USE_CACHE)
 
     def __call__(self, func):
@@ -48,16 +122,284 @@ class CacheResponse(object):
             args=args,
             kwargs=kwargs
         )
-        response = self.cache.get(key)
-        if not response:
-            response = view_method(view_instance, request, *args, **kwargs)
-            response = view_instance.finalize_response(request, response, *args, **kwargs)
-            response.render()  # should be rendered, before picklining while storing to cache
-            self.cache.set(key, response, self.timeout)
+        entry = self.get_cache_entry(key)
+        if entry is None:
+            if self.single_flight:
+                response = self.get_single_flight_response(
+                    key=key,
+                    view_instance=view_instance,
+                    view_method=view_method,
+                    request=request,
+                    args=args,
+                    kwargs=kwargs
+                )
+            else:
+                response = self.build_and_cache_response(
+                    key=key,
+                    view_instance=view_instance,
+                    view_method=view_method,
+                    request=request,
+                    args=args,
+                    kwargs=kwargs
+                )
+        elif self.is_stale(entry):
+            if self.acquire_lock(key):
+                # only one request revalidates stale response, others are served with the stale one
+                try:
+                    response = self.build_and_cache_response(
+                        key=key,
+                        view_instance=view_instance,
+                        view_method=view_method,
+                        request=request,
+                        args=args,
+                        kwargs=kwargs
+                    )
+                finally:
+                    self.release_lock(key)
+            else:
+                response = self.get_response_from_cache_entry(entry, view_instance, request)
+        elif self.is_early_expired(entry):
+            response = self.build_and_cache_response(
+                key=key,
+                view_instance=view_instance,
+                view_method=view_method,
+                request=request,
+                args=args,
+                kwargs=kwargs
+            )
+        else:
+            response = self.get_response_from_cache_entry(entry, view_instance, request)
+        if self.etag and response.status_code != status.HTTP_304_NOT_MODIFIED:
+            etag = response.get('ETag')
+            if self.is_not_modified(etag, request):
+                response = self.get_not_modified_response(etag)
         if not hasattr(response, '_closable_objects'):
             response._closable_objects = []
         return response
 
+    def build_and_cache_response(self,
+                                 key,
+                                 view_instance,
+                                 view_method,
+                                 request,
+                                 args,
+                                 kwargs):
+        started_at = time.time()
+        response = view_method(view_instance, request, *args, **kwargs)
+        response = view_instance.finalize_response(request, response, *args, **kwargs)
+        response.render()  # should be rendered, before picklining while storing to cache
+        if self.etag:
+            self.set_etag(response)
+        entry = self.prepare_cache_entry(response=response, delta=time.time() - started_at)
+        self.cache.set(key, entry, self.get_cache_timeout())
+        return response
+
+    def prepare_cache_entry(self, response, delta):
+        """
+        `delta` is the time in seconds spent on response building.
+        """
+        if self.compact or self.compression is not None:
+            entry = {
+                'content': response.content,
+                'status': response.status_code,
+                'headers': self.get_headers_for_cache_entry(response),
+            }
+            if self.compression is not None and len(entry['content']) >= self.compression_min_size:
+                entry['content'] = compression_module.compress(self.compression, entry['content'])
+                entry['compression'] = self.compression
+        elif self.is_expiration_tracked() or self.etag:
+            entry = {'response': response}
+        else:
+            return response
+        if self.etag and response.has_header('ETag'):
+            entry['etag'] = response['ETag']
+        if self.is_expiration_tracked():
+            entry['soft_expires'] = time.time() + self.timeout
+            entry['delta'] = delta
+        return entry
+
+    def get_headers_for_cache_entry(self, response):
+        allowed_headers = set([
+            header.lower() for header in extensions_api_settings.DEFAULT_CACHE_RESPONSE_HEADERS
+        ])
+        return [
+            (name, value) for name, value in response.items() if name.lower() in allowed_headers
+        ]
+
+    def get_cache_entry(self, key):
+        entry = self.cache.get(key)
+        if not entry:
+            return None
+        elif isinstance(entry, dict):
+            return entry
+        else:
+            # responses without metadata are stored as is
+            return {'response': entry}
+
+    def get_response_from_cache_entry(self, entry, view_instance, request):
+        compression = entry.get('compression')
+        serve_compressed = (
+            compression == 'gzip' and
+            self.patch_view_vary_header(view_instance) and
+            self.is_gzip_accepted(request)
+        )
+        etag = entry.get('etag')
+        if etag and serve_compressed and not etag.startswith('W/'):
+            # etag is calculated from identity content, so it's weak for gzipped bytes of the same representation
+            etag = 'W/' + etag
+        if self.etag and self.is_not_modified(etag, request):
+            # conditional request is answered without building response from the entry
+            return self.get_not_modified_response(etag)
+        if 'response' in entry:
+            return entry['response']
+        content = entry['content']
+        if compression is not None and not serve_compressed:
+            content = compression_module.decompress(compression, content)
+        response = HttpResponse(content=content, status=entry['status'])
+        for name, value in entry['headers']:
+            response[name] = value
+        if compression == 'gzip':
+            patch_vary_headers(response, ('Accept-Encoding',))
+        if serve_compressed:
+            # gzipped bytes are served as is, without decompression and compression again
+            response['Content-Encoding'] = 'gzip'
+            if etag:
+                response['ETag'] = etag
+        return response
+
+    def set_etag(self, response):
+        """
+        Sets ETag calculated from the rendered content of successful response
+        with `DEFAULT_ETAG_CONTENT_HASHER`, if view didn't set its own.
+        """
+        if 200 <= response.status_code < 300 and not response.has_header('ETag'):
+            response['ETag'] = quote_etag(extensions_api_settings.DEFAULT_ETAG_CONTENT_HASHER(response.content))
+
+    def is_not_modified(self, etag, request):
+        if not etag or request.method not in SAFE_METHODS:
+            return False
+        if_none_match = request.META.get('HTTP_IF_NONE_MATCH')
+        if not if_none_match:
+            return False
+        try:
+            etags = parse_etags(if_none_match)
+        except ValueError:
+            return False
+        return '*' in etags or parse_etags(etag)[0] in etags
+
+    def get_not_modified_response(self, etag):
+        response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        response['ETag'] = etag
+        return response
+
+    def patch_view_vary_header(self, view_instance):
+        """
+        View's `finalize_response` sets view's `headers` to the response and
+        overwrites its `Vary` header, e.g. with `Accept` for views with several
+        renderers. `Accept-Encoding` is added to the `Vary` of view's headers,
+        so it's kept. Returns `False` if it couldn't be added, then gzipped
+        content shouldn't be served.
+        """
+        headers = getattr(view_instance, 'headers', None)
+        if headers is None:
+            # response headers are not overwritten by view
+            return True
+        if not isinstance(headers, dict) or view_instance.headers is not headers:
+            return False
+        for name in headers:
+            if name.lower() == 'vary':
+                values = [value.strip() for value in cc_delim_re.split(headers[name]) if value.strip()]
+                if 'accept-encoding' not in [value.lower() for value in values]:
+                    headers[name] = ', '.join(values + ['Accept-Encoding'])
+        return True
+
+    def is_gzip_accepted(self, request):
+        return bool(re_accepts_gzip.search(request.META.get('HTTP_ACCEPT_ENCODING', '')))
+
+    def is_expiration_tracked(self):
+        return self.timeout is not None and (self.stale_ttl is not None or self.xfetch_beta is not None)
+
+    def get_cache_timeout(self):
+        if self.stale_ttl is None or self.timeout is None:
+            return self.timeout
+        else:
+            return self.timeout + self.stale_ttl
+
+    def is_stale(self, entry):
+        soft_expires = entry.get('soft_expires')
+        return soft_expires is not None and soft_expires <= time.time()
+
+    def is_early_expired(self, entry):
+        """
+        Probabilistic early expiration (XFetch). Probability of recomputation
+        grows as entry approaches its expiration time and is greater for
+        responses which took longer to build.
+
+        See "Optimal Probabilistic Cache Stampede Prevention" by Vattani et al.
+        """
+        soft_expires = entry.get('soft_expires')
+        delta = entry.get('delta')
+        if self.xfetch_beta is None or soft_expires is None or delta is None:
+            return False
+        # 1 - random() is in (0, 1], so logarithm is always defined and not positive
+        return time.time() - delta * self.xfetch_beta * math.log(1.0 - random.random()) >= soft_expires
+
+    def get_single_flight_response(self,
+                                   key,
+                                   view_instance,
+                                   view_method,
+                                   request,
+                                   args,
+                                   kwargs):
+        """
+        Only the process which acquired the lock rebuilds the response. Others
+        poll the cache until the response appears, the lock is released or
+        `lock_wait_timeout` is exceeded. In the last case response is built
+        without the lock, so a stuck lock holder never blocks the endpoint.
+        """
+        deadline = time.time() + self.lock_wait_timeout
+        while True:
+            if self.acquire_lock(key):
+                try:
+                    # lock holder could have filled the cache between our miss and the lock acquiring
+                    entry = self.get_cache_entry(key)
+                    if entry is None:
+                        return self.build_and_cache_response(
+                            key=key,
+                            view_instance=view_instance,
+                            view_method=view_method,
+                            request=request,
+                            args=args,
+                            kwargs=kwargs
+                        )
+                    else:
+                        return self.get_response_from_cache_entry(entry, view_instance, request)
+                finally:
+                    self.release_lock(key)
+            if time.time() >= deadline:
+                break
+            time.sleep(extensions_api_settings.DEFAULT_CACHE_LOCK_POLL_INTERVAL)
+            entry = self.get_cache_entry(key)
+            if entry is not None:
+                return self.get_response_from_cache_entry(entry, view_instance, request)
+        return self.build_and_cache_response(
+            key=key,
+            view_instance=view_instance,
+            view_method=view_method,
+            request=request,
+            args=args,
+            kwargs=kwargs
+        )
+
+    def get_lock_key(self, key):
+        return u'{0}:lock'.format(key)
+
+    def acquire_lock(self, key):
+        return self.cache.add(self.get_lock_key(key), 1, self.lock_timeout)
+
+    def release_lock(self, key):
+        self.cache.delete(self.get_lock_key(key))
+
     def calculate_key(self,
                       view_instance,
                       view_method,
@@ -68,6 +410,15 @@ class CacheResponse(object):
             key_func = getattr(view_instance, self.key_func)
         else:
             key_func = self.key_func
+        # key could be already calculated by @etag decorator with the same function
+        key = pop_key_from_previous_decorator(
+            request=request,
+            key_func=key_func,
+            view_instance=view_instance,
+            view_method=view_method
+        )
+        if key is not None:
+            return key
         return key_func(
             view_instance=view_instance,
             view_method=view_method,
@@ -77,4 +428,4 @@ class CacheResponse(object):
         )
 
 
-cache_response = CacheResponse
\ No newline at end of file
+cache_response = CacheResponse
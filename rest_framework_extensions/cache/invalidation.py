@@ -0,0 +1,163 @@
+# -*- coding: utf-8 -*-
+import threading
+import time
+
+from django.db.models.signals import post_save, post_delete, m2m_changed
+
+from rest_framework_extensions.compat import (
+    get_concrete_model,
+    get_model_name,
+    get_models,
+    get_many_to_many_through_models,
+)
+from rest_framework_extensions.settings import extensions_api_settings
+from rest_framework_extensions.utils import get_cache
+
+
+class ModelVersionRegistry(object):
+    """
+    Keeps version number for every registered model in the cache. Version is
+    changed whenever instance of the model is saved, deleted or its many to
+    many relations are changed. Versions are meant to be folded into the cache
+    keys, so changed data produces new keys and cached responses become fresh
+    immediately, regardless of their timeouts.
+
+    Receivers are connected only for registered models (and their proxies
+    and many to many through models), so other models are still fast deleted
+    by `QuerySet.delete()`. Register models at startup of every process,
+    which changes their data. Missing version is created by the reader, so
+    receivers don't create it.
+
+    Signals are not sent by `QuerySet.update()`, `QuerySet.bulk_create()` and
+    raw SQL, so call `bump()` by yourself after such changes.
+    """
+    m2m_actions = ('post_add', 'post_remove', 'post_clear')
+
+    def __init__(self, cache=None, key_prefix='drf_extensions:model_version'):
+        self._cache_alias = cache
+        self.key_prefix = key_prefix
+        self.models = set()
+        self._lock = threading.Lock()
+
+    @property
+    def cache(self):
+        return get_cache(self._cache_alias or extensions_api_settings.DEFAULT_USE_CACHE)
+
+    def register(self, *models):
+        with self._lock:
+            for model in models:
+                model = get_concrete_model(model)
+                if model not in self.models:
+                    self.connect(model)
+                    self.models.add(model)
+
+    def unregister(self, *models):
+        with self._lock:
+            for model in models:
+                model = get_concrete_model(model)
+                if model in self.models:
+                    self.disconnect(model)
+                    self.models.discard(model)
+
+    def is_registered(self, model):
+        return get_concrete_model(model) in self.models
+
+    def get_dispatch_uid(self):
+        return '{0}.{1}'.format(self.key_prefix, id(self))
+
+    def get_senders(self, model):
+        """
+        Returns senders of `post_save` and `post_delete` signals for concrete
+        model - the model itself and its proxies, and senders of `m2m_changed`
+        signal - through models of its many to many relations.
+        """
+        models = [model] + [
+            other_model for other_model in get_models()
+            if other_model._meta.proxy and get_concrete_model(other_model) is model
+        ]
+        return models, get_many_to_many_through_models(model)
+
+    def connect(self, model):
+        uid = self.get_dispatch_uid()
+        models, through_models = self.get_senders(model)
+        for sender in models:
+            post_save.connect(self.on_save_or_delete, sender=sender, weak=False, dispatch_uid=uid)
+            post_delete.connect(self.on_save_or_delete, sender=sender, weak=False, dispatch_uid=uid)
+        for sender in through_models:
+            m2m_changed.connect(self.on_m2m_changed, sender=sender, weak=False, dispatch_uid=uid)
+
+    def disconnect(self, model):
+        uid = self.get_dispatch_uid()
+        models, through_models = self.get_senders(model)
+        for sender in models:
+            post_save.disconnect(sender=sender, dispatch_uid=uid)
+            post_delete.disconnect(sender=sender, dispatch_uid=uid)
+        other_through_models = set()
+        for other_model in self.models:
+            if other_model is not model:
+                other_through_models.update(get_many_to_many_through_models(other_model))
+        for sender in through_models:
+            # through model could be shared with other registered model
+            if sender not in other_through_models:
+                m2m_changed.disconnect(sender=sender, dispatch_uid=uid)
+
+    def on_save_or_delete(self, sender, **kwargs):
+        self.bump_existing(sender)
+
+    def on_m2m_changed(self, sender, instance, action, model, **kwargs):
+        if action not in self.m2m_actions:
+            return
+        self.bump_existing(sender, instance.__class__, model)
+
+    def get_model_label(self, model):
+        model = get_concrete_model(model)
+        return u'{0}.{1}'.format(model._meta.app_label, get_model_name(model))
+
+    def get_key(self, model):
+        return u'{0}:{1}'.format(self.key_prefix, self.get_model_label(model))
+
+    def get_initial_version(self):
+        # versions, which are lost from the cache, should not be started from already used values
+        return int(time.time() * 1000000)
+
+    def get_version(self, model):
+        return self.get_versions([model])[model]
+
+    def get_versions(self, models):
+        """
+        Returns dict with versions of `models`.
+        """
+        cache = self.cache
+        keys = dict((self.get_key(model), model) for model in models)
+        values = cache.get_many(list(keys))
+        versions = {}
+        for key, model in keys.items():
+            version = values.get(key)
+            if version is None:
+                cache.add(key, self.get_initial_version(), None)
+                version = cache.get(key)
+            versions[model] = version
+        return versions
+
+    def bump(self, *models):
+        cache = self.cache
+        for model in models:
+            key = self.get_key(model)
+            try:
+                cache.incr(key)
+            except ValueError:
+                cache.set(key, self.get_initial_version(), None)
+
+    def bump_existing(self, *models):
+        """
+        Changes only versions, which are in the cache.
+        """
+        cache = self.cache
+        for model in models:
+            try:
+                cache.incr(self.get_key(model))
+            except ValueError:
+                pass
+
+
+model_versions = ModelVersionRegistry()
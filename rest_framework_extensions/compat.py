@@ -54,6 +54,119 @@ try:
 except ImportError:
     guardian = None
 
+# DEFAULT_TIMEOUT sentinel is new in Django 1.6, previously None meant default timeout
+try:
+    from django.core.cache.backends.base import DEFAULT_TIMEOUT
+except ImportError:
+    DEFAULT_TIMEOUT = None
+
+# transaction.atomic is new in Django 1.6
+try:
+    from django.db.transaction import atomic
+except ImportError:
+    from django.db.transaction import commit_on_success as atomic
+
+# conditional expressions are new in Django 1.8
+try:
+    from django.db.models import Case, When, Value
+except ImportError:
+    Case = When = Value = None
+
+# Signal._live_receivers() takes sender id instead of sender before Django 1.6
+if django.VERSION >= (1, 6):
+    def get_live_receivers(signal, sender):
+        if not signal.has_listeners(sender):
+            return []
+        return signal._live_receivers(sender)
+else:
+    from django.dispatch.dispatcher import _make_id
+
+    def get_live_receivers(signal, sender):
+        if not signal.has_listeners(sender):
+            return []
+        return signal._live_receivers(_make_id(sender))
+
+# app registry is new in Django 1.7
+try:
+    from django.apps import apps
+    get_models = apps.get_models
+except ImportError:
+    from django.db.models import get_models
+
+# Options.get_fields() replaces lists of related objects from Django 1.8
+if django.VERSION >= (1, 8):
+    from django.db.models.fields.related import ForeignObjectRel
+
+    def get_many_to_many_through_models(model):
+        through_models = []
+        for field in model._meta.get_fields(include_hidden=True):
+            if field.many_to_many:
+                if isinstance(field, ForeignObjectRel):
+                    rel = field
+                else:
+                    rel = getattr(field, 'remote_field', None) or field.rel
+                through_models.append(rel.through)
+        return through_models
+else:
+    def get_many_to_many_through_models(model):
+        opts = model._meta
+        return (
+            [field.rel.through for field in opts.many_to_many] +
+            [related.field.rel.through for related in opts.get_all_related_many_to_many_objects()]
+        )
+
+# QuerySet.delete() and QuerySet._raw_delete() return number of deleted rows from Django 1.9
+if django.VERSION >= (1, 9):
+    def delete_queryset(queryset):
+        return queryset.delete()[1].get(queryset.model._meta.label, 0)
+
+    def raw_delete_queryset(queryset):
+        return queryset._raw_delete(queryset.db)
+else:
+    from django.db.models.sql import DeleteQuery
+    from django.db.models.sql.constants import CURSOR
+
+    class CountingDeleteQuery(DeleteQuery):
+        deleted_count = 0
+
+        def get_compiler(self, using=None, connection=None):
+            compiler = super(CountingDeleteQuery, self).get_compiler(using, connection)
+            execute_sql = compiler.execute_sql
+
+            def counting_execute_sql(result_type):
+                cursor = execute_sql(CURSOR)
+                if cursor is not None:
+                    try:
+                        self.deleted_count += cursor.rowcount
+                    finally:
+                        cursor.close()
+
+            compiler.execute_sql = counting_execute_sql
+            return compiler
+
+    def delete_queryset(queryset):
+        with atomic(using=queryset.db):
+            deleted_count = queryset.count()
+            queryset.delete()
+        return deleted_count
+
+    def raw_delete_queryset(queryset):
+        query = CountingDeleteQuery(queryset.model)
+        query.delete_qs(queryset, queryset.db)
+        return query.deleted_count
+
+# xxhash is optional
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+# lzma is available only from python 3.3 onwards
+try:
+    import lzma
+except ImportError:
+    lzma = None
+
 
 # cStringIO only if it's available, otherwise StringIO
 try:
@@ -9,7 +9,7 @@ from rest_framework import status
 from rest_framework.permissions import SAFE_METHODS
 from rest_framework.response import Response
 
-from rest_framework_extensions.utils import prepare_header_name
+from rest_framework_extensions.utils import prepare_header_name, pass_key_to_next_decorator
 from rest_framework_extensions.settings import extensions_api_settings
 from rest_framework_extensions.compat import six
 
@@ -19,11 +19,15 @@ logger = logging.getLogger('django.request')
 
 class ETAGProcessor(object):
     """Based on https://github.com/django/django/blob/master/django/views/decorators/http.py"""
-    def __init__(self, etag_func=None, rebuild_after_method_evaluation=False):
+    def __init__(self, etag_func=None, rebuild_after_method_evaluation=False, content_hash=None):
         if not etag_func:
             etag_func = extensions_api_settings.DEFAULT_ETAG_FUNC
         self.etag_func = etag_func
         self.rebuild_after_method_evaluation = rebuild_after_method_evaluation
+        if content_hash is None:
+            self.content_hash = extensions_api_settings.DEFAULT_ETAG_CONTENT_HASH
+        else:
+            self.content_hash = content_hash
 
     def __call__(self, func):
         this = self
@@ -44,6 +48,16 @@ class ETAGProcessor(object):
                                     request,
                                     args,
                                     kwargs):
+        if self.content_hash and request.method in SAFE_METHODS:
+            # content of unsafe method response says nothing about the state of resource before it,
+            # so preconditions of unsafe methods are checked with `etag_func`
+            return self.process_content_hash_request(
+                view_instance=view_instance,
+                view_method=view_method,
+                request=request,
+                args=args,
+                kwargs=kwargs,
+            )
         etags, if_none_match, if_match = self.get_etags_and_matchers(request)
         res_etag = self.calculate_etag(
             view_instance=view_instance,
@@ -76,6 +90,65 @@ class ETAGProcessor(object):
 
         return response
 
+    def process_content_hash_request(self,
+                                     view_instance,
+                                     view_method,
+                                     request,
+                                     args,
+                                     kwargs):
+        """
+        ETag is calculated from the rendered response content, so the view
+        method is always evaluated and only the response body transfer is saved.
+        """
+        response = view_method(view_instance, request, *args, **kwargs)
+        response = view_instance.finalize_response(request, response, *args, **kwargs)
+        if not getattr(response, 'is_rendered', True):
+            response.render()
+        if response.has_header('ETag'):
+            res_etag = response['ETag']
+            if self.is_content_encoded(response) and not self.is_weak_etag(res_etag):
+                # etag calculated before content encoding (e.g. by @cache_response) is weak for encoded variant
+                res_etag = response['ETag'] = 'W/' + res_etag
+        else:
+            res_etag = self.calculate_content_etag(response)
+            if res_etag:
+                response['ETag'] = res_etag
+        if not res_etag:
+            return response
+
+        etags, if_none_match, if_match = self.get_etags_and_matchers(request)
+        try:
+            res_etag_value = parse_etags(res_etag)[0]
+        except (ValueError, IndexError):
+            return response
+        if self.is_if_none_match_failed(res_etag_value, etags, if_none_match):
+            # weak comparison, as for all If-None-Match requests
+            not_modified_response = Response(status=status.HTTP_304_NOT_MODIFIED)
+            not_modified_response['ETag'] = res_etag
+            return not_modified_response
+        elif self.is_if_match_failed(res_etag_value, etags, if_match):
+            return self._get_and_log_precondition_failed_response(request=request)
+        return response
+
+    def calculate_content_etag(self, response):
+        """
+        Returns quoted ETag for successful response or None. ETag of content
+        encoded (e.g. gzipped) response is weak, because the same
+        representation could be encoded in different bytes.
+        """
+        if not 200 <= response.status_code < 300:
+            return None
+        res_etag = quote_etag(extensions_api_settings.DEFAULT_ETAG_CONTENT_HASHER(response.content))
+        if self.is_content_encoded(response):
+            res_etag = 'W/' + res_etag
+        return res_etag
+
+    def is_content_encoded(self, response):
+        return response.get('Content-Encoding', 'identity') != 'identity'
+
+    def is_weak_etag(self, etag):
+        return etag.startswith('W/')
+
     def get_etags_and_matchers(self, request):
         etags = None
         if_none_match = request.META.get(prepare_header_name("if-none-match"))
@@ -104,13 +177,21 @@ class ETAGProcessor(object):
             etag_func = getattr(view_instance, self.etag_func)
         else:
             etag_func = self.etag_func
-        return etag_func(
+        etag = etag_func(
             view_instance=view_instance,
             view_method=view_method,
             request=request,
             args=args,
             kwargs=kwargs,
         )
+        pass_key_to_next_decorator(
+            request=request,
+            key=etag,
+            key_func=etag_func,
+            view_instance=view_instance,
+            view_method=view_method
+        )
+        return etag
 
     def is_if_none_match_failed(self, res_etag, etags, if_none_match):
         if res_etag and if_none_match:
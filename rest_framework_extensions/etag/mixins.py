@@ -1,6 +1,14 @@
 # -*- coding: utf-8 -*-
+from django.db.models import F
+from django.utils.http import parse_etags, quote_etag
+
+from rest_framework import status
+from rest_framework.response import Response
+
 from rest_framework_extensions.etag.decorators import etag
 from rest_framework_extensions.settings import extensions_api_settings
+from rest_framework_extensions.utils import prepare_header_name
+from rest_framework_extensions.compat import atomic, force_text
 
 
 class BaseETAGMixin(object):
@@ -42,4 +50,93 @@ class ETAGMixin(RetrieveETAGMixin,
                 UpdateETAGMixin,
                 DestroyETAGMixin,
                 ListETAGMixin):
-    pass
\ No newline at end of file
+    pass
+
+
+class VersionConflict(Exception):
+    pass
+
+
+class BaseVersionETAGMixin(object):
+    """
+    ETag is the value of integer version field of the object, which is
+    incremented on every update.
+    """
+    etag_version_field = extensions_api_settings.DEFAULT_ETAG_VERSION_FIELD_NAME
+
+    def get_version_etag(self, obj):
+        return quote_etag(force_text(getattr(obj, self.etag_version_field)))
+
+
+class VersionRetrieveETAGMixin(BaseVersionETAGMixin):
+    def retrieve(self, request, *args, **kwargs):
+        response = super(VersionRetrieveETAGMixin, self).retrieve(request, *args, **kwargs)
+        if response.status_code == status.HTTP_200_OK and not response.has_header('ETag'):
+            response['ETag'] = self.get_version_etag(self.object)
+        return response
+
+
+class AtomicUpdateETAGMixin(BaseVersionETAGMixin):
+    """
+    Version check is made by the UPDATE statement itself:
+
+        UPDATE ... SET version = version + 1 WHERE id = 1 AND version = 5
+
+    If no rows are updated, object was changed by concurrent request and
+    412 is returned. Object is saved in the same transaction, so concurrent
+    writers wait for the row and their version check fails.
+    """
+    read_version = None
+
+    def update(self, request, *args, **kwargs):
+        try:
+            with atomic():
+                response = super(AtomicUpdateETAGMixin, self).update(request, *args, **kwargs)
+        except VersionConflict:
+            return Response(status=status.HTTP_412_PRECONDITION_FAILED)
+        if response.status_code in (status.HTTP_200_OK, status.HTTP_201_CREATED):
+            response['ETag'] = self.get_version_etag(self.object)
+        return response
+
+    def get_object_or_none(self):
+        obj = super(AtomicUpdateETAGMixin, self).get_object_or_none()
+        if_match = self.request.META.get(prepare_header_name('if-match'))
+        if obj is None:
+            self.read_version = None
+            if if_match:
+                # there is no current representation to match
+                raise VersionConflict()
+        else:
+            # serializer changes the object in place, so read version is remembered before
+            self.read_version = getattr(obj, self.etag_version_field)
+            if if_match and not self.is_version_matched(self.read_version, if_match):
+                raise VersionConflict()
+        return obj
+
+    def is_version_matched(self, version, if_match):
+        try:
+            etags = parse_etags(if_match)
+        except ValueError:
+            return False
+        return '*' in etags or force_text(version) in etags
+
+    def pre_save(self, obj):
+        super(AtomicUpdateETAGMixin, self).pre_save(obj)
+        if self.read_version is not None:
+            self.increment_version(obj, self.read_version)
+        elif getattr(obj, self.etag_version_field) is None:
+            setattr(obj, self.etag_version_field, 1)
+
+    def increment_version(self, obj, version):
+        updated_count = obj.__class__._default_manager.filter(
+            pk=obj.pk,
+            **{self.etag_version_field: version}
+        ).update(**{self.etag_version_field: F(self.etag_version_field) + 1})
+        if not updated_count:
+            raise VersionConflict()
+        setattr(obj, self.etag_version_field, version + 1)
+
+
+class AtomicETAGMixin(VersionRetrieveETAGMixin,
+                      AtomicUpdateETAGMixin):
+    pass
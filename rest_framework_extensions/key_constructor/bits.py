@@ -1,6 +1,7 @@
 # -*- coding: utf-8 -*-
 from django.utils.encoding import force_text
 from django.utils.translation import get_language
+from django.db.models import Count, Max
 from django.db.models.query import EmptyQuerySet
 
 
@@ -18,7 +19,8 @@ class KeyBitBase(object):
 class KeyBitDictBase(KeyBitBase):
     """Base class for dict-like source data processing.
 
-    Look at HeadersKeyBit and QueryParamsKeyBit
+    Look at HeadersKeyBit and QueryParamsKeyBit. If params equals '*', all
+    values from source dict are used.
 
     """
 
@@ -32,6 +34,10 @@ class KeyBitDictBase(KeyBitBase):
             args=args,
             kwargs=kwargs
         )
+        if params == '*':
+            return dict(
+                (force_text(key), force_text(value)) for key, value in source_dict.items() if value is not None
+            )
         for key in params:
             value = source_dict.get(self.prepare_key_for_value_retrieving(key))
             if value is not None:
@@ -148,6 +154,17 @@ class QueryParamsKeyBit(KeyBitDictBase):
         return request.GET
 
 
+class KwargsKeyBit(KeyBitDictBase):
+    """
+    Return example:
+        {'pk': u'1', 'parent_lookup_country': u'2'}
+
+    """
+
+    def get_source_dict(self, params, view_instance, view_method, request, args, kwargs):
+        return kwargs
+
+
 class PaginationKeyBit(QueryParamsKeyBit):
     """
     Return example:
@@ -184,4 +201,58 @@ class RetrieveSqlQueryKeyBit(KeyBitBase):
             else:
                 return force_text(queryset.query.__str__())
         except ValueError:
-            return None
\ No newline at end of file
+            return None
+
+
+class QuerySetAggregateKeyBit(KeyBitBase):
+    """
+    Return example for `params=['updated_at']`:
+        {'count': u'10', 'max_updated_at': u'2014-12-01 10:30:00'}
+
+    Count and max values of params fields are calculated for
+    `view.filter_queryset(view.get_queryset())` with single aggregate query,
+    so data changes are reflected in the key without fetching the rows.
+    """
+
+    def get_data(self, params, view_instance, view_method, request, args, kwargs):
+        queryset = view_instance.filter_queryset(view_instance.get_queryset())
+        if isinstance(queryset, EmptyQuerySet):
+            return None
+        aggregates = {'count': Count('pk')}
+        for field in params or []:
+            aggregates['max_{0}'.format(field)] = Max(field)
+        return dict(
+            (key, force_text(value)) for key, value in queryset.order_by().aggregate(**aggregates).items()
+        )
+
+
+class ModelVersionKeyBit(KeyBitBase):
+    """
+    Return example:
+        {u'tests_app.city': u'1418826540123456', u'tests_app.country': u'1418826540123999'}
+
+    Params are models, which data is used by the view. By default model of the view's queryset is used.
+    Models, which are not registered in `rest_framework_extensions.cache.invalidation.model_versions`
+    yet, are registered on the first key calculation.
+    """
+
+    def get_data(self, params, view_instance, view_method, request, args, kwargs):
+        from rest_framework_extensions.cache.invalidation import model_versions
+
+        models = params or [self.get_view_model(view_instance)]
+        not_registered_models = [model for model in models if not model_versions.is_registered(model)]
+        if not_registered_models:
+            model_versions.register(*not_registered_models)
+        return dict(
+            (model_versions.get_model_label(model), force_text(version))
+            for model, version in model_versions.get_versions(models).items()
+        )
+
+    def get_view_model(self, view_instance):
+        queryset = getattr(view_instance, 'queryset', None)
+        if queryset is not None:
+            return queryset.model
+        model = getattr(view_instance, 'model', None)
+        if model is not None:
+            return model
+        return view_instance.get_queryset().model
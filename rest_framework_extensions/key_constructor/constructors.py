@@ -1,35 +1,72 @@
 # -*- coding: utf-8 -*-
-import hashlib
-import json
-
+from rest_framework_extensions.compat import six
 from rest_framework_extensions.key_constructor import bits
 from rest_framework_extensions.settings import extensions_api_settings
 
 
-class KeyConstructor(object):
-    def __init__(self, memoize_for_request=None, params=None):
+class KeyConstructorMetaclass(type):
+    """
+    Collects bits of the class once at the class creation, so constructors
+    instantiation doesn't need to inspect class attributes.
+    """
+
+    def __new__(mcs, name, bases, attrs):
+        new_class = super(KeyConstructorMetaclass, mcs).__new__(mcs, name, bases, attrs)
+        _bits = {}
+        for attr in dir(new_class):
+            attr_value = getattr(new_class, attr)
+            if isinstance(attr_value, bits.KeyBitBase):
+                _bits[attr] = attr_value
+        new_class._declared_bits = _bits
+        return new_class
+
+
+class KeyConstructor(six.with_metaclass(KeyConstructorMetaclass, object)):
+    def __init__(self, memoize_for_request=None, params=None, encoder=None, hasher=None):
         if memoize_for_request is None:
             self.memoize_for_request = extensions_api_settings.DEFAULT_KEY_CONSTRUCTOR_MEMOIZE_FOR_REQUEST
         else:
             self.memoize_for_request = memoize_for_request
+        if encoder is None:
+            self.encoder = extensions_api_settings.DEFAULT_KEY_CONSTRUCTOR_ENCODER
+        else:
+            self.encoder = encoder
+        if hasher is None:
+            self.hasher = extensions_api_settings.DEFAULT_KEY_CONSTRUCTOR_HASHER
+        else:
+            self.hasher = hasher
         if params is None:
             self.params = {}
         else:
             self.params = params
         self.bits = self.get_bits()
+        self._plan = None
 
     def get_bits(self):
-        _bits = {}
-        for attr in dir(self.__class__):
-            attr_value = getattr(self.__class__, attr)
-            if isinstance(attr_value, bits.KeyBitBase):
-                _bits[attr] = attr_value
-        return _bits
+        return dict(self._declared_bits)
+
+    def get_plan(self):
+        """
+        Returns list of `(bit_name, bit_instance, params)` tuples, which is
+        compiled on the first call. So `bits` and `params` could be changed
+        in `__init__` of the subclass, but not after first key calculation.
+        """
+        if self._plan is None:
+            plan = []
+            for bit_name, bit_instance in sorted(self.bits.items()):
+                if bit_name in self.params:
+                    params = self.params[bit_name]
+                else:
+                    params = getattr(bit_instance, 'params', None)
+                plan.append((bit_name, bit_instance, params))
+            self._plan = plan
+        return self._plan
 
     def __call__(self, **kwargs):
         return self.get_key(**kwargs)
 
     def get_key(self, view_instance, view_method, request, args, kwargs):
+        memoization_key = None
         if self.memoize_for_request:
             memoization_key = self._get_memoization_key(
                 view_instance=view_instance,
@@ -37,30 +74,38 @@ class KeyConstructor(object):
                 args=args,
                 kwargs=kwargs
             )
-            if not hasattr(request, '_key_constructor_cache'):
-                request._key_constructor_cache = {}
-        if self.memoize_for_request and memoization_key in request._key_constructor_cache:
-            return request._key_constructor_cache.get(memoization_key)
-        else:
-            value = self._get_key(
-                view_instance=view_instance,
-                view_method=view_method,
-                request=request,
-                args=args,
-                kwargs=kwargs
-            )
-            if self.memoize_for_request:
-                request._key_constructor_cache[memoization_key] = value
-            return value
+        if memoization_key is not None:
+            # dict is shared by all key constructors used for the request
+            memo = vars(request).setdefault('_key_constructor_cache', {})
+            if memoization_key in memo:
+                return memo[memoization_key]
+        value = self._get_key(
+            view_instance=view_instance,
+            view_method=view_method,
+            request=request,
+            args=args,
+            kwargs=kwargs
+        )
+        if memoization_key is not None:
+            memo[memoization_key] = value
+        return value
 
     def _get_memoization_key(self, view_instance, view_method, args, kwargs):
-        from rest_framework_extensions.utils import get_unique_method_id
-        return json.dumps({
-            'unique_method_id': get_unique_method_id(view_instance=view_instance, view_method=view_method),
-            'args': args,
-            'kwargs': kwargs,
-            'instance_id': id(self)
-        })
+        """
+        Returns hashable tuple or `None` if arguments are not hashable.
+        """
+        memoization_key = (
+            id(self),
+            view_instance.__class__,
+            view_method.__name__,
+            tuple(args or ()),
+            frozenset(kwargs.items()) if kwargs else frozenset(),
+        )
+        try:
+            hash(memoization_key)
+        except TypeError:
+            return None
+        return memoization_key
 
     def _get_key(self, view_instance, view_method, request, args, kwargs):
         _kwargs = {
@@ -75,18 +120,11 @@ class KeyConstructor(object):
         )
 
     def prepare_key(self, key_dict):
-        return hashlib.sha256(json.dumps(key_dict, sort_keys=True).encode('utf-8')).hexdigest()
+        return self.hasher(self.encoder(key_dict))
 
     def get_data_from_bits(self, **kwargs):
-        result_dict = {}    
-        for bit_name, bit_instance in self.bits.items():
-            if bit_name in self.params:
-                params = self.params[bit_name]
-            else:
-                try:
-                    params = bit_instance.params
-                except AttributeError:
-                    params = None
+        result_dict = {}
+        for bit_name, bit_instance, params in self.get_plan():
             result_dict[bit_name] = bit_instance.get_data(params=params, **kwargs)
         return result_dict
 
@@ -103,4 +141,15 @@ class DefaultObjectKeyConstructor(DefaultKeyConstructor):
 
 class DefaultListKeyConstructor(DefaultKeyConstructor):
     list_sql_query = bits.ListSqlQueryKeyBit()
-    pagination = bits.PaginationKeyBit()
\ No newline at end of file
+    pagination = bits.PaginationKeyBit()
+
+
+class ModelVersionObjectKeyConstructor(DefaultKeyConstructor):
+    url_kwargs = bits.KwargsKeyBit('*')
+    model_version = bits.ModelVersionKeyBit()
+
+
+class ModelVersionListKeyConstructor(DefaultKeyConstructor):
+    url_kwargs = bits.KwargsKeyBit('*')
+    query_params = bits.QueryParamsKeyBit('*')
+    model_version = bits.ModelVersionKeyBit()
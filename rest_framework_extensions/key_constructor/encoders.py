@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+"""
+Encoders turn data from key bits into bytes, hashers turn these bytes into
+the key. Both are selected with `DEFAULT_KEY_CONSTRUCTOR_ENCODER` and
+`DEFAULT_KEY_CONSTRUCTOR_HASHER` settings.
+"""
+import hashlib
+import json
+
+from django.core.exceptions import ImproperlyConfigured
+
+from rest_framework_extensions.compat import six, xxhash
+
+
+def json_encoder(key_dict):
+    return json.dumps(key_dict, sort_keys=True).encode('utf-8')
+
+
+def _compact_encode(value):
+    if isinstance(value, six.binary_type):
+        value = value.decode('utf-8')
+    if isinstance(value, six.text_type):
+        # length prefix makes encoding unambiguous without escaping
+        return u'%d:%s' % (len(value), value)
+    elif isinstance(value, dict):
+        return u'{%s}' % u''.join([
+            _compact_encode(key) + _compact_encode(value[key])
+            for key in sorted(value)
+        ])
+    elif isinstance(value, (list, tuple)):
+        return u'[%s]' % u''.join([_compact_encode(item) for item in value])
+    elif value is None:
+        return u'n'
+    else:
+        return u'r%r;' % (value,)
+
+
+def compact_encoder(key_dict):
+    """
+    Canonical encoding of dicts, lists, strings and numbers, which is
+    cheaper than `json.dumps(sort_keys=True)` on python 2, where sorting
+    of keys turns off C accelerated JSON encoder.
+    """
+    return _compact_encode(key_dict).encode('utf-8')
+
+
+def sha256_hasher(value):
+    return hashlib.sha256(value).hexdigest()
+
+
+def md5_hasher(value):
+    return hashlib.md5(value).hexdigest()
+
+
+def blake2b_hasher(value):
+    if not hasattr(hashlib, 'blake2b'):
+        raise ImproperlyConfigured('blake2b hasher requires python 3.6 or later')
+    return hashlib.blake2b(value, digest_size=16).hexdigest()
+
+
+def xxh64_hasher(value):
+    """
+    Non-cryptographic hash. Use it only if keys can't be chosen by attacker.
+    """
+    if xxhash is None:
+        raise ImproperlyConfigured('xxh64 hasher requires "xxhash" package')
+    return xxhash.xxh64(value).hexdigest()
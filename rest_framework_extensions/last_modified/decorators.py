@@ -0,0 +1,151 @@
+# -*- coding: utf-8 -*-
+import calendar
+import datetime
+import logging
+from functools import wraps
+
+from django.utils import timezone
+from django.utils.decorators import available_attrs
+from django.utils.http import http_date, parse_http_date_safe
+
+from rest_framework import status
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.response import Response
+
+from rest_framework_extensions.utils import prepare_header_name
+from rest_framework_extensions.settings import extensions_api_settings
+from rest_framework_extensions.compat import six
+
+
+logger = logging.getLogger('django.request')
+
+
+class LastModifiedProcessor(object):
+    """Based on https://github.com/django/django/blob/master/django/views/decorators/http.py"""
+    def __init__(self, last_modified_func=None, rebuild_after_method_evaluation=False):
+        if not last_modified_func:
+            last_modified_func = extensions_api_settings.DEFAULT_LAST_MODIFIED_FUNC
+        self.last_modified_func = last_modified_func
+        self.rebuild_after_method_evaluation = rebuild_after_method_evaluation
+
+    def __call__(self, func):
+        this = self
+        @wraps(func, assigned=available_attrs(func))
+        def inner(self, request, *args, **kwargs):
+            return this.process_conditional_request(
+                view_instance=self,
+                view_method=func,
+                request=request,
+                args=args,
+                kwargs=kwargs,
+            )
+        return inner
+
+    def process_conditional_request(self,
+                                    view_instance,
+                                    view_method,
+                                    request,
+                                    args,
+                                    kwargs):
+        if_modified_since, if_unmodified_since = self.get_matchers(request)
+        res_last_modified = self.calculate_last_modified(
+            view_instance=view_instance,
+            view_method=view_method,
+            request=request,
+            args=args,
+            kwargs=kwargs,
+        )
+
+        if self.is_if_unmodified_since_failed(res_last_modified, if_unmodified_since):
+            response = self._get_and_log_precondition_failed_response(request=request)
+        elif (request.method in SAFE_METHODS and
+              self.is_if_modified_since_failed(res_last_modified, if_modified_since)):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            response = view_method(view_instance, request, *args, **kwargs)
+            if self.rebuild_after_method_evaluation:
+                res_last_modified = self.calculate_last_modified(
+                    view_instance=view_instance,
+                    view_method=view_method,
+                    request=request,
+                    args=args,
+                    kwargs=kwargs,
+                )
+
+        if res_last_modified is not None and not response.has_header('Last-Modified'):
+            response['Last-Modified'] = http_date(res_last_modified)
+
+        return response
+
+    def get_matchers(self, request):
+        """
+        Returns timestamps from `If-Modified-Since` and `If-Unmodified-Since`
+        headers. Like RFC 7232 says, they are ignored if `If-None-Match` and
+        `If-Match` headers are present respectively, and invalid dates are ignored too.
+        """
+        if_modified_since = None
+        if_unmodified_since = None
+        if not request.META.get(prepare_header_name('if-none-match')):
+            if_modified_since = parse_http_date_safe(
+                request.META.get(prepare_header_name('if-modified-since'))
+            )
+        if not request.META.get(prepare_header_name('if-match')):
+            if_unmodified_since = parse_http_date_safe(
+                request.META.get(prepare_header_name('if-unmodified-since'))
+            )
+        return if_modified_since, if_unmodified_since
+
+    def calculate_last_modified(self,
+                                view_instance,
+                                view_method,
+                                request,
+                                args,
+                                kwargs):
+        """
+        Returns timestamp in seconds or `None`. Last modified function can
+        return datetime or timestamp.
+        """
+        if isinstance(self.last_modified_func, six.string_types):
+            last_modified_func = getattr(view_instance, self.last_modified_func)
+        else:
+            last_modified_func = self.last_modified_func
+        last_modified = last_modified_func(
+            view_instance=view_instance,
+            view_method=view_method,
+            request=request,
+            args=args,
+            kwargs=kwargs,
+        )
+        if last_modified is None:
+            return None
+        elif isinstance(last_modified, datetime.datetime):
+            if timezone.is_naive(last_modified):
+                last_modified = timezone.make_aware(last_modified, timezone.get_default_timezone())
+            return calendar.timegm(last_modified.utctimetuple())
+        else:
+            # HTTP dates have one second resolution
+            return int(last_modified)
+
+    def is_if_modified_since_failed(self, res_last_modified, if_modified_since):
+        if res_last_modified is not None and if_modified_since is not None:
+            return res_last_modified <= if_modified_since
+        else:
+            return False
+
+    def is_if_unmodified_since_failed(self, res_last_modified, if_unmodified_since):
+        if res_last_modified is not None and if_unmodified_since is not None:
+            return res_last_modified > if_unmodified_since
+        else:
+            return False
+
+    def _get_and_log_precondition_failed_response(self, request):
+        logger.warning('Precondition Failed: %s', request.path,
+            extra={
+                'status_code': status.HTTP_200_OK,
+                'request': request
+            }
+        )
+        return Response(status=status.HTTP_412_PRECONDITION_FAILED)
+
+
+last_modified = LastModifiedProcessor
@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+from django.db.models import Max
+
+from rest_framework_extensions.settings import extensions_api_settings
+
+
+class QuerySetLastModifiedFunction(object):
+    """
+    Returns max value of `field_name` in the view's filtered queryset. Only
+    one aggregate query is made, instances are neither loaded nor serialized.
+    """
+    def __init__(self, field_name=None):
+        self.field_name = field_name
+
+    def __call__(self, view_instance, view_method, request, args, kwargs):
+        queryset = self.get_queryset(view_instance=view_instance, kwargs=kwargs)
+        field_name = self.get_field_name()
+        return queryset.order_by().aggregate(last_modified=Max(field_name))['last_modified']
+
+    def get_field_name(self):
+        if self.field_name is None:
+            return extensions_api_settings.DEFAULT_LAST_MODIFIED_FIELD_NAME
+        else:
+            return self.field_name
+
+    def get_queryset(self, view_instance, kwargs):
+        return view_instance.filter_queryset(view_instance.get_queryset())
+
+
+class ListLastModifiedFunction(QuerySetLastModifiedFunction):
+    pass
+
+
+class ObjectLastModifiedFunction(QuerySetLastModifiedFunction):
+    """
+    Filters the view's queryset by lookup field, like `get_object` does,
+    and returns `None` if object doesn't exist.
+    """
+    def get_queryset(self, view_instance, kwargs):
+        queryset = super(ObjectLastModifiedFunction, self).get_queryset(
+            view_instance=view_instance,
+            kwargs=kwargs
+        )
+        lookup_url_kwarg = getattr(view_instance, 'lookup_url_kwarg', None) or view_instance.lookup_field
+        return queryset.filter(**{view_instance.lookup_field: kwargs[lookup_url_kwarg]})
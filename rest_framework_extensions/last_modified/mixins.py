@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+from rest_framework_extensions.last_modified.decorators import last_modified
+from rest_framework_extensions.settings import extensions_api_settings
+
+
+class BaseLastModifiedMixin(object):
+    object_last_modified_func = extensions_api_settings.DEFAULT_OBJECT_LAST_MODIFIED_FUNC
+    list_last_modified_func = extensions_api_settings.DEFAULT_LIST_LAST_MODIFIED_FUNC
+
+
+class ListLastModifiedMixin(BaseLastModifiedMixin):
+    @last_modified(last_modified_func='list_last_modified_func')
+    def list(self, request, *args, **kwargs):
+        return super(ListLastModifiedMixin, self).list(request, *args, **kwargs)
+
+
+class RetrieveLastModifiedMixin(BaseLastModifiedMixin):
+    @last_modified(last_modified_func='object_last_modified_func')
+    def retrieve(self, request, *args, **kwargs):
+        return super(RetrieveLastModifiedMixin, self).retrieve(request, *args, **kwargs)
+
+
+class UpdateLastModifiedMixin(BaseLastModifiedMixin):
+    @last_modified(last_modified_func='object_last_modified_func', rebuild_after_method_evaluation=True)
+    def update(self, request, *args, **kwargs):
+        return super(UpdateLastModifiedMixin, self).update(request, *args, **kwargs)
+
+
+class DestroyLastModifiedMixin(BaseLastModifiedMixin):
+    @last_modified(last_modified_func='object_last_modified_func')
+    def destroy(self, request, *args, **kwargs):
+        return super(DestroyLastModifiedMixin, self).destroy(request, *args, **kwargs)
+
+
+class ReadOnlyLastModifiedMixin(RetrieveLastModifiedMixin,
+                                ListLastModifiedMixin):
+    pass
+
+
+class LastModifiedMixin(RetrieveLastModifiedMixin,
+                        UpdateLastModifiedMixin,
+                        DestroyLastModifiedMixin,
+                        ListLastModifiedMixin):
+    pass
@@ -13,15 +13,55 @@ DEFAULTS = {
     'DEFAULT_CACHE_KEY_FUNC': 'rest_framework_extensions.utils.default_cache_key_func',
     'DEFAULT_OBJECT_CACHE_KEY_FUNC': 'rest_framework_extensions.utils.default_object_cache_key_func',
     'DEFAULT_LIST_CACHE_KEY_FUNC': 'rest_framework_extensions.utils.default_list_cache_key_func',
+    'DEFAULT_CACHE_SINGLE_FLIGHT': False,
+    'DEFAULT_CACHE_LOCK_TIMEOUT': 10,
+    'DEFAULT_CACHE_LOCK_WAIT_TIMEOUT': 5,
+    'DEFAULT_CACHE_LOCK_POLL_INTERVAL': 0.05,
+    'DEFAULT_CACHE_STALE_TTL': None,
+    'DEFAULT_CACHE_XFETCH_BETA': None,
+    'DEFAULT_CACHE_COMPACT_RESPONSE': False,
+    'DEFAULT_CACHE_RESPONSE_HEADERS': (
+        'Content-Type',
+        'Content-Language',
+        'Content-Disposition',
+        'Allow',
+        'Vary',
+        'Link',
+        'Location',
+        'ETag',
+        'Last-Modified',
+    ),
+    'DEFAULT_CACHE_COMPRESSION': None,
+    'DEFAULT_CACHE_COMPRESSION_MIN_SIZE': 1024,
+    'DEFAULT_CACHE_ETAG': False,
 
     # ETAG
     'DEFAULT_ETAG_FUNC': 'rest_framework_extensions.utils.default_etag_func',
     'DEFAULT_OBJECT_ETAG_FUNC': 'rest_framework_extensions.utils.default_object_etag_func',
     'DEFAULT_LIST_ETAG_FUNC': 'rest_framework_extensions.utils.default_list_etag_func',
+    'DEFAULT_ETAG_CONTENT_HASH': False,
+    'DEFAULT_ETAG_CONTENT_HASHER': 'rest_framework_extensions.key_constructor.encoders.md5_hasher',
+    'DEFAULT_ETAG_VERSION_FIELD_NAME': 'version',
+
+    # Last-Modified
+    'DEFAULT_LAST_MODIFIED_FUNC': 'rest_framework_extensions.utils.default_last_modified_func',
+    'DEFAULT_OBJECT_LAST_MODIFIED_FUNC': 'rest_framework_extensions.utils.default_object_last_modified_func',
+    'DEFAULT_LIST_LAST_MODIFIED_FUNC': 'rest_framework_extensions.utils.default_list_last_modified_func',
+    'DEFAULT_LAST_MODIFIED_FIELD_NAME': 'updated_at',
 
     # other
     'DEFAULT_KEY_CONSTRUCTOR_MEMOIZE_FOR_REQUEST': False,
+    'DEFAULT_KEY_CONSTRUCTOR_ENCODER': 'rest_framework_extensions.key_constructor.encoders.json_encoder',
+    'DEFAULT_KEY_CONSTRUCTOR_HASHER': 'rest_framework_extensions.key_constructor.encoders.sha256_hasher',
     'DEFAULT_BULK_OPERATION_HEADER_NAME': 'X-BULK-OPERATION',
+    'DEFAULT_BULK_OPERATION_DRY_RUN_HEADER_NAME': 'X-BULK-OPERATION-DRY-RUN',
+    'DEFAULT_BULK_OPERATION_MAX_ROWS': None,
+    'DEFAULT_BULK_CREATE_BATCH_SIZE': 500,
+    'DEFAULT_BULK_UPDATE_BATCH_SIZE': 500,
+    'DEFAULT_BULK_DESTROY_BATCH_SIZE': None,
+    'DEFAULT_BULK_OPERATION_ASYNC': False,
+    'DEFAULT_BULK_OPERATION_EXECUTOR': 'rest_framework_extensions.bulk_operations.jobs.thread_executor',
+    'DEFAULT_BULK_OPERATION_JOB_TIMEOUT': 60 * 60 * 24,
     'DEFAULT_PARENT_LOOKUP_KWARG_NAME_PREFIX': 'parent_lookup_'
 }
 
@@ -32,6 +72,13 @@ IMPORT_STRINGS = [
     'DEFAULT_ETAG_FUNC',
     'DEFAULT_OBJECT_ETAG_FUNC',
     'DEFAULT_LIST_ETAG_FUNC',
+    'DEFAULT_ETAG_CONTENT_HASHER',
+    'DEFAULT_LAST_MODIFIED_FUNC',
+    'DEFAULT_OBJECT_LAST_MODIFIED_FUNC',
+    'DEFAULT_LIST_LAST_MODIFIED_FUNC',
+    'DEFAULT_KEY_CONSTRUCTOR_ENCODER',
+    'DEFAULT_KEY_CONSTRUCTOR_HASHER',
+    'DEFAULT_BULK_OPERATION_EXECUTOR',
 ]
 
 
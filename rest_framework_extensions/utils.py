@@ -1,8 +1,10 @@
 # -*- coding: utf-8 -*-
 import itertools
+import json
 from functools import wraps
 
 from django import VERSION as django_version
+from django.db import connections
 from django.utils.decorators import available_attrs
 
 import rest_framework
@@ -12,7 +14,13 @@ from rest_framework_extensions.key_constructor.constructors import (
     DefaultObjectKeyConstructor,
     DefaultListKeyConstructor,
 )
+from rest_framework_extensions.last_modified.functions import (
+    QuerySetLastModifiedFunction,
+    ObjectLastModifiedFunction,
+    ListLastModifiedFunction,
+)
 from rest_framework_extensions.settings import extensions_api_settings
+from rest_framework_extensions.compat import six
 
 
 def get_rest_framework_features():
@@ -64,6 +72,31 @@ def get_unique_method_id(view_instance, view_method):
     ])
 
 
+def _get_passed_key_id(key_func, view_instance, view_method):
+    return id(view_instance), view_method.__name__, key_func
+
+
+def pass_key_to_next_decorator(request, key, key_func, view_instance, view_method):
+    """
+    Stores key, calculated by decorator (e.g. `@etag`), so the next decorator
+    of the same view method (e.g. `@cache_response`) with the same key
+    function doesn't calculate it again.
+    """
+    passed_keys = vars(request).setdefault('_passed_keys', {})
+    passed_keys[_get_passed_key_id(key_func, view_instance, view_method)] = key
+
+
+def pop_key_from_previous_decorator(request, key_func, view_instance, view_method):
+    """
+    Returns key stored with `pass_key_to_next_decorator` or `None`. Key is
+    removed, so it's used only once.
+    """
+    passed_keys = vars(request).get('_passed_keys')
+    if not passed_keys:
+        return None
+    return passed_keys.pop(_get_passed_key_id(key_func, view_instance, view_method), None)
+
+
 def get_model_opts_concrete_fields(opts):
     # todo: test me
     if not hasattr(opts, 'concrete_fields'):
@@ -87,10 +120,34 @@ def get_cache(alias):
         return _get_cache(alias)
 
 
+def estimate_queryset_count(queryset):
+    """
+    Returns number of rows estimated by PostgreSQL query planner without
+    executing the query, or None for other databases.
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql':
+        return None
+    sql, params = queryset.values('pk').query.sql_with_params()
+    cursor = connection.cursor()
+    try:
+        cursor.execute('EXPLAIN (FORMAT JSON) ' + sql, params)
+        plan = cursor.fetchone()[0]
+    finally:
+        cursor.close()
+    if isinstance(plan, six.string_types):
+        plan = json.loads(plan)
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
 default_cache_key_func = DefaultKeyConstructor()
 default_object_cache_key_func = DefaultObjectKeyConstructor()
 default_list_cache_key_func = DefaultListKeyConstructor()
 
 default_etag_func = default_cache_key_func
 default_object_etag_func = default_object_cache_key_func
-default_list_etag_func = default_list_cache_key_func
\ No newline at end of file
+default_list_etag_func = default_list_cache_key_func
+
+default_last_modified_func = QuerySetLastModifiedFunction()
+default_object_last_modified_func = ObjectLastModifiedFunction()
+default_list_last_modified_func = ListLastModifiedFunction()
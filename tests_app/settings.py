@@ -35,6 +35,10 @@ CACHES = {
     'another_special_cache': {
         'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
     },
+    'two_tier_cache': {
+        'BACKEND': 'rest_framework_extensions.cache.backends.TwoTierCache',
+        'LOCATION': 'special_cache',
+    },
 }
 
 # Local time zone for this installation. Choices can be found here:
@@ -0,0 +1,9 @@
+# -*- coding: utf-8 -*-
+from django.db import models
+
+
+class CacheInvalidationCityModel(models.Model):
+    name = models.CharField(max_length=100)
+
+    class Meta:
+        app_label = 'tests_app'
@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+import json
+
+from django.test import TestCase
+from django.utils.encoding import force_text
+
+from rest_framework_extensions.cache.invalidation import model_versions
+from rest_framework_extensions.utils import get_cache
+
+from .models import CacheInvalidationCityModel
+
+
+class ModelVersionInvalidationTestBehavior(TestCase):
+    urls = 'tests_app.tests.functional.cache.invalidation.urls'
+
+    def setUp(self):
+        super(ModelVersionInvalidationTestBehavior, self).setUp()
+        get_cache('default').clear()
+        self.city = CacheInvalidationCityModel.objects.create(name='Moscow')
+
+    def get_names(self, response):
+        return [item['name'] for item in json.loads(force_text(response.content))]
+
+    def test_cached_list_should_be_invalidated_on_save(self):
+        self.assertEqual(self.get_names(self.client.get('/cities/')), ['Moscow'])
+        CacheInvalidationCityModel.objects.create(name='London')
+        self.assertEqual(self.get_names(self.client.get('/cities/')), ['Moscow', 'London'])
+
+    def test_cached_object_should_be_invalidated_on_save(self):
+        self.assertEqual(json.loads(force_text(self.client.get('/cities/1/').content))['name'], 'Moscow')
+        self.city.name = 'Saint Petersburg'
+        self.city.save()
+        self.assertEqual(json.loads(force_text(self.client.get('/cities/1/').content))['name'], 'Saint Petersburg')
+
+    def test_cached_list_should_be_invalidated_on_delete(self):
+        self.assertEqual(self.get_names(self.client.get('/cities/')), ['Moscow'])
+        self.city.delete()
+        self.assertEqual(self.get_names(self.client.get('/cities/')), [])
+
+    def test_should_serve_cached_response_while_data_is_not_changed(self):
+        self.client.get('/cities/')
+        CacheInvalidationCityModel.objects.filter(pk=self.city.pk).update(name='London')
+        self.assertEqual(self.get_names(self.client.get('/cities/')), ['Moscow'])
+        model_versions.bump(CacheInvalidationCityModel)
+        self.assertEqual(self.get_names(self.client.get('/cities/')), ['London'])
+
+
+class ModelVersionETAGTestBehavior(TestCase):
+    urls = 'tests_app.tests.functional.cache.invalidation.urls'
+
+    def setUp(self):
+        super(ModelVersionETAGTestBehavior, self).setUp()
+        get_cache('default').clear()
+        self.city = CacheInvalidationCityModel.objects.create(name='Moscow')
+
+    def test_should_return_304_for_list_without_sql_queries(self):
+        etag = self.client.get('/etag-cities/')['ETag']
+        with self.assertNumQueries(0):
+            response = self.client.get('/etag-cities/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_should_return_304_for_object_without_sql_queries(self):
+        etag = self.client.get('/etag-cities/1/')['ETag']
+        with self.assertNumQueries(0):
+            response = self.client.get('/etag-cities/1/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_etag_should_differ_for_different_filters_and_objects(self):
+        CacheInvalidationCityModel.objects.create(name='London')
+        self.assertNotEqual(
+            self.client.get('/etag-cities/')['ETag'],
+            self.client.get('/etag-cities/?name=London')['ETag']
+        )
+        self.assertNotEqual(
+            self.client.get('/etag-cities/1/')['ETag'],
+            self.client.get('/etag-cities/2/')['ETag']
+        )
+
+    def test_etag_should_be_changed_on_save(self):
+        etag = self.client.get('/etag-cities/')['ETag']
+        CacheInvalidationCityModel.objects.create(name='London')
+        response = self.client.get('/etag-cities/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.get_names(response), ['Moscow', 'London'])
+
+    def test_etag_should_be_changed_on_bulk_update(self):
+        etag = self.client.get('/etag-cities/')['ETag']
+        response = self.client.patch(
+            '/etag-cities/',
+            data=json.dumps({'name': 'London'}),
+            content_type='application/json',
+            HTTP_X_BULK_OPERATION='true'
+        )
+        self.assertEqual(response.status_code, 200)
+        response = self.client.get('/etag-cities/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.get_names(response), ['London'])
+
+    def get_names(self, response):
+        return [item['name'] for item in json.loads(force_text(response.content))]
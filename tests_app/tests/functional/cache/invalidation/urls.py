@@ -0,0 +1,10 @@
+# -*- coding: utf-8 -*-
+from rest_framework import routers
+
+from .views import CityViewSet, CityETAGViewSet
+
+
+viewset_router = routers.DefaultRouter()
+viewset_router.register('cities', CityViewSet)
+viewset_router.register('etag-cities', CityETAGViewSet)
+urlpatterns = viewset_router.urls
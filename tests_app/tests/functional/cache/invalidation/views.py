@@ -0,0 +1,35 @@
+# -*- coding: utf-8 -*-
+from rest_framework import viewsets
+
+from rest_framework_extensions.cache.mixins import CacheResponseMixin
+from rest_framework_extensions.etag.mixins import ReadOnlyETAGMixin
+from rest_framework_extensions.bulk_operations.mixins import ListUpdateModelMixin
+from rest_framework_extensions.key_constructor import bits
+from rest_framework_extensions.key_constructor.constructors import (
+    DefaultListKeyConstructor,
+    DefaultObjectKeyConstructor,
+    ModelVersionListKeyConstructor,
+    ModelVersionObjectKeyConstructor,
+)
+
+from .models import CacheInvalidationCityModel
+
+
+class ListKeyConstructor(DefaultListKeyConstructor):
+    model_version = bits.ModelVersionKeyBit()
+
+
+class ObjectKeyConstructor(DefaultObjectKeyConstructor):
+    model_version = bits.ModelVersionKeyBit()
+
+
+class CityViewSet(CacheResponseMixin, viewsets.ReadOnlyModelViewSet):
+    model = CacheInvalidationCityModel
+    list_cache_key_func = ListKeyConstructor()
+    object_cache_key_func = ObjectKeyConstructor()
+
+
+class CityETAGViewSet(ListUpdateModelMixin, ReadOnlyETAGMixin, viewsets.ModelViewSet):
+    model = CacheInvalidationCityModel
+    list_etag_func = ModelVersionListKeyConstructor()
+    object_etag_func = ModelVersionObjectKeyConstructor()
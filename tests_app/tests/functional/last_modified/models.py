@@ -0,0 +1,10 @@
+# -*- coding: utf-8 -*-
+from django.db import models
+
+
+class LastModifiedCityModel(models.Model):
+    name = models.CharField(max_length=100)
+    updated_at = models.DateTimeField()
+
+    class Meta:
+        app_label = 'tests_app'
@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+import datetime
+import json
+
+from django.test import TestCase
+from django.utils.http import http_date
+
+from rest_framework import status
+
+from .models import LastModifiedCityModel
+
+
+class LastModifiedMixinTestBehavior(TestCase):
+    urls = 'tests_app.tests.functional.last_modified.urls'
+
+    def setUp(self):
+        self.moscow = LastModifiedCityModel.objects.create(
+            name='Moscow',
+            updated_at=datetime.datetime(2014, 5, 13, 10, 0, 0)
+        )
+        self.london = LastModifiedCityModel.objects.create(
+            name='London',
+            updated_at=datetime.datetime(2014, 5, 14, 10, 0, 0)
+        )
+
+    def get_http_date(self, value):
+        return self.client.get('/cities/{0}/'.format(value.pk))['Last-Modified']
+
+    def test_list_should_use_max_updated_at(self):
+        response = self.client.get('/cities/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Last-Modified'], self.get_http_date(self.london))
+
+    def test_list_should_return_304_if_not_modified_since(self):
+        last_modified = self.client.get('/cities/')['Last-Modified']
+        response = self.client.get('/cities/', HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response.content, b'')
+
+    def test_list_should_be_modified_after_update(self):
+        last_modified = self.client.get('/cities/')['Last-Modified']
+        self.moscow.updated_at = datetime.datetime(2014, 5, 15, 10, 0, 0)
+        self.moscow.save()
+        response = self.client.get('/cities/', HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_retrieve_should_use_updated_at_of_object(self):
+        self.assertNotEqual(self.get_http_date(self.moscow), self.get_http_date(self.london))
+        response = self.client.get('/cities/1/', HTTP_IF_MODIFIED_SINCE=self.get_http_date(self.moscow))
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_retrieve_should_return_404_for_unknown_object(self):
+        response = self.client.get('/cities/100/', HTTP_IF_MODIFIED_SINCE=http_date())
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_update_should_fail_if_modified_after_if_unmodified_since(self):
+        last_modified = self.get_http_date(self.moscow)
+        LastModifiedCityModel.objects.filter(pk=self.moscow.pk).update(
+            updated_at=datetime.datetime(2014, 5, 15, 10, 0, 0)
+        )
+        response = self.client.put(
+            '/cities/1/',
+            data=json.dumps({'name': 'Saint Petersburg', 'updated_at': '2014-05-16T10:00:00'}),
+            content_type='application/json',
+            HTTP_IF_UNMODIFIED_SINCE=last_modified
+        )
+        self.assertEqual(response.status_code, status.HTTP_412_PRECONDITION_FAILED)
+        self.assertEqual(LastModifiedCityModel.objects.get(pk=self.moscow.pk).name, 'Moscow')
+
+    def test_update_should_return_new_last_modified(self):
+        response = self.client.put(
+            '/cities/1/',
+            data=json.dumps({'name': 'Saint Petersburg', 'updated_at': '2014-05-16T10:00:00'}),
+            content_type='application/json',
+            HTTP_IF_UNMODIFIED_SINCE=self.get_http_date(self.moscow)
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Last-Modified'], self.get_http_date(self.moscow))
+        self.assertNotEqual(response['Last-Modified'], self.get_http_date(self.london))
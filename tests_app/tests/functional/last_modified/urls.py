@@ -0,0 +1,9 @@
+# -*- coding: utf-8 -*-
+from rest_framework import routers
+
+from .views import CityViewSet
+
+
+viewset_router = routers.DefaultRouter()
+viewset_router.register('cities', CityViewSet)
+urlpatterns = viewset_router.urls
@@ -0,0 +1,10 @@
+# -*- coding: utf-8 -*-
+from rest_framework import viewsets
+
+from rest_framework_extensions.last_modified.mixins import LastModifiedMixin
+
+from .models import LastModifiedCityModel
+
+
+class CityViewSet(LastModifiedMixin, viewsets.ModelViewSet):
+    model = LastModifiedCityModel
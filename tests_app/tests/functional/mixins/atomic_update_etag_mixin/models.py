@@ -0,0 +1,10 @@
+# -*- coding: utf-8 -*-
+from django.db import models
+
+
+class CityForAtomicUpdateETAGMixin(models.Model):
+    name = models.CharField(max_length=100)
+    version = models.IntegerField(default=1)
+
+    class Meta:
+        app_label = 'tests_app'
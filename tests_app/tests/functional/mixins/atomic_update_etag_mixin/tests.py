@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+import json
+
+from rest_framework import status
+
+from rest_framework_extensions.test import APITestCase
+
+from .urls import urlpatterns
+from .models import CityForAtomicUpdateETAGMixin as City
+
+
+class AtomicETAGMixinTest(APITestCase):
+    urls = urlpatterns
+
+    def setUp(self):
+        self.city = City.objects.create(name='Moscow')
+
+    def put(self, url, data, **headers):
+        return self.client.put(url, data=json.dumps(data), content_type='application/json', **headers)
+
+    def test_retrieve_should_return_version_as_etag(self):
+        response = self.client.get('/cities/1/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['ETag'], '"1"')
+
+    def test_create_should_set_initial_version(self):
+        response = self.client.post(
+            '/cities/',
+            data=json.dumps({'name': 'Paris'}),
+            content_type='application/json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(City.objects.get(name='Paris').version, 1)
+
+    def test_update_should_increment_version(self):
+        response = self.put('/cities/1/', {'name': 'Paris'}, HTTP_IF_MATCH='"1"')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['ETag'], '"2"')
+        self.assertEqual(json.loads(response.content.decode('utf-8'))['version'], 2)
+        city = City.objects.get(pk=1)
+        self.assertEqual(city.name, 'Paris')
+        self.assertEqual(city.version, 2)
+
+    def test_update_should_ignore_version_from_data(self):
+        response = self.put('/cities/1/', {'name': 'Paris', 'version': 100}, HTTP_IF_MATCH='"1"')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(City.objects.get(pk=1).version, 2)
+
+    def test_partial_update_should_increment_version(self):
+        response = self.client.patch(
+            '/cities/1/',
+            data=json.dumps({'name': 'Paris'}),
+            content_type='application/json',
+            HTTP_IF_MATCH='"1"'
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(City.objects.get(pk=1).version, 2)
+
+    def test_update_without_if_match_should_increment_version(self):
+        response = self.put('/cities/1/', {'name': 'Paris'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(City.objects.get(pk=1).version, 2)
+
+    def test_update_with_any_etag_should_increment_version(self):
+        response = self.put('/cities/1/', {'name': 'Paris'}, HTTP_IF_MATCH='*')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(City.objects.get(pk=1).version, 2)
+
+    def test_update_should_fail_if_version_is_outdated(self):
+        self.put('/cities/1/', {'name': 'Paris'}, HTTP_IF_MATCH='"1"')
+        response = self.put('/cities/1/', {'name': 'London'}, HTTP_IF_MATCH='"1"')
+        self.assertEqual(response.status_code, status.HTTP_412_PRECONDITION_FAILED)
+        city = City.objects.get(pk=1)
+        self.assertEqual(city.name, 'Paris')
+        self.assertEqual(city.version, 2)
+
+    def test_update_should_fail_if_object_is_changed_after_reading(self):
+        response = self.put('/concurrently-changed-cities/1/', {'name': 'Paris'}, HTTP_IF_MATCH='"1"')
+        self.assertEqual(response.status_code, status.HTTP_412_PRECONDITION_FAILED)
+        self.assertNotEqual(City.objects.get(pk=1).name, 'Paris')
+
+    def test_update_without_if_match_should_fail_if_object_is_changed_after_reading(self):
+        response = self.put('/concurrently-changed-cities/1/', {'name': 'Paris'})
+        self.assertEqual(response.status_code, status.HTTP_412_PRECONDITION_FAILED)
+        self.assertNotEqual(City.objects.get(pk=1).name, 'Paris')
+
+    def test_create_with_put_should_set_initial_version(self):
+        response = self.put('/cities/2/', {'name': 'Paris'})
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response['ETag'], '"1"')
+        self.assertEqual(City.objects.get(pk=2).version, 1)
+
+    def test_create_with_put_should_fail_if_if_match_is_given(self):
+        response = self.put('/cities/2/', {'name': 'Paris'}, HTTP_IF_MATCH='"1"')
+        self.assertEqual(response.status_code, status.HTTP_412_PRECONDITION_FAILED)
+        self.assertFalse(City.objects.filter(pk=2).exists())
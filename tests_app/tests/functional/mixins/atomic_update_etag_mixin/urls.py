@@ -0,0 +1,10 @@
+# -*- coding: utf-8 -*-
+from rest_framework import routers
+
+from .views import CityViewSet, ConcurrentlyChangedCityViewSet
+
+
+viewset_router = routers.DefaultRouter()
+viewset_router.register('cities', CityViewSet)
+viewset_router.register('concurrently-changed-cities', ConcurrentlyChangedCityViewSet)
+urlpatterns = viewset_router.urls
@@ -0,0 +1,20 @@
+# -*- coding: utf-8 -*-
+from django.db.models import F
+
+from rest_framework import viewsets
+
+from rest_framework_extensions.etag.mixins import AtomicETAGMixin
+
+from .models import CityForAtomicUpdateETAGMixin as City
+
+
+class CityViewSet(AtomicETAGMixin, viewsets.ModelViewSet):
+    model = City
+
+
+class ConcurrentlyChangedCityViewSet(CityViewSet):
+    def get_object_or_none(self):
+        obj = super(ConcurrentlyChangedCityViewSet, self).get_object_or_none()
+        # concurrent request changes the object between reading and writing
+        City.objects.filter(pk=obj.pk).update(name='London', version=F('version') + 1)
+        return obj
@@ -0,0 +1,10 @@
+# -*- coding: utf-8 -*-
+from django.db import models
+
+
+class CommentForBulkOperationJob(models.Model):
+    email = models.EmailField()
+    rating = models.IntegerField(default=0)
+
+    class Meta:
+        app_label = 'tests_app'
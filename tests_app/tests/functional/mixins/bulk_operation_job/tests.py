@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+import json
+import threading
+
+from mock import patch
+
+from rest_framework_extensions.test import APITestCase
+from rest_framework_extensions.settings import extensions_api_settings
+from rest_framework_extensions.bulk_operations.jobs import (
+    bulk_operation_jobs,
+    sync_executor,
+    ThreadPoolExecutor,
+)
+from rest_framework_extensions import utils
+
+from .models import CommentForBulkOperationJob as Comment
+from tests_app.testutils import override_extensions_api_settings
+
+
+class BulkOperationJobTest(APITestCase):
+    urls = 'tests_app.tests.functional.mixins.bulk_operation_job.urls'
+
+    def setUp(self):
+        for i in range(1, 6):
+            Comment.objects.create(
+                id=i,
+                email='example{0}@ya.ru'.format(i)
+            )
+        self.protection_headers = {
+            utils.prepare_header_name(extensions_api_settings.DEFAULT_BULK_OPERATION_HEADER_NAME): 'true'
+        }
+
+    def get_job(self, job_id):
+        resp = self.client.get('/bulk-operation-jobs/{0}/'.format(job_id))
+        self.assertEqual(resp.status_code, 200)
+        return resp.data
+
+    @override_extensions_api_settings(DEFAULT_BULK_OPERATION_EXECUTOR=sync_executor)
+    def test_bulk_destroy_should_respond_with_accepted_job(self):
+        resp = self.client.delete('/comments/', **self.protection_headers)
+        self.assertEqual(resp.status_code, 202)
+        self.assertEqual(resp.data['status'], 'pending')
+        self.assertEqual(
+            resp['Location'],
+            'http://testserver/bulk-operation-jobs/{0}/'.format(resp.data['id'])
+        )
+
+    @override_extensions_api_settings(DEFAULT_BULK_OPERATION_EXECUTOR=sync_executor)
+    def test_bulk_destroy_job_status(self):
+        resp = self.client.delete('/comments/?email=example1@ya.ru', **self.protection_headers)
+        job = self.get_job(resp.data['id'])
+        self.assertEqual(job['status'], 'succeeded')
+        self.assertEqual(job['count'], 1)
+        self.assertEqual(job['total'], 1)
+        self.assertEqual(Comment.objects.count(), 4)
+
+    @override_extensions_api_settings(DEFAULT_BULK_OPERATION_EXECUTOR=sync_executor)
+    def test_bulk_destroy_by_batches_should_report_progress(self):
+        reported = []
+        original_save = bulk_operation_jobs.save
+
+        def save(job):
+            reported.append((job['status'], job['count']))
+            original_save(job)
+
+        with patch.object(bulk_operation_jobs, 'save', save):
+            resp = self.client.delete('/batched-comments/', **self.protection_headers)
+        job = self.get_job(resp.data['id'])
+        self.assertEqual(job['status'], 'succeeded')
+        self.assertEqual(job['count'], 5)
+        self.assertEqual(job['total'], 5)
+        self.assertEqual(Comment.objects.count(), 0)
+        self.assertEqual(
+            [count for job_status, count in reported if job_status == 'running'],
+            [0, 0, 2, 4, 5]
+        )
+
+    @override_extensions_api_settings(DEFAULT_BULK_OPERATION_EXECUTOR=sync_executor)
+    def test_bulk_update_job_should_count_updated_rows(self):
+        resp = self.client.patch(
+            '/comments/?email=example2@ya.ru',
+            data=json.dumps({'rating': 5}),
+            content_type='application/json',
+            **self.protection_headers
+        )
+        self.assertEqual(resp.status_code, 202)
+        job = self.get_job(resp.data['id'])
+        self.assertEqual(job['status'], 'succeeded')
+        self.assertEqual(job['count'], 1)
+        self.assertEqual(job['total'], 1)
+        self.assertEqual(Comment.objects.get(pk=2).rating, 5)
+
+    @override_extensions_api_settings(DEFAULT_BULK_OPERATION_EXECUTOR=sync_executor)
+    def test_bulk_update_items_job_should_count_updated_rows(self):
+        data = [{'id': 1, 'rating': 1}, {'id': 2, 'rating': 2}, {'id': 100, 'rating': 3}]
+        resp = self.client.patch(
+            '/comments/',
+            data=json.dumps(data),
+            content_type='application/json',
+            **self.protection_headers
+        )
+        self.assertEqual(resp.status_code, 202)
+        job = self.get_job(resp.data['id'])
+        self.assertEqual(job['status'], 'succeeded')
+        self.assertEqual(job['count'], 2)
+        self.assertEqual(job['total'], 3)
+        self.assertEqual(Comment.objects.get(pk=1).rating, 1)
+        self.assertEqual(Comment.objects.get(pk=2).rating, 2)
+
+    @override_extensions_api_settings(DEFAULT_BULK_OPERATION_EXECUTOR=sync_executor)
+    def test_failed_job_should_contain_error(self):
+        resp = self.client.patch(
+            '/comments/',
+            data=json.dumps({'rating': 'not a number'}),
+            content_type='application/json',
+            **self.protection_headers
+        )
+        self.assertEqual(resp.status_code, 202)
+        job = self.get_job(resp.data['id'])
+        self.assertEqual(job['status'], 'failed')
+        self.assertEqual(job['error'], 'Bulk operation failed.')
+        self.assertEqual(Comment.objects.filter(rating=0).count(), 5)
+
+    def test_unknown_job_should_respond_with_not_found(self):
+        resp = self.client.get('/bulk-operation-jobs/unknown/')
+        self.assertEqual(resp.status_code, 404)
+
+    def test_bulk_operation_should_not_start_job_without_protection_header(self):
+        resp = self.client.delete('/comments/')
+        self.assertEqual(resp.status_code, 400)
+        self.assertEqual(Comment.objects.count(), 5)
+
+
+class ThreadPoolExecutorTest(APITestCase):
+    def test_should_run_function_in_other_thread(self):
+        executed = threading.Event()
+        threads = []
+
+        def func():
+            threads.append(threading.current_thread())
+            executed.set()
+
+        ThreadPoolExecutor(max_workers=1)(func)
+        self.assertTrue(executed.wait(5))
+        self.assertNotEqual(threads[0], threading.current_thread())
@@ -0,0 +1,15 @@
+# -*- coding: utf-8 -*-
+from django.conf.urls import url
+
+from rest_framework import routers
+from rest_framework_extensions.bulk_operations.views import BulkOperationJobView
+
+from .views import CommentViewSet, BatchedCommentViewSet
+
+
+viewset_router = routers.DefaultRouter()
+viewset_router.register('comments', CommentViewSet)
+viewset_router.register('batched-comments', BatchedCommentViewSet)
+urlpatterns = viewset_router.urls + [
+    url(r'^bulk-operation-jobs/(?P<job_id>\w+)/$', BulkOperationJobView.as_view(), name='bulk-operation-job'),
+]
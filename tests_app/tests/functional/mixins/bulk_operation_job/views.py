@@ -0,0 +1,18 @@
+# -*- coding: utf-8 -*-
+from rest_framework import viewsets
+from rest_framework import filters
+from rest_framework_extensions.mixins import ListDestroyModelMixin, ListUpdateModelMixin
+
+from .models import CommentForBulkOperationJob as Comment
+
+
+class CommentViewSet(ListDestroyModelMixin, ListUpdateModelMixin, viewsets.ModelViewSet):
+    model = Comment
+    filter_backends = (filters.DjangoFilterBackend,)
+    filter_fields = ('email',)
+    bulk_operation_async = True
+    bulk_operation_job_url_name = 'bulk-operation-job'
+
+
+class BatchedCommentViewSet(CommentViewSet):
+    bulk_destroy_batch_size = 2
@@ -0,0 +1,24 @@
+# -*- coding: utf-8 -*-
+from django.db import models
+
+
+class CommentForBulkCreate(models.Model):
+    email = models.EmailField()
+
+    class Meta:
+        app_label = 'tests_app'
+
+
+class TagForBulkCreate(models.Model):
+    name = models.CharField(max_length=100)
+
+    class Meta:
+        app_label = 'tests_app'
+
+
+class ArticleForBulkCreate(models.Model):
+    title = models.CharField(max_length=100)
+    tags = models.ManyToManyField(TagForBulkCreate, blank=True)
+
+    class Meta:
+        app_label = 'tests_app'
@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+import json
+
+from mock import patch
+
+from rest_framework_extensions.test import APITestCase
+from rest_framework_extensions.settings import extensions_api_settings
+from rest_framework_extensions import utils
+from rest_framework_extensions.cache.invalidation import model_versions
+
+from .urls import urlpatterns
+from .views import CommentViewSet
+from .models import (
+    CommentForBulkCreate as Comment,
+    ArticleForBulkCreate as Article,
+    TagForBulkCreate as Tag,
+)
+from tests_app.testutils import override_extensions_api_settings
+
+
+class ListCreateBulkModelMixinTest(APITestCase):
+    urls = urlpatterns
+
+    def setUp(self):
+        self.protection_headers = {
+            utils.prepare_header_name(extensions_api_settings.DEFAULT_BULK_OPERATION_HEADER_NAME): 'true'
+        }
+        self.bulk_data = [
+            {'email': 'example@ya.ru'},
+            {'email': 'example@gmail.com'},
+            {'email': 'example@yandex.ru'},
+        ]
+
+    def post(self, data, **headers):
+        return self.client.post('/comments/', data=json.dumps(data), content_type='application/json', **headers)
+
+    def test_create_instance(self):
+        resp = self.post({'email': 'example@ya.ru'})
+        self.assertEqual(resp.status_code, 201)
+        self.assertEqual(list(Comment.objects.values_list('email', flat=True)), ['example@ya.ru'])
+
+    def test_bulk_create__without_protection_header(self):
+        resp = self.post(self.bulk_data)
+        self.assertEqual(resp.status_code, 400)
+        expected_message = {
+            'detail': 'Header \'{0}\' should be provided for bulk operation.'.format(
+                extensions_api_settings.DEFAULT_BULK_OPERATION_HEADER_NAME
+            )
+        }
+        self.assertEqual(resp.data, expected_message)
+        self.assertEqual(Comment.objects.count(), 0)
+
+    def test_bulk_create__with_protection_header(self):
+        resp = self.post(self.bulk_data, **self.protection_headers)
+        self.assertEqual(resp.status_code, 201)
+        self.assertEqual([item['email'] for item in resp.data], [item['email'] for item in self.bulk_data])
+        self.assertEqual(
+            sorted(Comment.objects.values_list('email', flat=True)),
+            sorted(item['email'] for item in self.bulk_data)
+        )
+
+    @override_extensions_api_settings(DEFAULT_BULK_OPERATION_HEADER_NAME=None)
+    def test_bulk_create__without_protection_header__and_with_turned_off_protection_header(self):
+        resp = self.post(self.bulk_data)
+        self.assertEqual(resp.status_code, 201)
+        self.assertEqual(Comment.objects.count(), 3)
+
+    def test_bulk_create__should_insert_by_batches(self):
+        with patch('django.db.models.query.QuerySet._batched_insert') as batched_insert:
+            self.post(self.bulk_data, **self.protection_headers)
+        self.assertEqual(batched_insert.call_args[0][2], 2)
+
+    def test_bulk_create__should_not_create_anything_if_any_item_is_invalid(self):
+        self.bulk_data[1]['email'] = 'not email'
+        resp = self.post(self.bulk_data, **self.protection_headers)
+        self.assertEqual(resp.status_code, 400)
+        self.assertEqual(resp.data[0], {})
+        self.assertIn('email', resp.data[1])
+        self.assertEqual(Comment.objects.count(), 0)
+
+    def test_bulk_create__should_not_create_more_than_max_rows(self):
+        with patch.object(CommentViewSet, 'bulk_operation_max_rows', 2):
+            resp = self.post(self.bulk_data, **self.protection_headers)
+        self.assertEqual(resp.status_code, 400)
+        self.assertEqual(resp.data, {'detail': 'Bulk operation should affect at most 2 objects.'})
+        self.assertEqual(Comment.objects.count(), 0)
+
+    def test_bulk_create__should_create_if_max_rows_is_not_exceeded(self):
+        with patch.object(CommentViewSet, 'bulk_operation_max_rows', 3):
+            resp = self.post(self.bulk_data, **self.protection_headers)
+        self.assertEqual(resp.status_code, 201)
+        self.assertEqual(Comment.objects.count(), 3)
+
+    def test_bulk_create__should_be_made_in_one_transaction(self):
+        def fail_after_first_batch(objs, fields, batch_size):
+            for obj in objs[:batch_size]:
+                obj.save()
+            raise ValueError('second batch failed')
+
+        with patch('django.db.models.query.QuerySet._batched_insert', side_effect=fail_after_first_batch):
+            with self.assertRaises(ValueError):
+                self.post(self.bulk_data, **self.protection_headers)
+        self.assertEqual(Comment.objects.count(), 0)
+
+    def test_bulk_create__should_bump_model_version(self):
+        model_versions.register(Comment)
+        try:
+            version = model_versions.get_version(Comment)
+            self.post(self.bulk_data, **self.protection_headers)
+            self.assertNotEqual(model_versions.get_version(Comment), version)
+        finally:
+            model_versions.unregister(Comment)
+
+
+class ListCreateBulkModelMixinTestBehaviour__relations(APITestCase):
+    urls = urlpatterns
+
+    def setUp(self):
+        self.tag = Tag.objects.create(name='django')
+        self.protection_headers = {
+            utils.prepare_header_name(extensions_api_settings.DEFAULT_BULK_OPERATION_HEADER_NAME): 'true'
+        }
+
+    def post(self, data, **headers):
+        return self.client.post('/articles/', data=json.dumps(data), content_type='application/json', **headers)
+
+    def test_should_not_create_objects_with_many_to_many_data(self):
+        data = [{'title': 'First', 'tags': [self.tag.pk]}, {'title': 'Second', 'tags': []}]
+        resp = self.post(data, **self.protection_headers)
+        self.assertEqual(resp.status_code, 400)
+        self.assertEqual(
+            resp.data,
+            {'detail': 'Many to many, reverse and nested relations are not saved by bulk create.'}
+        )
+        self.assertEqual(Article.objects.count(), 0)
+
+    def test_should_create_instance_with_many_to_many_data(self):
+        resp = self.post({'title': 'First', 'tags': [self.tag.pk]})
+        self.assertEqual(resp.status_code, 201)
+        self.assertEqual(list(Article.objects.get().tags.all()), [self.tag])
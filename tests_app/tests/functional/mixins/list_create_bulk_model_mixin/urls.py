@@ -0,0 +1,10 @@
+# -*- coding: utf-8 -*-
+from rest_framework import routers
+
+from .views import CommentViewSet, ArticleViewSet
+
+
+viewset_router = routers.DefaultRouter()
+viewset_router.register('comments', CommentViewSet)
+viewset_router.register('articles', ArticleViewSet)
+urlpatterns = viewset_router.urls
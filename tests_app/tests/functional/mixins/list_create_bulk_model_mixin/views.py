@@ -0,0 +1,14 @@
+# -*- coding: utf-8 -*-
+from rest_framework import viewsets
+from rest_framework_extensions.mixins import ListCreateBulkModelMixin
+
+from .models import CommentForBulkCreate as Comment, ArticleForBulkCreate as Article
+
+
+class CommentViewSet(ListCreateBulkModelMixin, viewsets.ModelViewSet):
+    model = Comment
+    bulk_create_batch_size = 2
+
+
+class ArticleViewSet(ListCreateBulkModelMixin, viewsets.ModelViewSet):
+    model = Article
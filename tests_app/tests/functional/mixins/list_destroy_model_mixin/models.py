@@ -6,4 +6,32 @@ class CommentForListDestroyModelMixin(models.Model):
     email = models.EmailField()
 
     class Meta:
-        app_label = 'tests_app'
\ No newline at end of file
+        app_label = 'tests_app'
+
+
+class ReplyForListDestroyModelMixin(models.Model):
+    comment = models.ForeignKey(CommentForListDestroyModelMixin)
+    text = models.CharField(max_length=100)
+
+    class Meta:
+        app_label = 'tests_app'
+
+
+class VisibleNoteManager(models.Manager):
+    def get_queryset(self):
+        return super(VisibleNoteManager, self).get_queryset().filter(is_hidden=False)
+
+    # Django < 1.6
+    def get_query_set(self):
+        return super(VisibleNoteManager, self).get_query_set().filter(is_hidden=False)
+
+
+class NoteForListDestroyModelMixin(models.Model):
+    text = models.CharField(max_length=100)
+    is_hidden = models.BooleanField(default=False)
+
+    objects = VisibleNoteManager()
+    all_objects = models.Manager()
+
+    class Meta:
+        app_label = 'tests_app'
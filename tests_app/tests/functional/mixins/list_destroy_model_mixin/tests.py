@@ -1,10 +1,24 @@
 # -*- coding: utf-8 -*-
+from mock import patch
+
+from django.db import connection
+from django.db.models.signals import post_delete
+from django.test.utils import CaptureQueriesContext
+
 from rest_framework_extensions.test import APITestCase
 from rest_framework_extensions.settings import extensions_api_settings
 from rest_framework_extensions import utils
+from rest_framework_extensions.compat import get_live_receivers
 
 from .urls import urlpatterns
-from .models import CommentForListDestroyModelMixin as Comment
+from rest_framework_extensions.cache.invalidation import model_versions
+
+from .models import (
+    CommentForListDestroyModelMixin as Comment,
+    ReplyForListDestroyModelMixin as Reply,
+    NoteForListDestroyModelMixin as Note,
+)
+from .views import CommentViewSet, ReplyViewSet
 from tests_app.testutils import override_extensions_api_settings
 
 
@@ -67,22 +81,236 @@ class ListDestroyModelMixinTest(APITestCase):
 
     def test_bulk_destroy__with_protection_header(self):
         resp = self.client.delete('/comments/', **self.protection_headers)
-        self.assertEqual(resp.status_code, 204)
+        self.assertEqual(resp.status_code, 200)
         self.assertEqual(Comment.objects.count(), 0)
 
     @override_extensions_api_settings(DEFAULT_BULK_OPERATION_HEADER_NAME=None)
     def test_bulk_destroy__without_protection_header__and_with_turned_off_protection_header(self):
         resp = self.client.delete('/comments/')
-        self.assertEqual(resp.status_code, 204)
+        self.assertEqual(resp.status_code, 200)
         self.assertEqual(Comment.objects.count(), 0)
 
     def test_bulk_destroy__should_destroy_filtered_queryset(self):
         resp = self.client.delete('/comments/?id=1', **self.protection_headers)
-        self.assertEqual(resp.status_code, 204)
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.data, {'count': 1})
         self.assertEqual(Comment.objects.count(), 1)
         self.assertEqual(Comment.objects.all()[0], self.comments[1])
 
     def test_bulk_destroy__should_not_destroy_if_client_has_no_permissions(self):
         resp = self.client.delete('/comments-with-permission/', **self.protection_headers)
         self.assertEqual(resp.status_code, 404)
-        self.assertEqual(Comment.objects.count(), 2)
\ No newline at end of file
+        self.assertEqual(Comment.objects.count(), 2)
+
+
+class ListDestroyModelMixinTestBehaviour__batches(APITestCase):
+    urls = urlpatterns
+
+    def setUp(self):
+        for i in range(1, 6):
+            Comment.objects.create(id=i, email='example@ya.ru')
+        self.protection_headers = {
+            utils.prepare_header_name(extensions_api_settings.DEFAULT_BULK_OPERATION_HEADER_NAME): 'true'
+        }
+
+    def get_delete_statements_count(self, queries):
+        # cascaded replies are deleted with their own statements
+        statement = 'DELETE FROM "{0}"'.format(Comment._meta.db_table)
+        return len([query for query in queries if statement in query['sql']])
+
+    def fail_on_third_comment(self, sender, instance, **kwargs):
+        if instance.pk == 3:
+            raise ValueError('Deletion failed')
+
+    def test_should_delete_by_batches_and_return_count(self):
+        with CaptureQueriesContext(connection) as context:
+            resp = self.client.delete('/batched-comments/', **self.protection_headers)
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.data, {'count': 5})
+        self.assertEqual(Comment.objects.count(), 0)
+        self.assertEqual(self.get_delete_statements_count(context.captured_queries), 3)
+
+    def test_should_delete_filtered_queryset(self):
+        resp = self.client.delete('/batched-comments/?id=2', **self.protection_headers)
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.data, {'count': 1})
+        self.assertEqual(list(Comment.objects.values_list('id', flat=True).order_by('id')), [1, 3, 4, 5])
+
+    def test_should_require_protection_header(self):
+        resp = self.client.delete('/batched-comments/')
+        self.assertEqual(resp.status_code, 400)
+        self.assertEqual(Comment.objects.count(), 5)
+
+    def test_should_delete_all_batches_in_one_transaction_by_default(self):
+        post_delete.connect(self.fail_on_third_comment, sender=Comment)
+        try:
+            with self.assertRaises(ValueError):
+                self.client.delete('/batched-comments/', **self.protection_headers)
+        finally:
+            post_delete.disconnect(self.fail_on_third_comment, sender=Comment)
+        self.assertEqual(Comment.objects.count(), 5)
+
+    def test_should_commit_every_batch_if_it_asked(self):
+        post_delete.connect(self.fail_on_third_comment, sender=Comment)
+        try:
+            with self.assertRaises(ValueError):
+                self.client.delete('/batch-committed-comments/', **self.protection_headers)
+        finally:
+            post_delete.disconnect(self.fail_on_third_comment, sender=Comment)
+        self.assertEqual(list(Comment.objects.values_list('id', flat=True).order_by('id')), [3, 4, 5])
+
+    def test_should_delete_batches_of_objects_hidden_by_default_manager(self):
+        for i in range(1, 4):
+            Note.all_objects.create(text='note', is_hidden=i != 2)
+        resp = self.client.delete('/batched-notes/', **self.protection_headers)
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.data, {'count': 3})
+        self.assertEqual(Note.all_objects.count(), 0)
+
+
+class ListDestroyModelMixinTestBehaviour__fast(APITestCase):
+    urls = urlpatterns
+
+    def setUp(self):
+        self.comment = Comment.objects.create(id=1, email='example@ya.ru')
+        for i in range(1, 4):
+            Reply.objects.create(id=i, comment=self.comment, text='reply')
+        self.protection_headers = {
+            utils.prepare_header_name(extensions_api_settings.DEFAULT_BULK_OPERATION_HEADER_NAME): 'true'
+        }
+        self.deleted_pks = []
+
+    def on_delete(self, sender, instance, **kwargs):
+        self.deleted_pks.append(instance.pk)
+
+    def get_statements(self, queries, statement):
+        return [query for query in queries if statement in query['sql']]
+
+    def test_can_fast_destroy_bulk_for_model_without_relations_and_receivers(self):
+        self.assertTrue(ReplyViewSet().can_fast_destroy_bulk(Reply.objects.all()))
+
+    def test_can_not_fast_destroy_bulk_for_model_with_cascades(self):
+        self.assertFalse(CommentViewSet().can_fast_destroy_bulk(Comment.objects.all()))
+
+    def test_can_not_fast_destroy_bulk_for_model_with_receivers(self):
+        post_delete.connect(self.on_delete, sender=Reply)
+        try:
+            self.assertFalse(ReplyViewSet().can_fast_destroy_bulk(Reply.objects.all()))
+        finally:
+            post_delete.disconnect(self.on_delete, sender=Reply)
+
+    def test_get_live_receivers_should_return_receivers_connected_to_sender(self):
+        post_delete.connect(self.on_delete, sender=Reply)
+        try:
+            self.assertIn(self.on_delete, get_live_receivers(post_delete, Reply))
+            self.assertNotIn(self.on_delete, get_live_receivers(post_delete, Comment))
+        finally:
+            post_delete.disconnect(self.on_delete, sender=Reply)
+
+    def test_can_fast_destroy_bulk_for_model_with_model_versions(self):
+        model_versions.register(Reply)
+        try:
+            self.assertTrue(ReplyViewSet().can_fast_destroy_bulk(Reply.objects.all()))
+        finally:
+            model_versions.unregister(Reply)
+
+    def test_should_delete_with_one_statement_without_fetching_rows(self):
+        with CaptureQueriesContext(connection) as context:
+            resp = self.client.delete('/replies/?id=2', **self.protection_headers)
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.data, {'count': 1})
+        self.assertEqual(list(Reply.objects.values_list('id', flat=True).order_by('id')), [1, 3])
+        self.assertEqual(len(self.get_statements(context.captured_queries, 'DELETE ')), 1)
+        self.assertEqual(self.get_statements(context.captured_queries, 'SELECT '), [])
+
+    def test_should_bump_model_version_once(self):
+        model_versions.register(Reply)
+        try:
+            version = model_versions.get_version(Reply)
+            self.client.delete('/replies/', **self.protection_headers)
+            self.assertEqual(model_versions.get_version(Reply), version + 1)
+        finally:
+            model_versions.unregister(Reply)
+
+    def test_should_use_collector_if_fast_delete_is_turned_off(self):
+        post_delete.connect(self.on_delete, sender=Reply)
+        try:
+            resp = self.client.delete('/slow-deleted-replies/', **self.protection_headers)
+        finally:
+            post_delete.disconnect(self.on_delete, sender=Reply)
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.data, {'count': 3})
+        self.assertEqual(sorted(self.deleted_pks), [1, 2, 3])
+
+    def test_should_delete_fast_if_it_asked(self):
+        Reply.objects.all().delete()
+        post_delete.connect(self.on_delete, sender=Comment)
+        try:
+            resp = self.client.delete('/fast-deleted-comments/', **self.protection_headers)
+        finally:
+            post_delete.disconnect(self.on_delete, sender=Comment)
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(Comment.objects.count(), 0)
+        self.assertEqual(self.deleted_pks, [])
+
+
+class ListDestroyModelMixinTestBehaviour__counts(APITestCase):
+    urls = urlpatterns
+
+    def setUp(self):
+        for i in range(1, 4):
+            Comment.objects.create(id=i, email='example@ya.ru')
+        self.protection_headers = {
+            utils.prepare_header_name(extensions_api_settings.DEFAULT_BULK_OPERATION_HEADER_NAME): 'true'
+        }
+        self.dry_run_header_name = utils.prepare_header_name(
+            extensions_api_settings.DEFAULT_BULK_OPERATION_DRY_RUN_HEADER_NAME
+        )
+
+    def test_should_respond_with_deleted_count(self):
+        resp = self.client.delete('/comments/', **self.protection_headers)
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.data, {'count': 3})
+
+    def test_dry_run_should_respond_with_count_without_deletion(self):
+        headers = dict(self.protection_headers, **{self.dry_run_header_name: 'true'})
+        resp = self.client.delete('/comments/?id=1', **headers)
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.data, {'count': 1, 'estimated': False})
+        self.assertEqual(Comment.objects.count(), 3)
+
+    def test_dry_run_estimate_should_fall_back_to_count(self):
+        # sqlite has no row estimates
+        headers = dict(self.protection_headers, **{self.dry_run_header_name: 'estimate'})
+        resp = self.client.delete('/comments/', **headers)
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.data, {'count': 3, 'estimated': False})
+        self.assertEqual(Comment.objects.count(), 3)
+
+    def test_dry_run_should_use_estimate(self):
+        headers = dict(self.protection_headers, **{self.dry_run_header_name: 'estimate'})
+        with patch('rest_framework_extensions.utils.estimate_queryset_count', return_value=1000):
+            resp = self.client.delete('/comments/', **headers)
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.data, {'count': 1000, 'estimated': True})
+        self.assertEqual(Comment.objects.count(), 3)
+
+    @override_extensions_api_settings(DEFAULT_BULK_OPERATION_DRY_RUN_HEADER_NAME=None)
+    def test_should_not_dry_run_if_header_is_turned_off(self):
+        headers = dict(self.protection_headers, **{self.dry_run_header_name: 'true'})
+        resp = self.client.delete('/comments/', **headers)
+        self.assertEqual(resp.data, {'count': 3})
+        self.assertEqual(Comment.objects.count(), 0)
+
+    def test_should_not_delete_more_than_max_rows(self):
+        with patch.object(CommentViewSet, 'bulk_operation_max_rows', 2):
+            resp = self.client.delete('/comments/', **self.protection_headers)
+        self.assertEqual(resp.status_code, 400)
+        self.assertEqual(resp.data, {'detail': 'Bulk operation should affect at most 2 objects.'})
+        self.assertEqual(Comment.objects.count(), 3)
+
+    def test_should_delete_if_max_rows_is_not_exceeded(self):
+        with patch.object(CommentViewSet, 'bulk_operation_max_rows', 3):
+            resp = self.client.delete('/comments/', **self.protection_headers)
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.data, {'count': 3})
@@ -1,10 +1,25 @@
 # -*- coding: utf-8 -*-
 from rest_framework import routers
 
-from .views import CommentViewSet, CommentViewSetWithPermissions
+from .views import (
+    CommentViewSet,
+    CommentViewSetWithPermissions,
+    BatchedCommentViewSet,
+    BatchCommittedCommentViewSet,
+    ReplyViewSet,
+    FastDeletedCommentViewSet,
+    SlowDeletedReplyViewSet,
+    BatchedNoteViewSet,
+)
 
 
 viewset_router = routers.DefaultRouter()
 viewset_router.register('comments', CommentViewSet)
 viewset_router.register('comments-with-permissions', CommentViewSetWithPermissions)
+viewset_router.register('batched-comments', BatchedCommentViewSet)
+viewset_router.register('batch-committed-comments', BatchCommittedCommentViewSet)
+viewset_router.register('replies', ReplyViewSet)
+viewset_router.register('fast-deleted-comments', FastDeletedCommentViewSet)
+viewset_router.register('slow-deleted-replies', SlowDeletedReplyViewSet)
+viewset_router.register('batched-notes', BatchedNoteViewSet)
 urlpatterns = viewset_router.urls
\ No newline at end of file
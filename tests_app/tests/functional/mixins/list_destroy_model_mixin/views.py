@@ -5,7 +5,11 @@ from rest_framework import filters
 from rest_framework.permissions import DjangoModelPermissions
 from rest_framework_extensions.mixins import ListDestroyModelMixin
 
-from .models import CommentForListDestroyModelMixin as Comment
+from .models import (
+    CommentForListDestroyModelMixin as Comment,
+    ReplyForListDestroyModelMixin as Reply,
+    NoteForListDestroyModelMixin as Note,
+)
 
 
 class CommentFilter(django_filters.FilterSet):
@@ -24,4 +28,31 @@ class CommentViewSet(ListDestroyModelMixin, viewsets.ModelViewSet):
 
 
 class CommentViewSetWithPermissions(CommentViewSet):
-    permission_classes = (DjangoModelPermissions,)
\ No newline at end of file
+    permission_classes = (DjangoModelPermissions,)
+
+
+class BatchedCommentViewSet(CommentViewSet):
+    bulk_destroy_batch_size = 2
+
+
+class BatchCommittedCommentViewSet(BatchedCommentViewSet):
+    bulk_destroy_commit_per_batch = True
+
+
+class ReplyViewSet(ListDestroyModelMixin, viewsets.ModelViewSet):
+    model = Reply
+    filter_backends = (filters.DjangoFilterBackend,)
+    filter_fields = ('id',)
+
+
+class FastDeletedCommentViewSet(CommentViewSet):
+    bulk_destroy_fast = True
+
+
+class SlowDeletedReplyViewSet(ReplyViewSet):
+    bulk_destroy_fast = False
+
+
+class BatchedNoteViewSet(ListDestroyModelMixin, viewsets.ModelViewSet):
+    queryset = Note.all_objects.all()
+    bulk_destroy_batch_size = 2
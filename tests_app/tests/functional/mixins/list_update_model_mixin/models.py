@@ -15,6 +15,7 @@ class UserForListUpdateModelMixin(models.Model):
     age = models.IntegerField()
     last_name = models.CharField(max_length=10)
     password = models.CharField(max_length=100)
+    login = models.CharField(max_length=10, unique=True, null=True)
 
     class Meta:
         app_label = 'tests_app'
\ No newline at end of file
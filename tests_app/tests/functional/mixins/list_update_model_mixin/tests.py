@@ -1,14 +1,21 @@
 # -*- coding: utf-8 -*-
 import json
 
+from mock import patch
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.utils import unittest
 
 from rest_framework_extensions.test import APITestCase
 from rest_framework_extensions.settings import extensions_api_settings
 from rest_framework_extensions import utils
 from rest_framework_extensions.utils import get_rest_framework_features
+from rest_framework_extensions.compat import Case
 
 from .urls import urlpatterns
+from .views import UserViewSet, CommentViewSet
 from .models import (
     CommentForListUpdateModelMixin as Comment,
     UserForListUpdateModelMixin as User
@@ -91,20 +98,21 @@ class ListUpdateModelMixinTest(APITestCase):
 
     def test_bulk_partial_update__with_protection_header(self):
         resp = self.client.patch('/comments/', data=json.dumps(self.patch_data), content_type='application/json', **self.protection_headers)
-        self.assertEqual(resp.status_code, 204)
+        self.assertEqual(resp.status_code, 200)
         for comment in Comment.objects.all():
             self.assertEqual(comment.email, self.patch_data['email'])
 
     @override_extensions_api_settings(DEFAULT_BULK_OPERATION_HEADER_NAME=None)
     def test_bulk_partial_update__without_protection_header__and_with_turned_off_protection_header(self):
         resp = self.client.patch('/comments/', data=json.dumps(self.patch_data), content_type='application/json', **self.protection_headers)
-        self.assertEqual(resp.status_code, 204)
+        self.assertEqual(resp.status_code, 200)
         for comment in Comment.objects.all():
             self.assertEqual(comment.email, self.patch_data['email'])
 
     def test_bulk_partial_update__should_update_filtered_queryset(self):
         resp = self.client.patch('/comments/?id=1', data=json.dumps(self.patch_data), content_type='application/json', **self.protection_headers)
-        self.assertEqual(resp.status_code, 204)
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.data, {'count': 1})
         self.assertEqual(Comment.objects.get(pk=1).email, self.patch_data['email'])
         self.assertEqual(Comment.objects.get(pk=2).email, self.comments[1].email)
 
@@ -168,7 +176,7 @@ class ListUpdateModelMixinTestBehaviour__serializer_fields(APITestCase):
             'surname': 'Ivanov'
         }
         resp = self.client.patch('/users/', data=json.dumps(data), content_type='application/json', **self.headers)
-        self.assertEqual(resp.status_code, 204)
+        self.assertEqual(resp.status_code, 200)
         self.assertEqual(self.get_fresh_user().last_name, data['surname'])
 
     @unittest.skipIf(
@@ -180,7 +188,7 @@ class ListUpdateModelMixinTestBehaviour__serializer_fields(APITestCase):
             'password': '123'
         }
         resp = self.client.patch('/users/', data=json.dumps(data), content_type='application/json', **self.headers)
-        self.assertEqual(resp.status_code, 204)
+        self.assertEqual(resp.status_code, 200)
         self.assertEqual(self.get_fresh_user().password, data['password'])
 
     def test_should_not_update_read_only_fields(self):
@@ -188,7 +196,7 @@ class ListUpdateModelMixinTestBehaviour__serializer_fields(APITestCase):
             'name': 'Ivan'
         }
         resp = self.client.patch('/users/', data=json.dumps(data), content_type='application/json', **self.headers)
-        self.assertEqual(resp.status_code, 204)
+        self.assertEqual(resp.status_code, 200)
         self.assertEqual(self.get_fresh_user().name, self.user.name)
 
     def test_should_not_update_hidden_fields(self):
@@ -196,5 +204,228 @@ class ListUpdateModelMixinTestBehaviour__serializer_fields(APITestCase):
             'email': 'example@gmail.com'
         }
         resp = self.client.patch('/users/', data=json.dumps(data), content_type='application/json', **self.headers)
-        self.assertEqual(resp.status_code, 204)
-        self.assertEqual(self.get_fresh_user().email, self.user.email)
\ No newline at end of file
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(self.get_fresh_user().email, self.user.email)
+
+
+class ListUpdateModelMixinTestBehaviour__items(APITestCase):
+    urls = urlpatterns
+
+    def setUp(self):
+        self.users = [
+            User.objects.create(
+                id=i,
+                name='Gennady',
+                age=20 + i,
+                last_name='Chibisov',
+                email='example@ya.ru',
+                password='somepassword',
+                login='user{0}'.format(i)
+            )
+            for i in range(1, 4)
+        ]
+        self.headers = {
+            utils.prepare_header_name(extensions_api_settings.DEFAULT_BULK_OPERATION_HEADER_NAME): 'true'
+        }
+
+    def patch(self, url, data, **headers):
+        return self.client.patch(url, data=json.dumps(data), content_type='application/json', **headers)
+
+    def get_update_statements_count(self, queries):
+        return len([query for query in queries if 'UPDATE ' in query['sql']])
+
+    def test_should_update_every_object_with_its_own_values(self):
+        data = [
+            {'id': 1, 'age': 30, 'surname': 'Ivanov'},
+            {'id': 2, 'age': 31},
+            {'id': 3, 'surname': 'Petrov'},
+        ]
+        resp = self.patch('/users/', data, **self.headers)
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.data, {'count': 3})
+        self.assertEqual(
+            list(User.objects.order_by('id').values_list('age', 'last_name')),
+            [(30, 'Ivanov'), (31, 'Chibisov'), (23, 'Petrov')]
+        )
+
+    def test_should_not_update_read_only_fields(self):
+        resp = self.patch('/users/', [{'id': 1, 'name': 'Ivan'}], **self.headers)
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(User.objects.get(pk=1).name, 'Gennady')
+
+    def test_should_update_only_objects_from_filtered_queryset(self):
+        data = [
+            {'id': 1, 'email': 'example@gmail.com'},
+            {'id': 2, 'email': 'example@gmail.com'},
+        ]
+        resp = self.patch('/comments/?id=1', data, **self.headers)
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(Comment.objects.count(), 0)
+
+        Comment.objects.create(id=1, email='example@ya.ru')
+        Comment.objects.create(id=2, email='example@ya.ru')
+        resp = self.patch('/comments/?id=1', data, **self.headers)
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(Comment.objects.get(pk=1).email, 'example@gmail.com')
+        self.assertEqual(Comment.objects.get(pk=2).email, 'example@ya.ru')
+
+    def test_should_group_updates(self):
+        data = [
+            {'id': 1, 'age': 30},
+            {'id': 2, 'age': 30},
+            {'id': 3, 'age': 31},
+        ]
+        with CaptureQueriesContext(connection) as context:
+            resp = self.patch('/users/', data, **self.headers)
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(list(User.objects.order_by('id').values_list('age', flat=True)), [30, 30, 31])
+        if Case is None:
+            # equal values are updated together
+            self.assertEqual(self.get_update_statements_count(context.captured_queries), 2)
+        else:
+            self.assertEqual(self.get_update_statements_count(context.captured_queries), 1)
+
+    def test_should_update_by_batches(self):
+        data = [{'id': user.id, 'age': 40 + user.id} for user in self.users]
+        with patch.object(UserViewSet, 'bulk_update_batch_size', 2):
+            with CaptureQueriesContext(connection) as context:
+                resp = self.patch('/users/', data, **self.headers)
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(list(User.objects.order_by('id').values_list('age', flat=True)), [41, 42, 43])
+        if Case is not None:
+            self.assertEqual(self.get_update_statements_count(context.captured_queries), 2)
+
+    def test_should_require_protection_header(self):
+        resp = self.patch('/users/', [{'id': 1, 'age': 30}])
+        self.assertEqual(resp.status_code, 400)
+        self.assertEqual(User.objects.get(pk=1).age, 21)
+
+    def test_should_require_id(self):
+        resp = self.patch('/users/', [{'id': 1, 'age': 30}, {'age': 31}], **self.headers)
+        self.assertEqual(resp.status_code, 400)
+        self.assertEqual(resp.data, {'detail': "Every item should be an object with unique 'id' field."})
+        self.assertEqual(User.objects.get(pk=1).age, 21)
+
+    def test_should_not_accept_duplicated_ids(self):
+        resp = self.patch('/users/', [{'id': 1, 'age': 30}, {'id': '1', 'age': 31}], **self.headers)
+        self.assertEqual(resp.status_code, 400)
+        self.assertEqual(resp.data, {'detail': "Every item should be an object with unique 'id' field."})
+        self.assertEqual(User.objects.get(pk=1).age, 21)
+
+    def test_should_not_accept_invalid_ids(self):
+        resp = self.patch('/users/', [{'id': [1], 'age': 30}], **self.headers)
+        self.assertEqual(resp.status_code, 400)
+        self.assertEqual(User.objects.get(pk=1).age, 21)
+
+    def test_should_match_objects_by_id_field(self):
+        data = [
+            {'login': 'user2', 'surname': 'Ivanov'},
+            {'login': 'user9', 'surname': 'Petrov'},
+        ]
+        with patch.object(UserViewSet, 'bulk_update_id_field', 'login'):
+            resp = self.patch('/users/', data, **self.headers)
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.data, {'count': 1})
+        self.assertEqual(
+            list(User.objects.order_by('id').values_list('login', 'last_name')),
+            [('user1', 'Chibisov'), ('user2', 'Ivanov'), ('user3', 'Chibisov')]
+        )
+
+    def test_should_require_unique_id_field(self):
+        with patch.object(UserViewSet, 'bulk_update_id_field', 'age'):
+            with self.assertRaises(ImproperlyConfigured):
+                self.patch('/users/', [{'age': 22, 'surname': 'Ivanov'}], **self.headers)
+        self.assertEqual(User.objects.get(pk=2).last_name, 'Chibisov')
+
+    @unittest.skipIf(Case is None, "Conditional expressions are new in Django 1.8")
+    def test_should_update_with_case_expressions(self):
+        update_dicts = {'user1': {'age': 30}, 'user3': {'age': 31}}
+        with CaptureQueriesContext(connection) as context:
+            updated_count = UserViewSet().update_with_case_expressions(
+                User.objects.all(),
+                ('age',),
+                update_dicts,
+                key_field='login'
+            )
+        self.assertEqual(updated_count, 2)
+        self.assertEqual(self.get_update_statements_count(context.captured_queries), 1)
+        self.assertEqual(list(User.objects.order_by('id').values_list('age', flat=True)), [30, 22, 31])
+
+    def test_should_update_with_equal_values(self):
+        update_dicts = {'user1': {'age': 30}, 'user2': {'age': 30}, 'user3': {'age': 31}}
+        with CaptureQueriesContext(connection) as context:
+            updated_count = UserViewSet().update_with_equal_values(
+                User.objects.all(),
+                update_dicts,
+                key_field='login'
+            )
+        self.assertEqual(updated_count, 3)
+        self.assertEqual(self.get_update_statements_count(context.captured_queries), 2)
+        self.assertEqual(list(User.objects.order_by('id').values_list('age', flat=True)), [30, 30, 31])
+
+    def test_should_not_update_anything_if_data_is_invalid_for_db(self):
+        data = [
+            {'id': 1, 'age': 30},
+            {'id': 2, 'age': 'Not integer value'},
+        ]
+        resp = self.patch('/users/', data, **self.headers)
+        self.assertEqual(resp.status_code, 400)
+        self.assertEqual(User.objects.get(pk=1).age, 21)
+
+
+class ListUpdateModelMixinTestBehaviour__counts(APITestCase):
+    urls = urlpatterns
+
+    def setUp(self):
+        for i in range(1, 4):
+            Comment.objects.create(id=i, email='example@ya.ru')
+        self.headers = {
+            utils.prepare_header_name(extensions_api_settings.DEFAULT_BULK_OPERATION_HEADER_NAME): 'true'
+        }
+        self.dry_run_headers = dict(self.headers, **{
+            utils.prepare_header_name(extensions_api_settings.DEFAULT_BULK_OPERATION_DRY_RUN_HEADER_NAME): 'true'
+        })
+
+    def patch(self, url, data, **headers):
+        return self.client.patch(url, data=json.dumps(data), content_type='application/json', **headers)
+
+    def get_emails(self):
+        return list(Comment.objects.order_by('id').values_list('email', flat=True))
+
+    def test_dry_run_should_respond_with_count_without_update(self):
+        resp = self.patch('/comments/?id=1', {'email': 'example@gmail.com'}, **self.dry_run_headers)
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.data, {'count': 1, 'estimated': False})
+        self.assertEqual(self.get_emails(), ['example@ya.ru'] * 3)
+
+    def test_dry_run_for_items_should_count_only_existing_objects(self):
+        data = [{'id': 1, 'email': 'example@gmail.com'}, {'id': 100, 'email': 'example@gmail.com'}]
+        resp = self.patch('/comments/', data, **self.dry_run_headers)
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.data, {'count': 1, 'estimated': False})
+        self.assertEqual(self.get_emails(), ['example@ya.ru'] * 3)
+
+    def test_dry_run_should_require_protection_header(self):
+        header_name = utils.prepare_header_name(extensions_api_settings.DEFAULT_BULK_OPERATION_DRY_RUN_HEADER_NAME)
+        resp = self.patch('/comments/', {'email': 'example@gmail.com'}, **{header_name: 'true'})
+        self.assertEqual(resp.status_code, 400)
+
+    def test_should_not_update_more_than_max_rows(self):
+        with patch.object(CommentViewSet, 'bulk_operation_max_rows', 2):
+            resp = self.patch('/comments/', {'email': 'example@gmail.com'}, **self.headers)
+        self.assertEqual(resp.status_code, 400)
+        self.assertEqual(resp.data, {'detail': 'Bulk operation should affect at most 2 objects.'})
+        self.assertEqual(self.get_emails(), ['example@ya.ru'] * 3)
+
+    def test_should_update_if_max_rows_is_not_exceeded(self):
+        with patch.object(CommentViewSet, 'bulk_operation_max_rows', 2):
+            resp = self.patch('/comments/?id=1', {'email': 'example@gmail.com'}, **self.headers)
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.data, {'count': 1})
+
+    def test_should_not_update_more_than_max_rows_items(self):
+        data = [{'id': i, 'email': 'example@gmail.com'} for i in range(1, 4)]
+        with patch.object(CommentViewSet, 'bulk_operation_max_rows', 2):
+            resp = self.patch('/comments/', data, **self.headers)
+        self.assertEqual(resp.status_code, 400)
+        self.assertEqual(self.get_emails(), ['example@ya.ru'] * 3)
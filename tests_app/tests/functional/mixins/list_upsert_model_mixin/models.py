@@ -0,0 +1,28 @@
+# -*- coding: utf-8 -*-
+from django.db import models
+
+
+class ProductForListUpsertModelMixin(models.Model):
+    sku = models.CharField(max_length=20, unique=True)
+    name = models.CharField(max_length=100)
+    price = models.IntegerField(default=0)
+    barcode = models.CharField(max_length=20, unique=True, null=True, blank=True)
+
+    class Meta:
+        app_label = 'tests_app'
+
+
+class TagForListUpsertModelMixin(models.Model):
+    name = models.CharField(max_length=100)
+
+    class Meta:
+        app_label = 'tests_app'
+
+
+class ArticleForListUpsertModelMixin(models.Model):
+    slug = models.SlugField(unique=True)
+    title = models.CharField(max_length=100)
+    tags = models.ManyToManyField(TagForListUpsertModelMixin, blank=True)
+
+    class Meta:
+        app_label = 'tests_app'
@@ -0,0 +1,198 @@
+# -*- coding: utf-8 -*-
+import json
+
+from mock import patch
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from rest_framework_extensions.test import APITestCase
+from rest_framework_extensions.settings import extensions_api_settings
+from rest_framework_extensions import utils
+
+from .urls import urlpatterns
+from .views import ProductViewSet
+from .models import (
+    ProductForListUpsertModelMixin as Product,
+    ArticleForListUpsertModelMixin as Article,
+    TagForListUpsertModelMixin as Tag,
+)
+
+
+class ListUpsertModelMixinTest(APITestCase):
+    urls = urlpatterns
+
+    def setUp(self):
+        Product.objects.create(id=1, sku='a-1', name='Apple', price=10)
+        Product.objects.create(id=2, sku='b-2', name='Banana', price=20)
+        self.headers = {
+            utils.prepare_header_name(extensions_api_settings.DEFAULT_BULK_OPERATION_HEADER_NAME): 'true'
+        }
+
+    def put(self, url, data, **headers):
+        return self.client.put(url, data=json.dumps(data), content_type='application/json', **headers)
+
+    def get_products(self):
+        return list(Product.objects.order_by('sku').values_list('sku', 'name', 'price'))
+
+    def get_statements(self, queries, statement):
+        return [query for query in queries if statement in query['sql']]
+
+    def test_should_create_new_and_update_existing_objects(self):
+        data = [
+            {'sku': 'a-1', 'name': 'Apple', 'price': 11},
+            {'sku': 'c-3', 'name': 'Cherry', 'price': 30},
+            {'sku': 'd-4', 'name': 'Date', 'price': 40},
+        ]
+        resp = self.put('/products/', data, **self.headers)
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.data, {'created': 2, 'updated': 1})
+        self.assertEqual(self.get_products(), [
+            ('a-1', 'Apple', 11),
+            ('b-2', 'Banana', 20),
+            ('c-3', 'Cherry', 30),
+            ('d-4', 'Date', 40),
+        ])
+
+    def test_should_fetch_existing_objects_with_one_query(self):
+        data = [
+            {'sku': 'a-1', 'price': 11},
+            {'sku': 'b-2', 'price': 21},
+        ]
+        with CaptureQueriesContext(connection) as context:
+            resp = self.put('/products/', data, **self.headers)
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(len(self.get_statements(context.captured_queries, 'SELECT ')), 1)
+
+    def test_should_insert_new_objects_with_one_statement(self):
+        data = [
+            {'sku': 'c-3', 'name': 'Cherry', 'price': 30},
+            {'sku': 'd-4', 'name': 'Date', 'price': 40},
+        ]
+        with CaptureQueriesContext(connection) as context:
+            resp = self.put('/products/', data, **self.headers)
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(len(self.get_statements(context.captured_queries, 'INSERT ')), 1)
+
+    def test_should_update_object_by_detail_route(self):
+        resp = self.put('/products/1/', {'sku': 'a-1', 'name': 'Green apple', 'price': 12})
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(Product.objects.get(pk=1).name, 'Green apple')
+
+    def test_should_require_protection_header(self):
+        resp = self.put('/products/', [{'sku': 'c-3', 'name': 'Cherry'}])
+        self.assertEqual(resp.status_code, 400)
+        self.assertEqual(Product.objects.count(), 2)
+
+    def test_should_require_key_field(self):
+        resp = self.put('/products/', [{'sku': 'c-3', 'name': 'Cherry'}, {'name': 'Date'}], **self.headers)
+        self.assertEqual(resp.status_code, 400)
+        self.assertEqual(resp.data, {'detail': 'Every item should be an object with unique \'sku\' field.'})
+        self.assertEqual(Product.objects.count(), 2)
+
+    def test_should_not_accept_duplicated_keys(self):
+        data = [{'sku': 'c-3', 'name': 'Cherry'}, {'sku': 'c-3', 'name': 'Cherry'}]
+        resp = self.put('/products/', data, **self.headers)
+        self.assertEqual(resp.status_code, 400)
+        self.assertEqual(Product.objects.count(), 2)
+
+    def test_should_not_change_anything_if_new_item_is_invalid(self):
+        data = [
+            {'sku': 'a-1', 'price': 11},
+            {'sku': 'c-3', 'price': 30},
+        ]
+        resp = self.put('/products/', data, **self.headers)
+        self.assertEqual(resp.status_code, 400)
+        self.assertEqual(resp.data[0], {})
+        self.assertIn('name', resp.data[1])
+        self.assertEqual(Product.objects.get(sku='a-1').price, 10)
+        self.assertEqual(Product.objects.count(), 2)
+
+    def test_should_validate_existing_items(self):
+        data = [
+            {'sku': 'a-1', 'name': 'x' * 500},
+            {'sku': 'c-3', 'name': 'Cherry', 'price': 30},
+        ]
+        with CaptureQueriesContext(connection) as context:
+            resp = self.put('/products/', data, **self.headers)
+        self.assertEqual(resp.status_code, 400)
+        self.assertIn('name', resp.data[0])
+        self.assertEqual(resp.data[1], {})
+        self.assertEqual(self.get_statements(context.captured_queries, 'UPDATE '), [])
+        self.assertEqual(Product.objects.get(sku='a-1').name, 'Apple')
+        self.assertEqual(Product.objects.count(), 2)
+
+    def test_should_rollback_creation_if_update_failed(self):
+        data = [
+            {'sku': 'a-1', 'price': 'not a number'},
+            {'sku': 'c-3', 'name': 'Cherry', 'price': 30},
+        ]
+        resp = self.put('/products/', data, **self.headers)
+        self.assertEqual(resp.status_code, 400)
+        self.assertEqual(Product.objects.count(), 2)
+
+    def test_should_not_update_objects_out_of_filtered_queryset(self):
+        data = [{'sku': 'a-1', 'name': 'Apple', 'price': 11}]
+        resp = self.put('/products/?name=Banana', data, **self.headers)
+        self.assertEqual(resp.status_code, 400)
+        self.assertEqual(Product.objects.get(sku='a-1').price, 10)
+
+    def test_should_not_respond_with_integrity_error_message(self):
+        Product.objects.filter(sku='a-1').update(barcode='123')
+        data = [{'sku': 'b-2', 'barcode': '123'}]
+        resp = self.put('/products/', data, **self.headers)
+        self.assertEqual(resp.status_code, 400)
+        self.assertEqual(resp.data, {'detail': 'Objects could not be saved because of conflicting data.'})
+        self.assertEqual(Product.objects.get(sku='b-2').barcode, None)
+
+    def test_should_require_unique_key_field(self):
+        data = [{'name': 'Apple', 'price': 11}]
+        with self.assertRaises(ImproperlyConfigured):
+            self.put('/products-by-name/', data, **self.headers)
+        self.assertEqual(Product.objects.get(sku='a-1').price, 10)
+
+    def test_should_require_key_field_setting(self):
+        data = [{'sku': 'c-3', 'name': 'Cherry', 'price': 30}]
+        with self.assertRaises(ImproperlyConfigured):
+            self.put('/products-without-key/', data, **self.headers)
+        self.assertEqual(Product.objects.count(), 2)
+
+    def test_should_not_accept_auto_field_as_key(self):
+        data = [{'id': 99999, 'sku': 'c-3', 'name': 'Cherry', 'price': 30}]
+        with self.assertRaises(ImproperlyConfigured):
+            self.put('/products-by-id/', data, **self.headers)
+        self.assertEqual(Product.objects.count(), 2)
+
+    def test_dry_run_should_count_without_changes(self):
+        headers = dict(self.headers, **{
+            utils.prepare_header_name(extensions_api_settings.DEFAULT_BULK_OPERATION_DRY_RUN_HEADER_NAME): 'true'
+        })
+        data = [{'sku': 'a-1', 'price': 11}, {'sku': 'c-3', 'name': 'Cherry'}]
+        resp = self.put('/products/', data, **headers)
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.data, {'created': 1, 'updated': 1})
+        self.assertEqual(Product.objects.count(), 2)
+        self.assertEqual(Product.objects.get(sku='a-1').price, 10)
+
+    def test_should_not_upsert_more_than_max_rows(self):
+        data = [{'sku': 'a-1', 'price': 11}, {'sku': 'c-3', 'name': 'Cherry'}]
+        with patch.object(ProductViewSet, 'bulk_operation_max_rows', 1):
+            resp = self.put('/products/', data, **self.headers)
+        self.assertEqual(resp.status_code, 400)
+        self.assertEqual(Product.objects.count(), 2)
+
+    def test_should_not_create_objects_with_many_to_many_data(self):
+        tag = Tag.objects.create(name='django')
+        Article.objects.create(slug='first', title='First')
+        data = [
+            {'slug': 'first', 'title': 'First edited'},
+            {'slug': 'second', 'title': 'Second', 'tags': [tag.pk]},
+        ]
+        resp = self.put('/articles/', data, **self.headers)
+        self.assertEqual(resp.status_code, 400)
+        self.assertEqual(
+            resp.data,
+            {'detail': 'Many to many, reverse and nested relations are not saved by bulk create.'}
+        )
+        self.assertEqual(list(Article.objects.values_list('slug', 'title')), [('first', 'First')])
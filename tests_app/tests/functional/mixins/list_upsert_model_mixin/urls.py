@@ -0,0 +1,19 @@
+# -*- coding: utf-8 -*-
+from rest_framework import routers
+
+from .views import (
+    ProductViewSet,
+    ProductWithoutKeyViewSet,
+    ProductByIdViewSet,
+    ProductByNameViewSet,
+    ArticleViewSet,
+)
+
+
+viewset_router = routers.DefaultRouter()
+viewset_router.register('products', ProductViewSet)
+viewset_router.register('products-without-key', ProductWithoutKeyViewSet)
+viewset_router.register('products-by-id', ProductByIdViewSet)
+viewset_router.register('products-by-name', ProductByNameViewSet)
+viewset_router.register('articles', ArticleViewSet)
+urlpatterns = viewset_router.urls
@@ -0,0 +1,35 @@
+# -*- coding: utf-8 -*-
+from rest_framework import viewsets
+from rest_framework import filters
+from rest_framework_extensions.mixins import ListUpsertModelMixin
+
+from .models import (
+    ProductForListUpsertModelMixin as Product,
+    ArticleForListUpsertModelMixin as Article,
+)
+
+
+class ProductViewSet(ListUpsertModelMixin, viewsets.ModelViewSet):
+    model = Product
+    filter_backends = (filters.DjangoFilterBackend,)
+    filter_fields = ('name',)
+    bulk_upsert_key_field = 'sku'
+
+
+class ProductWithoutKeyViewSet(ListUpsertModelMixin, viewsets.ModelViewSet):
+    model = Product
+
+
+class ProductByIdViewSet(ListUpsertModelMixin, viewsets.ModelViewSet):
+    model = Product
+    bulk_upsert_key_field = 'id'
+
+
+class ProductByNameViewSet(ListUpsertModelMixin, viewsets.ModelViewSet):
+    model = Product
+    bulk_upsert_key_field = 'name'
+
+
+class ArticleViewSet(ListUpsertModelMixin, viewsets.ModelViewSet):
+    model = Article
+    bulk_upsert_key_field = 'slug'
@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+import pickle
+
+from mock import patch
+
+from django.test import TestCase
+
+from rest_framework import views
+from rest_framework.response import Response
+
+from rest_framework_extensions.test import APIRequestFactory
+from rest_framework_extensions.cache.backends import TwoTierCache
+from rest_framework_extensions.cache.decorators import cache_response
+from rest_framework_extensions.utils import get_cache
+
+
+factory = APIRequestFactory()
+
+
+class TwoTierCacheTest(TestCase):
+    def setUp(self):
+        super(TwoTierCacheTest, self).setUp()
+        self.l2 = get_cache('special_cache')
+        self.l2.clear()
+        self.cache = self.get_cache()
+
+    def get_cache(self, **options):
+        return TwoTierCache('special_cache', {'OPTIONS': options})
+
+    def test_should_use_location_as_l2_cache_alias(self):
+        self.assertEqual(self.cache.l2_alias, 'special_cache')
+        self.assertEqual(self.cache.l2, self.l2)
+
+    def test_should_use_default_options(self):
+        self.assertEqual(self.cache.l1_max_size, 10 * 1024 * 1024)
+        self.assertEqual(self.cache.l1_timeout, 5)
+
+    def test_set_should_write_to_both_tiers(self):
+        self.cache.set('key', 'value')
+        self.assertEqual(self.l2.get('key'), 'value')
+        with patch.object(self.l2, 'get') as l2_get:
+            self.assertEqual(self.cache.get('key'), 'value')
+            self.assertFalse(l2_get.called)
+        self.assertEqual(self.cache.get_stats()['hits'], 1)
+
+    def test_should_fill_l1_from_l2_on_miss(self):
+        self.l2.set('key', 'value')
+        self.assertEqual(self.cache.get('key'), 'value')
+        self.assertEqual(self.cache.get('key'), 'value')
+        stats = self.cache.get_stats()
+        self.assertEqual(stats['misses'], 1)
+        self.assertEqual(stats['hits'], 1)
+
+    def test_should_return_default_if_key_is_missing_in_both_tiers(self):
+        self.assertEqual(self.cache.get('key', 'default'), 'default')
+        self.assertEqual(self.cache.get_stats()['entries'], 0)
+
+    def test_should_return_copy_of_value_from_l1(self):
+        self.cache.set('key', {'a': 1})
+        value = self.cache.get('key')
+        value['a'] = 2
+        self.assertEqual(self.cache.get('key'), {'a': 1})
+
+    def test_delete_should_remove_key_from_both_tiers(self):
+        self.cache.set('key', 'value')
+        self.cache.delete('key')
+        self.assertEqual(self.l2.get('key'), None)
+        self.assertEqual(self.cache.get('key'), None)
+
+    def test_l1_entry_should_expire_after_l1_timeout(self):
+        cache = self.get_cache(L1_TIMEOUT=10)
+        cache.set('key', 'value')
+        self.l2.set('key', 'changed value')
+        self.assertEqual(cache.get('key'), 'value')
+        with patch('time.time', return_value=cache._l1[cache.make_key('key')][1]):
+            self.assertEqual(cache.get('key'), 'changed value')
+
+    def test_l1_timeout_should_not_be_greater_than_timeout(self):
+        cache = self.get_cache(L1_TIMEOUT=10)
+        cache.set('key', 'value', 0)
+        self.assertEqual(cache.get_stats()['entries'], 0)
+
+    def test_should_evict_least_recently_used_entries_when_size_limit_is_exceeded(self):
+        value = 'x' * 100
+        entry_size = len(pickle.dumps(value, pickle.HIGHEST_PROTOCOL))
+        cache = self.get_cache(L1_MAX_SIZE=entry_size * 2)
+        cache.set('first', value)
+        cache.set('second', value)
+        cache.get('first')
+        cache.set('third', value)
+        self.assertEqual(
+            list(cache._l1.keys()),
+            [cache.make_key('first'), cache.make_key('third')]
+        )
+        stats = cache.get_stats()
+        self.assertEqual(stats['evictions'], 1)
+        self.assertEqual(stats['entries'], 2)
+        self.assertEqual(stats['size'], entry_size * 2)
+
+    def test_should_not_store_in_l1_values_bigger_than_size_limit(self):
+        cache = self.get_cache(L1_MAX_SIZE=10)
+        cache.set('key', 'x' * 100)
+        self.assertEqual(cache.get_stats()['entries'], 0)
+        self.assertEqual(cache.get('key'), 'x' * 100)
+
+    def test_add_should_respect_existing_key_in_l2(self):
+        self.l2.set('key', 'value')
+        self.assertFalse(self.cache.add('key', 'another value'))
+        self.assertTrue(self.cache.add('another_key', 'value'))
+        self.assertEqual(self.l2.get('another_key'), 'value')
+
+    def test_incr_should_invalidate_l1(self):
+        self.cache.set('key', 1)
+        self.assertEqual(self.cache.incr('key'), 2)
+        self.assertEqual(self.cache.get('key'), 2)
+
+    def test_clear_should_clear_both_tiers(self):
+        self.cache.set('key', 'value')
+        self.cache.clear()
+        self.assertEqual(self.l2.get('key'), None)
+        self.assertEqual(self.cache.get_stats()['entries'], 0)
+
+    def test_should_be_usable_by_cache_response(self):
+        calls = []
+
+        class TestView(views.APIView):
+            @cache_response(key_func=lambda **kwargs: 'cache_response_key', cache='two_tier_cache')
+            def get(self, request, *args, **kwargs):
+                calls.append(1)
+                return Response(u'Response from method')
+
+        response_1 = TestView().dispatch(request=factory.get(''))
+        response_2 = TestView().dispatch(request=factory.get(''))
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(response_2.content, response_1.content)
@@ -1,17 +1,29 @@
 # -*- coding: utf-8 -*-
+import gzip
+import hashlib
+import pickle
+import random
+import threading
+import time
+
 from mock import Mock, patch
 
 from django.test import TestCase
 from django.core.cache import cache, get_cache
+from django.core.exceptions import ImproperlyConfigured
 from django.utils import unittest
 
 from rest_framework import views
+from rest_framework.renderers import BrowsableAPIRenderer, JSONRenderer
 from rest_framework.response import Response
 
 from rest_framework_extensions.test import APIRequestFactory
+from rest_framework_extensions.cache.compression import decompress
 from rest_framework_extensions.cache.decorators import cache_response
+from rest_framework_extensions.compat import BytesIO, lzma
+from rest_framework_extensions.etag.decorators import etag
 from rest_framework_extensions.settings import extensions_api_settings
-from rest_framework_extensions.utils import get_django_features
+from rest_framework_extensions.utils import get_django_features, pass_key_to_next_decorator
 
 from tests_app.testutils import override_extensions_api_settings
 
@@ -101,7 +113,6 @@ class CacheResponseTest(TestCase):
     )
     def test_should_store_response_in_cache_with_timeout_from_settings(self):
         cache_response_decorator = cache_response()
-        cache_response_decorator.cache.set = Mock()
 
         class TestView(views.APIView):
             @cache_response_decorator
@@ -109,13 +120,13 @@ class CacheResponseTest(TestCase):
                 return Response('Response from method 4')
 
         view_instance = TestView()
-        response = view_instance.dispatch(request=self.request)
-        self.assertTrue(cache_response_decorator.cache.set.called, 'Cache saving should be performed')
-        self.assertEqual(cache_response_decorator.cache.set.call_args_list[0][0][2], 100)
+        with patch.object(cache_response_decorator.cache, 'set') as cache_set:
+            response = view_instance.dispatch(request=self.request)
+        self.assertTrue(cache_set.called, 'Cache saving should be performed')
+        self.assertEqual(cache_set.call_args_list[0][0][2], 100)
 
     def test_should_store_response_in_cache_with_timeout_from_arguments(self):
         cache_response_decorator = cache_response(timeout=3)
-        cache_response_decorator.cache.set = Mock()
 
         class TestView(views.APIView):
             @cache_response_decorator
@@ -123,9 +134,10 @@ class CacheResponseTest(TestCase):
                 return Response('Response from method 4')
 
         view_instance = TestView()
-        response = view_instance.dispatch(request=self.request)
-        self.assertTrue(cache_response_decorator.cache.set.called, 'Cache saving should be performed')
-        self.assertEqual(cache_response_decorator.cache.set.call_args_list[0][0][2], 3)
+        with patch.object(cache_response_decorator.cache, 'set') as cache_set:
+            response = view_instance.dispatch(request=self.request)
+        self.assertTrue(cache_set.called, 'Cache saving should be performed')
+        self.assertEqual(cache_set.call_args_list[0][0][2], 3)
 
     def test_should_return_response_from_cache_if_it_is_in_it(self):
         def key_func(**kwargs):
@@ -193,4 +205,619 @@ class CacheResponseTest(TestCase):
         """
         cache_response_instance = cache_response()
         another_cache_response_instance = cache_response()
-        self.assertTrue(cache_response_instance.cache is another_cache_response_instance.cache)
\ No newline at end of file
+        self.assertTrue(cache_response_instance.cache is another_cache_response_instance.cache)
+
+
+class CacheResponseTestBehavior__single_flight(TestCase):
+    def setUp(self):
+        super(CacheResponseTestBehavior__single_flight, self).setUp()
+        self.cache = get_cache(extensions_api_settings.DEFAULT_USE_CACHE)
+        self.cache.clear()
+
+    def key_func(self, **kwargs):
+        return 'cache_response_key'
+
+    def run_concurrently(self, view_class, count):
+        responses = []
+
+        def worker():
+            responses.append(view_class().dispatch(request=factory.get('')))
+
+        threads = [threading.Thread(target=worker) for i in range(count)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return responses
+
+    def test_should_not_be_turned_on_by_default(self):
+        self.assertFalse(cache_response().single_flight)
+
+    @override_extensions_api_settings(DEFAULT_CACHE_SINGLE_FLIGHT=True)
+    def test_should_use_value_from_settings_by_default(self):
+        self.assertTrue(cache_response().single_flight)
+
+    @override_extensions_api_settings(DEFAULT_CACHE_LOCK_POLL_INTERVAL=0.01)
+    def test_should_evaluate_view_method_only_once_for_concurrent_requests(self):
+        calls = []
+
+        class TestView(views.APIView):
+            @cache_response(key_func=self.key_func, single_flight=True)
+            def get(self, request, *args, **kwargs):
+                calls.append(1)
+                time.sleep(0.2)
+                return Response(u'Response from method')
+
+        responses = self.run_concurrently(TestView, count=5)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(len(responses), 5)
+        for response in responses:
+            self.assertEqual(response.content.decode('utf-8'), u'"Response from method"')
+
+    @override_extensions_api_settings(DEFAULT_CACHE_LOCK_POLL_INTERVAL=0.01)
+    def test_should_evaluate_view_method_for_every_concurrent_request_if_single_flight_is_turned_off(self):
+        calls = []
+
+        class TestView(views.APIView):
+            @cache_response(key_func=self.key_func)
+            def get(self, request, *args, **kwargs):
+                calls.append(1)
+                time.sleep(0.2)
+                return Response(u'Response from method')
+
+        self.run_concurrently(TestView, count=5)
+        self.assertEqual(len(calls), 5)
+
+    def test_should_release_lock_after_response_building(self):
+        cache_response_decorator = cache_response(key_func=self.key_func, single_flight=True)
+
+        class TestView(views.APIView):
+            @cache_response_decorator
+            def get(self, request, *args, **kwargs):
+                return Response(u'Response from method')
+
+        TestView().dispatch(request=factory.get(''))
+        self.assertEqual(self.cache.get(cache_response_decorator.get_lock_key('cache_response_key')), None)
+
+    def test_should_release_lock_if_view_method_raises_exception(self):
+        cache_response_decorator = cache_response(key_func=self.key_func, single_flight=True)
+
+        class TestView(views.APIView):
+            @cache_response_decorator
+            def get(self, request, *args, **kwargs):
+                raise ValueError()
+
+        self.assertRaises(ValueError, TestView().dispatch, request=factory.get(''))
+        self.assertEqual(self.cache.get(cache_response_decorator.get_lock_key('cache_response_key')), None)
+
+    @override_extensions_api_settings(DEFAULT_CACHE_LOCK_POLL_INTERVAL=0.01)
+    def test_should_build_response_without_lock_if_lock_wait_timeout_exceeded(self):
+        cache_response_decorator = cache_response(key_func=self.key_func, single_flight=True, lock_wait_timeout=0.05)
+
+        class TestView(views.APIView):
+            @cache_response_decorator
+            def get(self, request, *args, **kwargs):
+                return Response(u'Response from method')
+
+        self.assertTrue(cache_response_decorator.acquire_lock('cache_response_key'))
+        response = TestView().dispatch(request=factory.get(''))
+        self.assertEqual(response.content.decode('utf-8'), u'"Response from method"')
+        self.assertEqual(self.cache.get('cache_response_key').content, response.content)
+
+
+class CacheResponseTestBehavior__stale_ttl(TestCase):
+    def setUp(self):
+        super(CacheResponseTestBehavior__stale_ttl, self).setUp()
+        self.cache = get_cache(extensions_api_settings.DEFAULT_USE_CACHE)
+        self.calls = []
+        self.cache_response_decorator = cache_response(timeout=10, key_func=self.key_func, stale_ttl=60)
+        calls = self.calls
+
+        class TestView(views.APIView):
+            @self.cache_response_decorator
+            def get(self, request, *args, **kwargs):
+                calls.append(1)
+                return Response(u'Fresh response')
+
+        self.view_class = TestView
+
+    def key_func(self, **kwargs):
+        return 'cache_response_key'
+
+    def set_cached_response(self, soft_expires):
+        view_instance = self.view_class()
+        view_instance.headers = {}
+        cached_response = Response(u'Stale response')
+        view_instance.finalize_response(request=factory.get(''), response=cached_response)
+        cached_response.render()
+        self.cache.set('cache_response_key', {'response': cached_response, 'soft_expires': soft_expires})
+
+    def test_should_not_be_turned_on_by_default(self):
+        self.assertEqual(cache_response().stale_ttl, None)
+
+    @override_extensions_api_settings(DEFAULT_CACHE_STALE_TTL=100)
+    def test_should_use_value_from_settings_by_default(self):
+        self.assertEqual(cache_response().stale_ttl, 100)
+
+    def test_should_store_response_with_soft_expiration_time(self):
+        started_at = time.time()
+        self.view_class().dispatch(request=factory.get(''))
+        entry = self.cache.get('cache_response_key')
+        self.assertTrue(started_at + 10 <= entry['soft_expires'] <= time.time() + 10)
+        self.assertEqual(entry['response'].content.decode('utf-8'), u'"Fresh response"')
+
+    def test_should_store_response_in_cache_for_timeout_plus_stale_ttl(self):
+        with patch.object(self.cache_response_decorator.cache, 'set') as cache_set:
+            self.view_class().dispatch(request=factory.get(''))
+        self.assertEqual(cache_set.call_args_list[0][0][2], 70)
+
+    def test_should_not_store_soft_expiration_time_if_response_is_cached_forever(self):
+        cache_response_decorator = cache_response(key_func=self.key_func, stale_ttl=60)
+        self.assertEqual(cache_response_decorator.get_cache_timeout(), None)
+
+        class TestView(views.APIView):
+            @cache_response_decorator
+            def get(self, request, *args, **kwargs):
+                return Response(u'Fresh response')
+
+        response = TestView().dispatch(request=factory.get(''))
+        self.assertEqual(self.cache.get('cache_response_key').content, response.content)
+
+    def test_should_return_cached_response_if_it_is_not_stale(self):
+        self.set_cached_response(soft_expires=time.time() + 100)
+        response = self.view_class().dispatch(request=factory.get(''))
+        self.assertEqual(response.content.decode('utf-8'), u'"Stale response"')
+        self.assertEqual(len(self.calls), 0)
+
+    def test_should_revalidate_stale_response(self):
+        self.set_cached_response(soft_expires=time.time() - 1)
+        response = self.view_class().dispatch(request=factory.get(''))
+        self.assertEqual(response.content.decode('utf-8'), u'"Fresh response"')
+        self.assertEqual(len(self.calls), 1)
+        self.assertEqual(self.cache.get('cache_response_key')['response'].content, response.content)
+        self.assertEqual(self.cache.get(self.cache_response_decorator.get_lock_key('cache_response_key')), None)
+
+    def test_should_return_stale_response_if_it_is_revalidating_by_another_request(self):
+        self.set_cached_response(soft_expires=time.time() - 1)
+        self.assertTrue(self.cache_response_decorator.acquire_lock('cache_response_key'))
+        response = self.view_class().dispatch(request=factory.get(''))
+        self.assertEqual(response.content.decode('utf-8'), u'"Stale response"')
+        self.assertEqual(len(self.calls), 0)
+
+
+class CacheResponseTestBehavior__xfetch_beta(TestCase):
+    def setUp(self):
+        super(CacheResponseTestBehavior__xfetch_beta, self).setUp()
+        self.cache = get_cache(extensions_api_settings.DEFAULT_USE_CACHE)
+        self.calls = []
+        self.cache_response_decorator = cache_response(timeout=100, key_func=self.key_func, xfetch_beta=1.0)
+        calls = self.calls
+
+        class TestView(views.APIView):
+            @self.cache_response_decorator
+            def get(self, request, *args, **kwargs):
+                calls.append(1)
+                return Response(u'Fresh response')
+
+        self.view_class = TestView
+
+    def key_func(self, **kwargs):
+        return 'cache_response_key'
+
+    def set_cached_response(self, soft_expires, delta):
+        view_instance = self.view_class()
+        view_instance.headers = {}
+        cached_response = Response(u'Cached response')
+        view_instance.finalize_response(request=factory.get(''), response=cached_response)
+        cached_response.render()
+        self.cache.set('cache_response_key', {
+            'response': cached_response,
+            'soft_expires': soft_expires,
+            'delta': delta
+        })
+
+    def test_should_not_be_turned_on_by_default(self):
+        self.assertEqual(cache_response().xfetch_beta, None)
+
+    @override_extensions_api_settings(DEFAULT_CACHE_XFETCH_BETA=2.0)
+    def test_should_use_value_from_settings_by_default(self):
+        self.assertEqual(cache_response().xfetch_beta, 2.0)
+
+    def test_should_store_response_with_expiration_and_building_time(self):
+        started_at = time.time()
+        self.view_class().dispatch(request=factory.get(''))
+        finished_at = time.time()
+        entry = self.cache.get('cache_response_key')
+        self.assertTrue(started_at + 100 <= entry['soft_expires'] <= finished_at + 100)
+        self.assertTrue(0 <= entry['delta'] <= finished_at - started_at)
+
+    def test_should_return_cached_response_if_random_value_is_far_from_expiration(self):
+        self.set_cached_response(soft_expires=time.time() + 10, delta=1)
+        with patch.object(random, 'random', Mock(return_value=0.5)):
+            response = self.view_class().dispatch(request=factory.get(''))
+        self.assertEqual(response.content.decode('utf-8'), u'"Cached response"')
+        self.assertEqual(len(self.calls), 0)
+
+    def test_should_recompute_response_early_if_random_value_reaches_expiration(self):
+        self.set_cached_response(soft_expires=time.time() + 10, delta=1)
+        with patch.object(random, 'random', Mock(return_value=1 - 1e-9)):
+            response = self.view_class().dispatch(request=factory.get(''))
+        self.assertEqual(response.content.decode('utf-8'), u'"Fresh response"')
+        self.assertEqual(len(self.calls), 1)
+        self.assertEqual(self.cache.get('cache_response_key')['response'].content, response.content)
+
+    def test_should_recompute_early_more_likely_for_slow_responses(self):
+        self.set_cached_response(soft_expires=time.time() + 10, delta=100)
+        with patch.object(random, 'random', Mock(return_value=0.5)):
+            response = self.view_class().dispatch(request=factory.get(''))
+        self.assertEqual(response.content.decode('utf-8'), u'"Fresh response"')
+        self.assertEqual(len(self.calls), 1)
+
+
+class CacheResponseTestBehavior__compact(TestCase):
+    def setUp(self):
+        super(CacheResponseTestBehavior__compact, self).setUp()
+        self.cache = get_cache(extensions_api_settings.DEFAULT_USE_CACHE)
+        self.calls = []
+        calls = self.calls
+
+        class TestView(views.APIView):
+            @cache_response(key_func=self.key_func, compact=True)
+            def get(self, request, *args, **kwargs):
+                calls.append(1)
+                return Response(
+                    [{'id': i, 'name': u'Name {0}'.format(i)} for i in range(100)],
+                    status=203,
+                    headers={'X-Not-Cached': 'hello', 'Link': '<http://example.com/?page=2>; rel="next"'}
+                )
+
+        self.view_class = TestView
+
+    def key_func(self, **kwargs):
+        return 'cache_response_key'
+
+    def test_should_not_be_turned_on_by_default(self):
+        self.assertFalse(cache_response().compact)
+
+    @override_extensions_api_settings(DEFAULT_CACHE_COMPACT_RESPONSE=True)
+    def test_should_use_value_from_settings_by_default(self):
+        self.assertTrue(cache_response().compact)
+
+    def test_should_store_only_status_content_and_allowed_headers(self):
+        response = self.view_class().dispatch(request=factory.get(''))
+        entry = self.cache.get('cache_response_key')
+        self.assertEqual(sorted(entry.keys()), ['content', 'headers', 'status'])
+        self.assertEqual(entry['content'], response.content)
+        self.assertEqual(entry['status'], 203)
+        self.assertEqual(dict(entry['headers']), {
+            'Content-Type': response['Content-Type'],
+            'Link': '<http://example.com/?page=2>; rel="next"',
+            'Allow': response['Allow'],
+            'Vary': response['Vary'],
+        })
+
+    @override_extensions_api_settings(DEFAULT_CACHE_RESPONSE_HEADERS=('Content-Type', 'X-Not-Cached'))
+    def test_should_use_allowed_headers_from_settings(self):
+        response = self.view_class().dispatch(request=factory.get(''))
+        entry = self.cache.get('cache_response_key')
+        self.assertEqual(dict(entry['headers']), {
+            'Content-Type': response['Content-Type'],
+            'X-Not-Cached': 'hello',
+        })
+
+    def test_should_reconstruct_response_from_cache(self):
+        response_1 = self.view_class().dispatch(request=factory.get(''))
+        response_2 = self.view_class().dispatch(request=factory.get(''))
+        self.assertEqual(len(self.calls), 1)
+        self.assertEqual(response_2.content, response_1.content)
+        self.assertEqual(response_2.status_code, 203)
+        self.assertEqual(response_2['Content-Type'], response_1['Content-Type'])
+        self.assertEqual(response_2['Link'], response_1['Link'])
+        self.assertFalse(response_2.has_header('X-Not-Cached'))
+
+    def test_compact_entry_should_be_smaller_than_pickled_response(self):
+        response = self.view_class().dispatch(request=factory.get(''))
+        compact_entry = self.cache.get('cache_response_key')
+        self.assertTrue(
+            len(pickle.dumps(compact_entry, pickle.HIGHEST_PROTOCOL)) <
+            len(pickle.dumps(response, pickle.HIGHEST_PROTOCOL))
+        )
+
+    def test_should_store_expiration_time_with_compact_entry(self):
+        cache_response_decorator = cache_response(timeout=100, key_func=self.key_func, compact=True, stale_ttl=10)
+
+        class TestView(views.APIView):
+            @cache_response_decorator
+            def get(self, request, *args, **kwargs):
+                return Response(u'Response from method')
+
+        TestView().dispatch(request=factory.get(''))
+        entry = self.cache.get('cache_response_key')
+        self.assertTrue('soft_expires' in entry)
+        self.assertTrue('delta' in entry)
+
+
+class CacheResponseTestBehavior__compression(TestCase):
+    def setUp(self):
+        super(CacheResponseTestBehavior__compression, self).setUp()
+        self.cache = get_cache(extensions_api_settings.DEFAULT_USE_CACHE)
+        self.calls = []
+
+    def key_func(self, **kwargs):
+        return 'cache_response_key'
+
+    def get_view_class(self, renderer_classes=(JSONRenderer,), **decorator_kwargs):
+        calls = self.calls
+        view_renderer_classes = renderer_classes
+
+        class TestView(views.APIView):
+            renderer_classes = view_renderer_classes
+
+            @cache_response(key_func=self.key_func, **decorator_kwargs)
+            def get(self, request, *args, **kwargs):
+                calls.append(1)
+                return Response([{'id': i, 'name': u'Name {0}'.format(i)} for i in range(100)])
+
+        return TestView
+
+    def test_should_not_be_turned_on_by_default(self):
+        self.assertEqual(cache_response().compression, None)
+        self.assertEqual(cache_response().compression_min_size, 1024)
+
+    @override_extensions_api_settings(DEFAULT_CACHE_COMPRESSION='zlib', DEFAULT_CACHE_COMPRESSION_MIN_SIZE=10)
+    def test_should_use_values_from_settings_by_default(self):
+        self.assertEqual(cache_response().compression, 'zlib')
+        self.assertEqual(cache_response().compression_min_size, 10)
+
+    def test_should_raise_error_for_unknown_compression(self):
+        self.assertRaises(ImproperlyConfigured, cache_response, compression='unknown')
+
+    def test_should_store_compressed_content(self):
+        for compression in ('zlib', 'gzip'):
+            self.cache.clear()
+            response = self.get_view_class(compression=compression)().dispatch(request=factory.get(''))
+            entry = self.cache.get('cache_response_key')
+            self.assertEqual(entry['compression'], compression)
+            self.assertTrue(len(entry['content']) < len(response.content))
+            self.assertEqual(decompress(compression, entry['content']), response.content)
+
+    def test_should_not_compress_content_smaller_than_min_size(self):
+        response = self.get_view_class(compression='zlib', compression_min_size=100000)().dispatch(
+            request=factory.get('')
+        )
+        entry = self.cache.get('cache_response_key')
+        self.assertFalse('compression' in entry)
+        self.assertEqual(entry['content'], response.content)
+
+    def test_should_decompress_content_on_cache_hit(self):
+        view_class = self.get_view_class(compression='zlib')
+        response_1 = view_class().dispatch(request=factory.get(''))
+        response_2 = view_class().dispatch(request=factory.get('', HTTP_ACCEPT_ENCODING='gzip'))
+        self.assertEqual(len(self.calls), 1)
+        self.assertEqual(response_2.content, response_1.content)
+        self.assertEqual(response_2['Content-Type'], response_1['Content-Type'])
+        self.assertFalse(response_2.has_header('Content-Encoding'))
+
+    def test_should_serve_gzipped_content_if_client_accepts_gzip(self):
+        view_class = self.get_view_class(compression='gzip')
+        response_1 = view_class().dispatch(request=factory.get(''))
+        response_2 = view_class().dispatch(request=factory.get('', HTTP_ACCEPT_ENCODING='gzip, deflate'))
+        self.assertEqual(len(self.calls), 1)
+        self.assertEqual(response_2['Content-Encoding'], 'gzip')
+        self.assertTrue('Accept-Encoding' in response_2['Vary'])
+        self.assertEqual(gzip.GzipFile(fileobj=BytesIO(response_2.content)).read(), response_1.content)
+
+    def test_should_decompress_gzipped_content_if_client_does_not_accept_gzip(self):
+        view_class = self.get_view_class(compression='gzip')
+        response_1 = view_class().dispatch(request=factory.get(''))
+        response_2 = view_class().dispatch(request=factory.get('', HTTP_ACCEPT_ENCODING='deflate'))
+        self.assertFalse(response_2.has_header('Content-Encoding'))
+        self.assertTrue('Accept-Encoding' in response_2['Vary'])
+        self.assertEqual(response_2.content, response_1.content)
+
+    def test_should_keep_accept_encoding_in_vary_header_of_view_with_several_renderers(self):
+        view_class = self.get_view_class(compression='gzip', renderer_classes=(JSONRenderer, BrowsableAPIRenderer))
+        view_class().dispatch(request=factory.get(''))
+        for accept_encoding in ('gzip', 'deflate'):
+            response = view_class().dispatch(request=factory.get('', HTTP_ACCEPT_ENCODING=accept_encoding))
+            vary = [value.strip() for value in response['Vary'].split(',')]
+            self.assertTrue('Accept' in vary)
+            self.assertTrue('Accept-Encoding' in vary)
+        self.assertEqual(response['Vary'].count('Accept-Encoding'), 1)
+
+    def test_should_decompress_gzipped_content_if_vary_header_could_not_be_kept(self):
+        view_class = self.get_view_class(compression='gzip', renderer_classes=(JSONRenderer, BrowsableAPIRenderer))
+
+        class ViewWithHeadersProperty(view_class):
+            headers = property(lambda self: {'Vary': 'Accept'}, lambda self, value: None)
+
+        response_1 = ViewWithHeadersProperty().dispatch(request=factory.get(''))
+        response_2 = ViewWithHeadersProperty().dispatch(request=factory.get('', HTTP_ACCEPT_ENCODING='gzip'))
+        self.assertEqual(len(self.calls), 1)
+        self.assertFalse(response_2.has_header('Content-Encoding'))
+        self.assertEqual(response_2.content, response_1.content)
+
+    @unittest.skipIf(lzma is None, 'lzma is not available')
+    def test_should_use_lzma_compression(self):
+        view_class = self.get_view_class(compression='lzma')
+        response_1 = view_class().dispatch(request=factory.get(''))
+        response_2 = view_class().dispatch(request=factory.get(''))
+        self.assertEqual(self.cache.get('cache_response_key')['compression'], 'lzma')
+        self.assertEqual(response_2.content, response_1.content)
+
+
+class CacheResponseTestBehavior__key_from_etag(TestCase):
+    def setUp(self):
+        super(CacheResponseTestBehavior__key_from_etag, self).setUp()
+        self.cache = get_cache(extensions_api_settings.DEFAULT_USE_CACHE)
+        self.cache.clear()
+
+    def get_view_class(self, etag_func, key_func):
+        class CacheView(views.APIView):
+            @cache_response(key_func=key_func)
+            def get(self, request, *args, **kwargs):
+                return Response(u'Response from method')
+
+        class View(CacheView):
+            @etag(etag_func=etag_func)
+            def get(self, request, *args, **kwargs):
+                return super(View, self).get(request, *args, **kwargs)
+
+        return View
+
+    def test_should_use_key_calculated_by_etag_with_the_same_function(self):
+        key_func = Mock(return_value='key')
+        view_class = self.get_view_class(etag_func=key_func, key_func=key_func)
+        response = view_class().dispatch(request=factory.get(''))
+        self.assertEqual(key_func.call_count, 1)
+        self.assertEqual(response['ETag'], '"key"')
+        self.assertEqual(self.cache.get('key').content, response.content)
+
+    def test_should_calculate_key_if_etag_function_is_different(self):
+        etag_func = Mock(return_value='etag')
+        key_func = Mock(return_value='key')
+        view_class = self.get_view_class(etag_func=etag_func, key_func=key_func)
+        view_class().dispatch(request=factory.get(''))
+        self.assertEqual(etag_func.call_count, 1)
+        self.assertEqual(key_func.call_count, 1)
+        self.assertEqual(self.cache.get('etag'), None)
+        self.assertNotEqual(self.cache.get('key'), None)
+
+    def test_should_not_reuse_key_for_another_request(self):
+        key_func = Mock(return_value='key')
+        view_class = self.get_view_class(etag_func=key_func, key_func=key_func)
+        view_class().dispatch(request=factory.get(''))
+        view_class().dispatch(request=factory.get(''))
+        self.assertEqual(key_func.call_count, 2)
+
+    def test_should_use_passed_key_only_once(self):
+        key_func = Mock(return_value='key')
+        request = factory.get('')
+        view_instance = views.APIView()
+        view_method = Mock(__name__='get')
+        pass_key_to_next_decorator(
+            request=request, key='passed key', key_func=key_func, view_instance=view_instance, view_method=view_method
+        )
+        decorator = cache_response(key_func=key_func)
+        kwargs = {'view_instance': view_instance, 'view_method': view_method, 'request': request, 'args': (), 'kwargs': {}}
+        self.assertEqual(decorator.calculate_key(**kwargs), 'passed key')
+        self.assertEqual(decorator.calculate_key(**kwargs), 'key')
+
+
+class CacheResponseTestBehavior__etag(TestCase):
+    def setUp(self):
+        super(CacheResponseTestBehavior__etag, self).setUp()
+        self.cache = get_cache(extensions_api_settings.DEFAULT_USE_CACHE)
+        self.cache.clear()
+        self.calls = []
+
+    def key_func(self, **kwargs):
+        return 'cache_response_key'
+
+    def get_view_class(self, **decorator_kwargs):
+        calls = self.calls
+
+        class TestView(views.APIView):
+            @cache_response(key_func=self.key_func, etag=True, **decorator_kwargs)
+            def get(self, request, *args, **kwargs):
+                calls.append(1)
+                return Response(u'Response from method')
+
+        return TestView
+
+    def test_should_not_be_turned_on_by_default(self):
+        self.assertFalse(cache_response().etag)
+
+    @override_extensions_api_settings(DEFAULT_CACHE_ETAG=True)
+    def test_should_use_value_from_settings_by_default(self):
+        self.assertTrue(cache_response().etag)
+
+    def test_should_set_etag_calculated_from_content(self):
+        response = self.get_view_class()().dispatch(request=factory.get(''))
+        self.assertEqual(response['ETag'], '"{0}"'.format(hashlib.md5(response.content).hexdigest()))
+
+    def test_should_store_etag_in_cache_entry(self):
+        response = self.get_view_class()().dispatch(request=factory.get(''))
+        self.assertEqual(self.cache.get('cache_response_key')['etag'], response['ETag'])
+
+    def test_should_not_override_etag_set_by_view(self):
+        class TestView(views.APIView):
+            @cache_response(key_func=self.key_func, etag=True)
+            def get(self, request, *args, **kwargs):
+                return Response(u'Response from method', headers={'ETag': '"custom"'})
+
+        response = TestView().dispatch(request=factory.get(''))
+        self.assertEqual(response['ETag'], '"custom"')
+        self.assertEqual(self.cache.get('cache_response_key')['etag'], '"custom"')
+
+    def test_should_not_set_etag_for_unsuccessful_response(self):
+        class TestView(views.APIView):
+            @cache_response(key_func=self.key_func, etag=True)
+            def get(self, request, *args, **kwargs):
+                return Response(u'Not found', status=404)
+
+        response = TestView().dispatch(request=factory.get(''))
+        self.assertFalse(response.has_header('ETag'))
+
+    def test_should_return_304_from_cache_entry_if_etag_matches(self):
+        view_class = self.get_view_class()
+        etag_value = view_class().dispatch(request=factory.get(''))['ETag']
+        with patch.object(cache_response, 'get_headers_for_cache_entry') as get_headers:
+            response = view_class().dispatch(request=factory.get('', HTTP_IF_NONE_MATCH=etag_value))
+            self.assertFalse(get_headers.called)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag_value)
+        self.assertEqual(len(self.calls), 1)
+
+    def test_should_return_304_from_compact_cache_entry(self):
+        view_class = self.get_view_class(compression='gzip', compression_min_size=0)
+        etag_value = view_class().dispatch(request=factory.get(''))['ETag']
+        with patch('rest_framework_extensions.cache.compression.gzip_decompress') as decompress:
+            response = view_class().dispatch(request=factory.get('', HTTP_IF_NONE_MATCH=etag_value))
+            self.assertFalse(decompress.called)
+        self.assertEqual(response.status_code, 304)
+
+    def test_should_set_weak_etag_for_gzipped_content_from_cache_entry(self):
+        view_class = self.get_view_class(compression='gzip', compression_min_size=0)
+        etag_value = view_class().dispatch(request=factory.get(''))['ETag']
+        response = view_class().dispatch(request=factory.get('', HTTP_ACCEPT_ENCODING='gzip'))
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(response['ETag'], 'W/' + etag_value)
+
+    def test_should_keep_strong_etag_for_decompressed_content_from_cache_entry(self):
+        view_class = self.get_view_class(compression='gzip', compression_min_size=0)
+        etag_value = view_class().dispatch(request=factory.get(''))['ETag']
+        response = view_class().dispatch(request=factory.get(''))
+        self.assertFalse(response.has_header('Content-Encoding'))
+        self.assertEqual(response['ETag'], etag_value)
+
+    def test_should_return_weak_etag_with_304_if_gzip_is_accepted(self):
+        view_class = self.get_view_class(compression='gzip', compression_min_size=0)
+        etag_value = view_class().dispatch(request=factory.get(''))['ETag']
+        response = view_class().dispatch(
+            request=factory.get('', HTTP_IF_NONE_MATCH='W/' + etag_value, HTTP_ACCEPT_ENCODING='gzip')
+        )
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], 'W/' + etag_value)
+
+    def test_should_return_304_for_freshly_built_response_if_etag_matches(self):
+        view_class = self.get_view_class()
+        etag_value = view_class().dispatch(request=factory.get(''))['ETag']
+        self.cache.clear()
+        response = view_class().dispatch(request=factory.get('', HTTP_IF_NONE_MATCH=etag_value))
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(self.cache.get('cache_response_key')['response'].status_code, 200)
+
+    def test_should_return_full_response_if_etag_does_not_match(self):
+        view_class = self.get_view_class()
+        response_1 = view_class().dispatch(request=factory.get(''))
+        response_2 = view_class().dispatch(request=factory.get('', HTTP_IF_NONE_MATCH='"other"'))
+        self.assertEqual(response_2.status_code, 200)
+        self.assertEqual(response_2.content, response_1.content)
+        self.assertEqual(response_2['ETag'], response_1['ETag'])
+
+    def test_should_return_304_for_any_etag(self):
+        view_class = self.get_view_class()
+        view_class().dispatch(request=factory.get(''))
+        response = view_class().dispatch(request=factory.get('', HTTP_IF_NONE_MATCH='*'))
+        self.assertEqual(response.status_code, 304)
@@ -0,0 +1,30 @@
+# -*- coding: utf-8 -*-
+from django.db import models
+
+
+class InvalidationTagModel(models.Model):
+    name = models.CharField(max_length=100)
+
+    class Meta:
+        app_label = 'tests_app'
+
+
+class InvalidationArticleModel(models.Model):
+    title = models.CharField(max_length=100)
+    tags = models.ManyToManyField(InvalidationTagModel)
+
+    class Meta:
+        app_label = 'tests_app'
+
+
+class InvalidationArticleProxyModel(InvalidationArticleModel):
+    class Meta:
+        app_label = 'tests_app'
+        proxy = True
+
+
+class InvalidationCategoryModel(models.Model):
+    name = models.CharField(max_length=100)
+
+    class Meta:
+        app_label = 'tests_app'
@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+from django.db.models.deletion import Collector
+from django.db.models.signals import post_save, post_delete
+from django.test import TestCase
+
+from rest_framework_extensions.cache.invalidation import ModelVersionRegistry
+from rest_framework_extensions.compat import get_live_receivers
+from rest_framework_extensions.utils import get_cache
+
+from .models import (
+    InvalidationTagModel,
+    InvalidationArticleModel,
+    InvalidationArticleProxyModel,
+    InvalidationCategoryModel,
+)
+
+
+class ModelVersionRegistryTest(TestCase):
+    def setUp(self):
+        super(ModelVersionRegistryTest, self).setUp()
+        get_cache('default').clear()
+        self.registry = ModelVersionRegistry()
+        self.registry.register(InvalidationArticleModel)
+
+    def tearDown(self):
+        self.registry.unregister(InvalidationArticleModel, InvalidationTagModel, InvalidationCategoryModel)
+        super(ModelVersionRegistryTest, self).tearDown()
+
+    def test_should_register_models(self):
+        self.assertTrue(self.registry.is_registered(InvalidationArticleModel))
+        self.assertFalse(self.registry.is_registered(InvalidationTagModel))
+
+    def test_should_register_concrete_model_for_proxy(self):
+        self.assertTrue(self.registry.is_registered(InvalidationArticleProxyModel))
+
+    def test_should_use_default_cache(self):
+        self.assertEqual(self.registry.cache, get_cache('default'))
+
+    def test_should_use_custom_cache(self):
+        self.assertEqual(ModelVersionRegistry(cache='special_cache').cache, get_cache('special_cache'))
+
+    def test_should_store_version_in_cache(self):
+        version = self.registry.get_version(InvalidationArticleModel)
+        self.assertEqual(
+            get_cache('default').get(u'drf_extensions:model_version:tests_app.invalidationarticlemodel'),
+            version
+        )
+        self.assertEqual(self.registry.get_version(InvalidationArticleModel), version)
+
+    def test_bump_should_change_version(self):
+        version = self.registry.get_version(InvalidationArticleModel)
+        self.registry.bump(InvalidationArticleModel)
+        self.assertNotEqual(self.registry.get_version(InvalidationArticleModel), version)
+
+    def test_bump_should_set_new_version_if_it_was_lost(self):
+        self.registry.bump(InvalidationArticleModel)
+        self.assertNotEqual(self.registry.get_version(InvalidationArticleModel), None)
+
+    def test_get_versions(self):
+        versions = self.registry.get_versions([InvalidationArticleModel, InvalidationTagModel])
+        self.assertEqual(sorted(versions.keys()), sorted([InvalidationArticleModel, InvalidationTagModel]))
+
+    def test_should_change_version_on_save(self):
+        version = self.registry.get_version(InvalidationArticleModel)
+        article = InvalidationArticleModel.objects.create(title='title')
+        version_after_create = self.registry.get_version(InvalidationArticleModel)
+        self.assertNotEqual(version_after_create, version)
+        article.title = 'new title'
+        article.save()
+        self.assertNotEqual(self.registry.get_version(InvalidationArticleModel), version_after_create)
+
+    def test_should_change_version_on_delete(self):
+        article = InvalidationArticleModel.objects.create(title='title')
+        version = self.registry.get_version(InvalidationArticleModel)
+        article.delete()
+        self.assertNotEqual(self.registry.get_version(InvalidationArticleModel), version)
+
+    def test_should_change_version_on_proxy_model_save(self):
+        version = self.registry.get_version(InvalidationArticleModel)
+        InvalidationArticleProxyModel.objects.create(title='title')
+        self.assertNotEqual(self.registry.get_version(InvalidationArticleModel), version)
+
+    def test_should_not_change_version_of_not_registered_model(self):
+        version = self.registry.get_version(InvalidationTagModel)
+        InvalidationTagModel.objects.create(name='tag')
+        self.assertEqual(self.registry.get_version(InvalidationTagModel), version)
+
+    def test_should_not_create_missing_version_on_save(self):
+        key = self.registry.get_key(InvalidationArticleModel)
+        InvalidationArticleModel.objects.create(title='title')
+        self.assertEqual(get_cache('default').get(key), None)
+
+    def test_bump_existing_should_not_create_missing_version(self):
+        self.registry.bump_existing(InvalidationArticleModel)
+        self.assertEqual(get_cache('default').get(self.registry.get_key(InvalidationArticleModel)), None)
+
+    def test_should_connect_receivers_only_for_registered_models(self):
+        self.assertIn(self.registry.on_save_or_delete, get_live_receivers(post_save, InvalidationArticleModel))
+        self.assertIn(self.registry.on_save_or_delete, get_live_receivers(post_delete, InvalidationArticleProxyModel))
+        self.assertNotIn(self.registry.on_save_or_delete, get_live_receivers(post_save, InvalidationTagModel))
+        self.assertNotIn(self.registry.on_save_or_delete, get_live_receivers(post_delete, InvalidationTagModel))
+
+    def test_should_not_prevent_fast_delete_of_not_registered_models(self):
+        collector = Collector(using='default')
+        self.assertTrue(collector.can_fast_delete(InvalidationCategoryModel.objects.all()))
+        self.registry.register(InvalidationCategoryModel)
+        self.assertFalse(collector.can_fast_delete(InvalidationCategoryModel.objects.all()))
+        self.registry.unregister(InvalidationCategoryModel)
+        self.assertTrue(collector.can_fast_delete(InvalidationCategoryModel.objects.all()))
+
+    def test_should_disconnect_receivers_on_unregister(self):
+        version = self.registry.get_version(InvalidationArticleModel)
+        self.registry.unregister(InvalidationArticleModel)
+        InvalidationArticleModel.objects.create(title='title')
+        self.assertEqual(self.registry.get_version(InvalidationArticleModel), version)
+
+    def test_should_change_version_on_m2m_change(self):
+        self.registry.register(InvalidationTagModel)
+        article = InvalidationArticleModel.objects.create(title='title')
+        tag = InvalidationTagModel.objects.create(name='tag')
+        article_version = self.registry.get_version(InvalidationArticleModel)
+        tag_version = self.registry.get_version(InvalidationTagModel)
+        article.tags.add(tag)
+        self.assertNotEqual(self.registry.get_version(InvalidationArticleModel), article_version)
+        self.assertNotEqual(self.registry.get_version(InvalidationTagModel), tag_version)
@@ -1,4 +1,7 @@
 # -*- coding: utf-8 -*-
+import hashlib
+
+from django.http import HttpResponse
 from django.test import TestCase
 from django.utils.http import quote_etag
 
@@ -6,6 +9,7 @@ from rest_framework import views
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.permissions import SAFE_METHODS
+from rest_framework.renderers import JSONRenderer
 
 from rest_framework_extensions.etag.decorators import etag
 from rest_framework_extensions.test import APIRequestFactory
@@ -321,4 +325,120 @@ class ETAGProcessorTestBehavior_if_match(ETAGProcessorTestBehaviorMixin, TestCas
         self.run_for_methods(
             SAFE_METHODS + UNSAFE_METHODS,
             condition_failed_status=status.HTTP_412_PRECONDITION_FAILED
-        )
\ No newline at end of file
+        )
+
+
+class ETAGProcessorTestBehavior_content_hash(TestCase):
+    def setUp(self):
+        self.calls = []
+        calls = self.calls
+
+        def calculate_etag(**kwargs):
+            calls.append('etag_func')
+            return 'hello'
+
+        class TestView(views.APIView):
+            renderer_classes = (JSONRenderer,)
+
+            @etag(calculate_etag, content_hash=True)
+            def get(self, request, *args, **kwargs):
+                calls.append('get')
+                return Response({'hello': 'world'})
+
+            @etag(calculate_etag, content_hash=True)
+            def post(self, request, *args, **kwargs):
+                calls.append('post')
+                return Response({'hello': 'world'}, status=status.HTTP_201_CREATED)
+
+        self.view_class = TestView
+        self.expected_etag = quote_etag(hashlib.md5(b'{"hello": "world"}').hexdigest())
+
+    def test_should_not_be_turned_on_by_default(self):
+        self.assertFalse(etag().content_hash)
+
+    @override_extensions_api_settings(DEFAULT_ETAG_CONTENT_HASH=True)
+    def test_should_use_value_from_settings_by_default(self):
+        self.assertTrue(etag().content_hash)
+
+    def test_should_calculate_etag_from_rendered_content(self):
+        response = self.view_class().dispatch(factory.get(''))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['ETag'], self.expected_etag)
+        self.assertEqual(self.calls, ['get'])
+
+    @override_extensions_api_settings(
+        DEFAULT_ETAG_CONTENT_HASHER=lambda value: hashlib.sha256(value).hexdigest()
+    )
+    def test_should_use_hasher_from_settings(self):
+        response = self.view_class().dispatch(factory.get(''))
+        self.assertEqual(response['ETag'], quote_etag(hashlib.sha256(b'{"hello": "world"}').hexdigest()))
+
+    def test_should_return_304_if_content_etag_matches(self):
+        response = self.view_class().dispatch(factory.get('', HTTP_IF_NONE_MATCH=self.expected_etag))
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response['ETag'], self.expected_etag)
+
+    def test_should_use_weak_comparison_for_if_none_match(self):
+        response = self.view_class().dispatch(factory.get('', HTTP_IF_NONE_MATCH='W/' + self.expected_etag))
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_should_return_full_response_if_content_etag_does_not_match(self):
+        response = self.view_class().dispatch(factory.get('', HTTP_IF_NONE_MATCH='"other"'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.content, b'{"hello": "world"}')
+
+    def test_should_return_412_if_if_match_fails(self):
+        response = self.view_class().dispatch(factory.get('', HTTP_IF_MATCH='"other"'))
+        self.assertEqual(response.status_code, status.HTTP_412_PRECONDITION_FAILED)
+
+    def test_should_use_etag_func_for_unsafe_methods(self):
+        response = self.view_class().dispatch(factory.post('', HTTP_IF_NONE_MATCH=self.expected_etag))
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response['ETag'], '"hello"')
+        self.assertEqual(self.calls, ['etag_func', 'post'])
+
+    def test_should_check_if_match_for_unsafe_methods_with_etag_func(self):
+        response = self.view_class().dispatch(factory.post('', HTTP_IF_MATCH='"nonmatching"'))
+        self.assertEqual(response.status_code, status.HTTP_412_PRECONDITION_FAILED)
+        self.assertEqual(self.calls, ['etag_func'])
+
+        response = self.view_class().dispatch(factory.post('', HTTP_IF_MATCH='"hello"'))
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def test_should_not_calculate_etag_for_unsuccessful_response(self):
+        class TestView(views.APIView):
+            @etag(content_hash=True)
+            def get(self, request, *args, **kwargs):
+                return Response('Not found', status=status.HTTP_404_NOT_FOUND)
+
+        response = TestView().dispatch(factory.get('', HTTP_IF_NONE_MATCH='*'))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertFalse(response.has_header('ETag'))
+
+    def test_should_calculate_weak_etag_for_gzipped_content(self):
+        class TestView(views.APIView):
+            @etag(content_hash=True)
+            def get(self, request, *args, **kwargs):
+                response = HttpResponse(b'gzipped bytes')
+                response['Content-Encoding'] = 'gzip'
+                return response
+
+        response = TestView().dispatch(factory.get(''))
+        expected_etag = 'W/' + quote_etag(hashlib.md5(b'gzipped bytes').hexdigest())
+        self.assertEqual(response['ETag'], expected_etag)
+
+        response = TestView().dispatch(factory.get('', HTTP_IF_NONE_MATCH=expected_etag))
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_should_make_existing_etag_weak_for_gzipped_content(self):
+        class TestView(views.APIView):
+            @etag(content_hash=True)
+            def get(self, request, *args, **kwargs):
+                response = HttpResponse(b'gzipped bytes')
+                response['Content-Encoding'] = 'gzip'
+                response['ETag'] = '"identity"'
+                return response
+
+        response = TestView().dispatch(factory.get('', HTTP_IF_NONE_MATCH='"identity"'))
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response['ETag'], 'W/"identity"')
@@ -6,4 +6,12 @@ class BitTestModel(models.Model):
     is_active = models.BooleanField(default=False)
 
     class Meta:
-        app_label = 'tests_app'
\ No newline at end of file
+        app_label = 'tests_app'
+
+
+class BitTestUpdatedAtModel(models.Model):
+    is_active = models.BooleanField(default=False)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        app_label = 'tests_app'
@@ -1,8 +1,11 @@
 # -*- coding: utf-8 -*-
+import datetime
+
 from mock import Mock
 
 import django
 from django.test import TestCase
+from django.utils.encoding import force_text
 from django.utils.translation import override
 
 from rest_framework import views
@@ -19,13 +22,17 @@ from rest_framework_extensions.key_constructor.bits import (
     HeadersKeyBit,
     RequestMetaKeyBit,
     QueryParamsKeyBit,
+    KwargsKeyBit,
     UniqueViewIdKeyBit,
     PaginationKeyBit,
     ListSqlQueryKeyBit,
     RetrieveSqlQueryKeyBit,
+    ModelVersionKeyBit,
+    QuerySetAggregateKeyBit,
 )
+from rest_framework_extensions.cache.invalidation import model_versions
 
-from .models import BitTestModel
+from .models import BitTestModel, BitTestUpdatedAtModel
 
 
 factory = APIRequestFactory()
@@ -316,6 +323,44 @@ class QueryParamsKeyBitTest(TestCase):
         }
         self.assertEqual(QueryParamsKeyBit().get_data(**self.kwargs), expected)
 
+    def test_resulting_dict_for_all_params(self):
+        self.kwargs = {
+            'params': '*',
+            'view_instance': None,
+            'view_method': None,
+            'request': factory.get('?part=Londo&callback=jquery_callback'),
+            'args': None,
+            'kwargs': None
+        }
+        expected = {
+            'part': u'Londo',
+            'callback': u'jquery_callback'
+        }
+        self.assertEqual(QueryParamsKeyBit().get_data(**self.kwargs), expected)
+
+
+class KwargsKeyBitTest(TestCase):
+    def setUp(self):
+        self.kwargs = {
+            'params': ['pk', 'not_existing_kwarg'],
+            'view_instance': None,
+            'view_method': None,
+            'request': None,
+            'args': None,
+            'kwargs': {'pk': 1, 'parent_lookup_country': '2'}
+        }
+
+    def test_resulting_dict(self):
+        self.assertEqual(KwargsKeyBit().get_data(**self.kwargs), {'pk': u'1'})
+
+    def test_resulting_dict_for_all_kwargs(self):
+        self.kwargs['params'] = '*'
+        expected = {
+            'pk': u'1',
+            'parent_lookup_country': u'2'
+        }
+        self.assertEqual(KwargsKeyBit().get_data(**self.kwargs), expected)
+
 
 class PaginationKeyBitTest(TestCase):
     def setUp(self):
@@ -426,4 +471,87 @@ class RetrieveSqlQueryKeyBitTest(TestCase):
     def test_should_return_none_if_empty_queryset(self):
         self.kwargs['view_instance'].filter_queryset = lambda x: x.none()
         response = RetrieveSqlQueryKeyBit().get_data(**self.kwargs)
-        self.assertEqual(response, None)
\ No newline at end of file
+        self.assertEqual(response, None)
+
+
+class ModelVersionKeyBitTest(TestCase):
+    def setUp(self):
+        self.kwargs = {
+            'params': None,
+            'view_instance': Mock(spec_set=['get_queryset']),
+            'view_method': None,
+            'request': None,
+            'args': None,
+            'kwargs': None
+        }
+        self.kwargs['view_instance'].get_queryset = Mock(return_value=BitTestModel.objects.all())
+
+    def tearDown(self):
+        model_versions.unregister(BitTestModel)
+
+    def test_should_use_model_of_view_queryset_by_default(self):
+        response = ModelVersionKeyBit().get_data(**self.kwargs)
+        self.assertEqual(response, {
+            u'tests_app.bittestmodel': force_text(model_versions.get_version(BitTestModel))
+        })
+        self.assertTrue(model_versions.is_registered(BitTestModel))
+
+    def test_should_use_models_from_params(self):
+        self.kwargs['params'] = [BitTestModel]
+        self.kwargs['view_instance'].get_queryset = Mock(side_effect=AssertionError('should not be called'))
+        response = ModelVersionKeyBit().get_data(**self.kwargs)
+        self.assertEqual(list(response.keys()), [u'tests_app.bittestmodel'])
+
+    def test_should_change_when_model_instance_is_saved(self):
+        response_1 = ModelVersionKeyBit().get_data(**self.kwargs)
+        BitTestModel.objects.create()
+        response_2 = ModelVersionKeyBit().get_data(**self.kwargs)
+        self.assertNotEqual(response_1, response_2)
+
+
+class QuerySetAggregateKeyBitTest(TestCase):
+    def setUp(self):
+        self.kwargs = {
+            'params': None,
+            'view_instance': Mock(),
+            'view_method': None,
+            'request': None,
+            'args': None,
+            'kwargs': None
+        }
+        self.kwargs['view_instance'].get_queryset = Mock(return_value=BitTestUpdatedAtModel.objects.all())
+        self.kwargs['view_instance'].filter_queryset = lambda x: x.filter(is_active=True)
+
+    def test_should_return_count_of_filtered_queryset(self):
+        BitTestUpdatedAtModel.objects.create(is_active=True)
+        BitTestUpdatedAtModel.objects.create(is_active=False)
+        response = QuerySetAggregateKeyBit().get_data(**self.kwargs)
+        self.assertEqual(response, {'count': u'1'})
+
+    def test_should_return_max_values_of_fields_from_params(self):
+        self.kwargs['params'] = ['updated_at']
+        BitTestUpdatedAtModel.objects.create(is_active=True)
+        instance = BitTestUpdatedAtModel.objects.create(is_active=True)
+        response = QuerySetAggregateKeyBit().get_data(**self.kwargs)
+        self.assertEqual(response, {
+            'count': u'2',
+            'max_updated_at': force_text(BitTestUpdatedAtModel.objects.get(pk=instance.pk).updated_at)
+        })
+
+    def test_should_change_when_rows_change(self):
+        self.kwargs['params'] = ['updated_at']
+        instance = BitTestUpdatedAtModel.objects.create(is_active=True)
+        response_1 = QuerySetAggregateKeyBit().get_data(**self.kwargs)
+        BitTestUpdatedAtModel.objects.filter(pk=instance.pk).update(updated_at=instance.updated_at + datetime.timedelta(seconds=1))
+        response_2 = QuerySetAggregateKeyBit().get_data(**self.kwargs)
+        self.assertNotEqual(response_1, response_2)
+
+    def test_should_make_single_query(self):
+        self.kwargs['params'] = ['updated_at']
+        with self.assertNumQueries(1):
+            QuerySetAggregateKeyBit().get_data(**self.kwargs)
+
+    def test_should_return_none_if_empty_queryset(self):
+        self.kwargs['view_instance'].filter_queryset = lambda x: x.none()
+        response = QuerySetAggregateKeyBit().get_data(**self.kwargs)
+        self.assertEqual(response, None)
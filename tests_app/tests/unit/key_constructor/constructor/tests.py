@@ -6,12 +6,21 @@ from mock import Mock, patch
 
 from django.test import TestCase
 
-from rest_framework import viewsets
+from rest_framework import views, viewsets
+from rest_framework.response import Response
 
+from rest_framework_extensions.cache.decorators import cache_response
+from rest_framework_extensions.etag.decorators import etag
+from rest_framework_extensions.key_constructor.bits import KeyBitBase
 from rest_framework_extensions.key_constructor.constructors import (
     KeyConstructor,
 )
-from rest_framework_extensions.utils import get_unique_method_id
+from rest_framework_extensions.key_constructor.encoders import (
+    json_encoder,
+    compact_encoder,
+    sha256_hasher,
+    md5_hasher,
+)
 from rest_framework_extensions.test import APIRequestFactory
 
 from tests_app.testutils import (
@@ -52,6 +61,52 @@ class KeyConstructorTest_bits(TestCase):
         }
         self.assertEqual(constructor_instance.bits, expected)
 
+    def test_should_collect_bits_once_at_class_creation(self):
+        class MyKeyConstructor(KeyConstructor):
+            format = TestFormatKeyBit()
+
+        self.assertEqual(MyKeyConstructor._declared_bits, {'format': MyKeyConstructor.format})
+        self.assertEqual(MyKeyConstructor().bits, MyKeyConstructor._declared_bits)
+        self.assertFalse(MyKeyConstructor().bits is MyKeyConstructor._declared_bits)
+
+    def test_changing_instance_bits_should_not_affect_class_bits(self):
+        class MyKeyConstructor(KeyConstructor):
+            format = TestFormatKeyBit()
+
+        MyKeyConstructor().bits['language'] = TestLanguageKeyBit()
+        self.assertEqual(MyKeyConstructor().bits, {'format': MyKeyConstructor.format})
+
+
+class KeyConstructorTest_plan(TestCase):
+    def test_should_be_sorted_by_bit_name_and_use_resolved_params(self):
+        class MyKeyConstructor(KeyConstructor):
+            language = TestLanguageKeyBit(params={'from': 'bit'})
+            format = TestFormatKeyBit(params={'from': 'bit'})
+
+        constructor_instance = MyKeyConstructor(params={'language': {'from': 'constructor'}})
+        self.assertEqual(constructor_instance.get_plan(), [
+            ('format', MyKeyConstructor.format, {'from': 'bit'}),
+            ('language', MyKeyConstructor.language, {'from': 'constructor'}),
+        ])
+
+    def test_should_include_bits_changed_in_init(self):
+        class MyKeyConstructor(KeyConstructor):
+            format = TestFormatKeyBit()
+
+            def __init__(self, *args, **kwargs):
+                super(MyKeyConstructor, self).__init__(*args, **kwargs)
+                self.bits['language'] = TestLanguageKeyBit()
+
+        constructor_instance = MyKeyConstructor()
+        self.assertEqual([item[0] for item in constructor_instance.get_plan()], ['format', 'language'])
+
+    def test_should_be_compiled_once(self):
+        class MyKeyConstructor(KeyConstructor):
+            format = TestFormatKeyBit()
+
+        constructor_instance = MyKeyConstructor()
+        self.assertTrue(constructor_instance.get_plan() is constructor_instance.get_plan())
+
 
 class KeyConstructorTest(TestCase):
     def setUp(self):
@@ -69,6 +124,24 @@ class KeyConstructorTest(TestCase):
             'kwargs': None
         }
 
+    def test_should_use_encoder_and_hasher_from_settings_by_default(self):
+        self.assertEqual(KeyConstructor().encoder, json_encoder)
+        self.assertEqual(KeyConstructor().hasher, sha256_hasher)
+        with override_extensions_api_settings(
+            DEFAULT_KEY_CONSTRUCTOR_ENCODER=compact_encoder,
+            DEFAULT_KEY_CONSTRUCTOR_HASHER=md5_hasher
+        ):
+            self.assertEqual(KeyConstructor().encoder, compact_encoder)
+            self.assertEqual(KeyConstructor().hasher, md5_hasher)
+
+    def test_prepare_key_should_use_encoder_and_hasher(self):
+        constructor_instance = KeyConstructor(encoder=compact_encoder, hasher=md5_hasher)
+        key_dict = {'format': u'json'}
+        self.assertEqual(
+            constructor_instance.prepare_key(key_dict),
+            hashlib.md5(compact_encoder(key_dict)).hexdigest()
+        )
+
     def test_prepare_key_consistency_for_equal_dicts_with_different_key_positions(self):
         class MyKeyConstructor(KeyConstructor):
             pass
@@ -171,14 +244,24 @@ class KeyConstructorTest___get_memoization_key(TestCase):
             args=[1, 2, 3, u'Привет мир'],
             kwargs={1: 2, 3: 4, u'привет': u'мир'}
         )
-        expected = json.dumps({
-            'unique_method_id': get_unique_method_id(view_instance=self.view_intance, view_method=self.view_method),
-            'args': [1, 2, 3, u'Привет мир'],
-            'kwargs': {1: 2, 3: 4, u'привет': u'мир'},
-            'instance_id': id(constructor_instance)
-        })
+        expected = (
+            id(constructor_instance),
+            self.view_intance.__class__,
+            'retrieve',
+            (1, 2, 3, u'Привет мир'),
+            frozenset([(1, 2), (3, 4), (u'привет', u'мир')]),
+        )
         self.assertEqual(response, expected)
 
+    def test_should_return_none_for_unhashable_arguments(self):
+        response = KeyConstructor()._get_memoization_key(
+            view_instance=self.view_intance,
+            view_method=self.view_method,
+            args=[[1, 2]],
+            kwargs={}
+        )
+        self.assertEqual(response, None)
+
 
 class KeyConstructorTestBehavior__memoization(TestCase):
     def setUp(self):
@@ -270,4 +353,32 @@ class KeyConstructorTestBehavior__memoization(TestCase):
         self.kwargs['view_instance'] = view_2_instance
         self.kwargs['view_instance'] = view_2_instance.retrieve
         response_2 = constructor_instance(**self.kwargs)
-        self.assertFalse(response_1 is response_2)
\ No newline at end of file
+        self.assertFalse(response_1 is response_2)
+
+    def test_should_compute_key_once_for_etag_and_cache_decorators_of_the_same_request(self):
+        calls = []
+
+        class CountingKeyBit(KeyBitBase):
+            def get_data(self, **kwargs):
+                calls.append(1)
+                return u'value'
+
+        class MyKeyConstructor(KeyConstructor):
+            counting = CountingKeyBit()
+
+        key_constructor = MyKeyConstructor(memoize_for_request=True)
+
+        class CacheView(views.APIView):
+            @cache_response(key_func=key_constructor)
+            def get(self, request, *args, **kwargs):
+                return Response(u'Response from method')
+
+        class View(CacheView):
+            @etag(etag_func=key_constructor)
+            def get(self, request, *args, **kwargs):
+                return super(View, self).get(request, *args, **kwargs)
+
+        response = View().dispatch(request=factory.get(''))
+        self.assertEqual(response.content, b'"Response from method"')
+        self.assertTrue(response.has_header('ETag'))
+        self.assertEqual(len(calls), 1)
@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+import hashlib
+import json
+
+from django.core.exceptions import ImproperlyConfigured
+from django.test import TestCase
+from django.utils import unittest
+
+from rest_framework_extensions.compat import xxhash
+from rest_framework_extensions.key_constructor.encoders import (
+    json_encoder,
+    compact_encoder,
+    sha256_hasher,
+    md5_hasher,
+    blake2b_hasher,
+    xxh64_hasher,
+)
+
+
+class JsonEncoderTest(TestCase):
+    def test_should_encode_dict_with_sorted_keys(self):
+        key_dict = {'b': u'1', 'a': {'d': None, 'c': [1, 2]}}
+        self.assertEqual(json_encoder(key_dict), json.dumps(key_dict, sort_keys=True).encode('utf-8'))
+
+
+class CompactEncoderTest(TestCase):
+    def test_should_encode_bits_data(self):
+        key_dict = {
+            'unique_method_id': u'tests_app.views.View.list',
+            'pagination': {'page': u'1'},
+            'list_sql_query': None,
+            'params': [u'a', 1],
+        }
+        self.assertEqual(
+            compact_encoder(key_dict),
+            b'{14:list_sql_queryn10:pagination{4:page1:1}6:params[1:ar1;]16:unique_method_id25:tests_app.views.View.list}'
+        )
+
+    def test_should_not_depend_on_keys_order(self):
+        one = {'a': u'1', 'b': u'2', 'c': u'3'}
+        two = {'c': u'3', 'a': u'1', 'b': u'2'}
+        self.assertEqual(compact_encoder(one), compact_encoder(two))
+
+    def test_should_be_unambiguous(self):
+        self.assertNotEqual(compact_encoder({'a': u'bc'}), compact_encoder({'ab': u'c'}))
+        self.assertNotEqual(compact_encoder({'a': [u'b', u'c']}), compact_encoder({'a': [u'bc']}))
+        self.assertNotEqual(compact_encoder({'a': None}), compact_encoder({'a': u'n'}))
+        self.assertNotEqual(compact_encoder({'a': u'1'}), compact_encoder({'a': 1}))
+
+    def test_should_encode_unicode(self):
+        self.assertEqual(compact_encoder({'a': u'привет'}), u'{1:a6:привет}'.encode('utf-8'))
+
+    def test_should_encode_non_ascii_bytes(self):
+        self.assertEqual(compact_encoder({'a': b'\xd0\x9f'}), u'{1:a1:П}'.encode('utf-8'))
+        self.assertEqual(compact_encoder({b'\xd0\x9f': 1}), compact_encoder({u'П': 1}))
+
+    def test_should_be_shorter_than_json(self):
+        key_dict = {'format': u'json', 'language': u'en', 'pagination': {'page': u'1', 'page_size': u'10'}}
+        self.assertTrue(len(compact_encoder(key_dict)) < len(json_encoder(key_dict)))
+
+
+class HashersTest(TestCase):
+    def setUp(self):
+        self.value = b'{"format": "json"}'
+
+    def test_sha256_hasher(self):
+        self.assertEqual(sha256_hasher(self.value), hashlib.sha256(self.value).hexdigest())
+
+    def test_md5_hasher(self):
+        self.assertEqual(md5_hasher(self.value), hashlib.md5(self.value).hexdigest())
+
+    @unittest.skipIf(not hasattr(hashlib, 'blake2b'), 'blake2b is not available')
+    def test_blake2b_hasher(self):
+        self.assertEqual(len(blake2b_hasher(self.value)), 32)
+
+    @unittest.skipIf(hasattr(hashlib, 'blake2b'), 'blake2b is available')
+    def test_blake2b_hasher_should_raise_error_if_not_available(self):
+        self.assertRaises(ImproperlyConfigured, blake2b_hasher, self.value)
+
+    @unittest.skipIf(xxhash is None, 'xxhash is not installed')
+    def test_xxh64_hasher(self):
+        self.assertEqual(len(xxh64_hasher(self.value)), 16)
+
+    @unittest.skipIf(xxhash is not None, 'xxhash is installed')
+    def test_xxh64_hasher_should_raise_error_if_not_available(self):
+        self.assertRaises(ImproperlyConfigured, xxh64_hasher, self.value)
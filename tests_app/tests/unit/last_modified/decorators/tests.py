@@ -0,0 +1,221 @@
+# -*- coding: utf-8 -*-
+import datetime
+
+from django.test import TestCase
+from django.utils import timezone
+from django.utils.http import http_date
+
+from rest_framework import views
+from rest_framework.response import Response
+from rest_framework import status
+
+from rest_framework_extensions.last_modified.decorators import last_modified
+from rest_framework_extensions.test import APIRequestFactory
+
+from tests_app.testutils import (
+    override_extensions_api_settings,
+)
+
+
+factory = APIRequestFactory()
+UNSAFE_METHODS = ['POST', 'PUT', 'DELETE', 'PATCH']
+LAST_MODIFIED = 1400000000
+
+
+def default_last_modified_func(**kwargs):
+    return LAST_MODIFIED
+
+
+@override_extensions_api_settings(DEFAULT_LAST_MODIFIED_FUNC=default_last_modified_func)
+class LastModifiedProcessorTest(TestCase):
+    def setUp(self):
+        self.request = factory.get('')
+
+    def test_should_use_last_modified_func_from_settings_if_it_is_not_specified(self):
+        last_modified_decorator = last_modified()
+        self.assertEqual(last_modified_decorator.last_modified_func, default_last_modified_func)
+
+    def test_should_add_default_last_modified_value(self):
+        class TestView(views.APIView):
+            @last_modified()
+            def get(self, request, *args, **kwargs):
+                return Response('Response from method')
+
+        response = TestView().get(request=self.request)
+        self.assertEqual(response.get('Last-Modified'), http_date(LAST_MODIFIED))
+        self.assertEqual(response.data, 'Response from method')
+
+    def test_should_not_change_existing_last_modified_value(self):
+        class TestView(views.APIView):
+            @last_modified()
+            def get(self, request, *args, **kwargs):
+                return Response('Response from method', headers={'Last-Modified': 'hello'})
+
+        response = TestView().get(request=self.request)
+        self.assertEqual(response.get('Last-Modified'), 'hello')
+
+    def test_should_not_add_header_if_last_modified_is_unknown(self):
+        class TestView(views.APIView):
+            @last_modified(lambda **kwargs: None)
+            def get(self, request, *args, **kwargs):
+                return Response('Response from method')
+
+        response = TestView().get(request=factory.get('', HTTP_IF_MODIFIED_SINCE=http_date(LAST_MODIFIED)))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(response.has_header('Last-Modified'))
+
+    def test_should_use_custom_method_from_view_if__last_modified_func__is_string(self):
+        class TestView(views.APIView):
+            @last_modified('calculate_last_modified')
+            def get(self, request, *args, **kwargs):
+                return Response('Response from method')
+
+            def calculate_last_modified(self, **kwargs):
+                return LAST_MODIFIED + 10
+
+        response = TestView().get(request=self.request)
+        self.assertEqual(response.get('Last-Modified'), http_date(LAST_MODIFIED + 10))
+
+    def test_custom_func_arguments(self):
+        called_with_kwargs = {}
+
+        def calculate_last_modified(**kwargs):
+            called_with_kwargs.update(kwargs)
+            return LAST_MODIFIED
+
+        class TestView(views.APIView):
+            @last_modified(calculate_last_modified)
+            def get(self, request, *args, **kwargs):
+                return Response('Response from method')
+
+        view_instance = TestView()
+        view_instance.get(self.request, 'hello', hello='world')
+        self.assertEqual(called_with_kwargs.get('view_instance'), view_instance)
+        self.assertEqual(called_with_kwargs.get('request'), self.request)
+        self.assertEqual(called_with_kwargs.get('args'), ('hello',))
+        self.assertEqual(called_with_kwargs.get('kwargs'), {'hello': 'world'})
+
+    def test_should_convert_aware_datetime(self):
+        value = datetime.datetime(2014, 5, 13, 16, 53, 20, 999, tzinfo=timezone.utc)
+
+        class TestView(views.APIView):
+            @last_modified(lambda **kwargs: value)
+            def get(self, request, *args, **kwargs):
+                return Response('Response from method')
+
+        response = TestView().get(request=self.request)
+        self.assertEqual(response.get('Last-Modified'), http_date(LAST_MODIFIED))
+
+    def test_should_treat_naive_datetime_as_datetime_in_default_timezone(self):
+        value = timezone.make_naive(
+            datetime.datetime(2014, 5, 13, 16, 53, 20, tzinfo=timezone.utc),
+            timezone.get_default_timezone()
+        )
+
+        class TestView(views.APIView):
+            @last_modified(lambda **kwargs: value)
+            def get(self, request, *args, **kwargs):
+                return Response('Response from method')
+
+        response = TestView().get(request=self.request)
+        self.assertEqual(response.get('Last-Modified'), http_date(LAST_MODIFIED))
+
+
+class LastModifiedProcessorTestBehavior_rebuild_after_method_evaluation(TestCase):
+    def setUp(self):
+        self.request = factory.put('')
+        self.value = LAST_MODIFIED
+
+        def calculate_last_modified(**kwargs):
+            return self.value
+
+        this = self
+
+        class TestView(views.APIView):
+            @last_modified(calculate_last_modified)
+            def get(self, request, *args, **kwargs):
+                this.value += 10
+                return Response('Response from method')
+
+            @last_modified(calculate_last_modified, rebuild_after_method_evaluation=True)
+            def put(self, request, *args, **kwargs):
+                this.value += 10
+                return Response('Response from method')
+
+        self.view_class = TestView
+
+    def test_should_not__rebuild_after_method_evaluation__by_default(self):
+        response = self.view_class().get(factory.get(''))
+        self.assertEqual(response.get('Last-Modified'), http_date(LAST_MODIFIED))
+
+    def test_should__rebuild_after_method_evaluation__if_it_asked(self):
+        response = self.view_class().put(factory.put(''))
+        self.assertEqual(response.get('Last-Modified'), http_date(LAST_MODIFIED + 10))
+
+
+class LastModifiedProcessorTestBehavior_conditional_requests(TestCase):
+    def setUp(self):
+        self.calls = []
+        calls = self.calls
+
+        class TestView(views.APIView):
+            @last_modified(default_last_modified_func)
+            def dispatch_method(self, request, *args, **kwargs):
+                calls.append(request.method)
+                return Response('Response from method')
+
+        self.view_instance = TestView()
+
+    def get_response(self, method, **headers):
+        request = getattr(factory, method.lower())('', **headers)
+        return self.view_instance.dispatch_method(request)
+
+    def test_should_return_304_for_safe_methods_if_not_modified_since(self):
+        for method in ['GET', 'HEAD']:
+            for if_modified_since in [LAST_MODIFIED, LAST_MODIFIED + 10]:
+                response = self.get_response(method, HTTP_IF_MODIFIED_SINCE=http_date(if_modified_since))
+                self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+                self.assertEqual(response['Last-Modified'], http_date(LAST_MODIFIED))
+        self.assertEqual(self.calls, [])
+
+    def test_should_evaluate_method_if_modified_since(self):
+        response = self.get_response('GET', HTTP_IF_MODIFIED_SINCE=http_date(LAST_MODIFIED - 10))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.calls, ['GET'])
+
+    def test_should_ignore_if_modified_since_for_unsafe_methods(self):
+        for method in UNSAFE_METHODS:
+            response = self.get_response(method, HTTP_IF_MODIFIED_SINCE=http_date(LAST_MODIFIED))
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.calls, UNSAFE_METHODS)
+
+    def test_should_ignore_if_modified_since_if_if_none_match_is_present(self):
+        response = self.get_response(
+            'GET',
+            HTTP_IF_MODIFIED_SINCE=http_date(LAST_MODIFIED),
+            HTTP_IF_NONE_MATCH='"hello"'
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_should_ignore_invalid_if_modified_since(self):
+        response = self.get_response('GET', HTTP_IF_MODIFIED_SINCE='hello')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_should_return_412_for_all_methods_if_modified_after_if_unmodified_since(self):
+        for method in ['GET', 'HEAD'] + UNSAFE_METHODS:
+            response = self.get_response(method, HTTP_IF_UNMODIFIED_SINCE=http_date(LAST_MODIFIED - 10))
+            self.assertEqual(response.status_code, status.HTTP_412_PRECONDITION_FAILED)
+        self.assertEqual(self.calls, [])
+
+    def test_should_evaluate_method_if_not_modified_after_if_unmodified_since(self):
+        response = self.get_response('PUT', HTTP_IF_UNMODIFIED_SINCE=http_date(LAST_MODIFIED))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.calls, ['PUT'])
+
+    def test_should_ignore_if_unmodified_since_if_if_match_is_present(self):
+        response = self.get_response(
+            'PUT',
+            HTTP_IF_UNMODIFIED_SINCE=http_date(LAST_MODIFIED - 10),
+            HTTP_IF_MATCH='"hello"'
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
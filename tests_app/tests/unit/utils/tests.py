@@ -9,6 +9,10 @@ from rest_framework_extensions.utils import (
     get_rest_framework_version,
     get_rest_framework_features,
     prepare_header_name,
+    estimate_queryset_count,
+)
+from tests_app.tests.functional.mixins.list_destroy_model_mixin.models import (
+    CommentForListDestroyModelMixin as Comment
 )
 
 
@@ -188,4 +192,27 @@ class Test_prepare_header_name(TestCase):
         self.assertEqual(prepare_header_name('  Accept-Language  '), 'HTTP_ACCEPT_LANGUAGE')
 
     def test_adds_http_prefix(self):
-        self.assertEqual(prepare_header_name('Accept-Language'), 'HTTP_ACCEPT_LANGUAGE')
\ No newline at end of file
+        self.assertEqual(prepare_header_name('Accept-Language'), 'HTTP_ACCEPT_LANGUAGE')
+
+
+class Test_estimate_queryset_count(TestCase):
+    def get_connections(self, vendor, plan=None):
+        connection = Mock(vendor=vendor)
+        connection.cursor.return_value.fetchone.return_value = (plan,)
+        return {'default': connection}
+
+    def test_should_return_none_for_databases_without_estimates(self):
+        with patch('rest_framework_extensions.utils.connections', self.get_connections('sqlite')):
+            self.assertEqual(estimate_queryset_count(Comment.objects.all()), None)
+
+    def test_should_return_rows_estimated_by_planner(self):
+        connections = self.get_connections('postgresql', plan=[{'Plan': {'Plan Rows': 1200}}])
+        with patch('rest_framework_extensions.utils.connections', connections):
+            self.assertEqual(estimate_queryset_count(Comment.objects.filter(id__gt=1)), 1200)
+        sql = connections['default'].cursor.return_value.execute.call_args[0][0]
+        self.assertTrue(sql.startswith('EXPLAIN (FORMAT JSON) SELECT'))
+
+    def test_should_parse_plan_from_string(self):
+        connections = self.get_connections('postgresql', plan='[{"Plan": {"Plan Rows": 5}}]')
+        with patch('rest_framework_extensions.utils.connections', connections):
+            self.assertEqual(estimate_queryset_count(Comment.objects.all()), 5)